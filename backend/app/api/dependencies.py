@@ -10,12 +10,14 @@ from app.infrastructure.cache.cache import CacheClient, get_cache_client
 from app.infrastructure.db.database import get_db
 from app.services.interactions.interaction_engine import InteractionEngine
 from app.services.interactions.models import InteractionRecord, SeverityLevel
+from app.services.ocr.drug_matcher import DrugVocabulary
 from app.services.ocr.ocr_service import OCRService
 from app.services.scheduling.schedule_optimizer import ScheduleOptimizer
+from app.services.scheduling.solution_cache import get_schedule_solution_cache
 
 
 def get_ocr_service() -> OCRService:
-    return OCRService()
+    return OCRService(cache=get_cache_client())
 
 
 def get_interaction_engine() -> InteractionEngine:
@@ -23,27 +25,31 @@ def get_interaction_engine() -> InteractionEngine:
 
 
 def get_schedule_optimizer() -> ScheduleOptimizer:
-    return ScheduleOptimizer()
+    return ScheduleOptimizer(solution_cache=get_schedule_solution_cache())
 
 
 def get_cache() -> CacheClient:
     return get_cache_client()
 
 
+# Loaded once per process, so its vocabulary version is hashed only once
+_MEDICATION_VOCABULARY = DrugVocabulary([
+    "ASPIRIN",
+    "WARFARIN",
+    "METFORMIN",
+    "AMOXICILLIN",
+    "LISINOPRIL",
+    "PARACETAMOL",
+    "IBUPROFEN",
+    "ATORVASTATIN",
+    "AMLOGIPINE",
+    "OMEPRAZOLE",
+])
+
+
 def get_medication_repository() -> list[str]:
     # Placeholder for repository-backed drug lookup.
-    return [
-        "ASPIRIN",
-        "WARFARIN",
-        "METFORMIN",
-        "AMOXICILLIN",
-        "LISINOPRIL",
-        "PARACETAMOL",
-        "IBUPROFEN",
-        "ATORVASTATIN",
-        "AMLOGIPINE",
-        "OMEPRAZOLE",
-    ]
+    return _MEDICATION_VOCABULARY
 
 
 def get_interaction_records() -> List[InteractionRecord]:
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import HTTPException, UploadFile, status
+
+# Bytes copied from the spooled request file per read
+UPLOAD_CHUNK_BYTES = 256 * 1024
+
+
+def _too_large(max_size_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File size exceeds the maximum limit of {max_size_bytes // (1024 * 1024)}MB.",
+    )
+
+
+async def read_upload_capped(
+    upload: UploadFile,
+    allowed_types: List[str],
+    max_size_bytes: int,
+) -> memoryview:
+    """
+    Reads an upload in chunks into one buffer allocated up front, and stops
+    as soon as it passes `max_size_bytes`.
+
+    The buffer is sized from the multipart part size when the client sent
+    one (rejecting oversized files before reading anything), or at the cap
+    plus one byte otherwise. The returned view is read-only and can go
+    straight to np.frombuffer, hashlib or shared memory without copying.
+
+    Raises:
+        HTTPException: 415 for a disallowed content type, 413 past the size
+            cap, 400 for an empty file.
+    """
+    if str(upload.content_type).lower() not in allowed_types:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported file type. Allowed types are: {', '.join(allowed_types)}",
+        )
+
+    declared_size = upload.size
+    if declared_size is not None and declared_size > max_size_bytes:
+        raise _too_large(max_size_bytes)
+
+    # One spare byte tells "exactly at the cap" from "over the cap"
+    capacity = max_size_bytes + 1 if declared_size is None else declared_size + 1
+    buffer = bytearray(capacity)
+    length = 0
+    while True:
+        chunk = await upload.read(min(UPLOAD_CHUNK_BYTES, capacity - length))
+        if not chunk:
+            break
+        buffer[length:length + len(chunk)] = chunk
+        length += len(chunk)
+        if length > max_size_bytes:
+            raise _too_large(max_size_bytes)
+        if length == capacity:
+            # Declared size was wrong; trust the cap instead
+            buffer.extend(bytes(min(capacity, max_size_bytes + 1 - capacity)))
+            capacity = len(buffer)
+
+    if length == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file is completely empty.",
+        )
+
+    return memoryview(buffer).toreadonly()[:length]
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import base64
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from app.api.dependencies import (
@@ -11,7 +11,10 @@ from app.api.dependencies import (
     get_medication_repository,
     rate_limit_dependency,
 )
+from app.api.uploads import read_upload_capped
+from app.infrastructure.storage.blob_spool import BlobSpool, get_blob_spool
 from app.services.interactions.models import InteractionRecord
+from app.services.ocr.drug_matcher import vocabulary_version
 from app.services.scheduling.schedule_optimizer import MedicationDosage
 from app.workers.celery_app import celery_app
 from app.workers.tasks import (
@@ -66,6 +69,12 @@ def _ensure_job_backend_available() -> None:
         ) from exc
 
 
+def _spool_ocr_job(spool: BlobSpool, image_bytes: memoryview, known_drugs: list[str]) -> tuple[str, str]:
+    """Writes the upload and vocabulary to the shared spool; returns their references."""
+    vocabulary = spool.put_vocabulary(vocabulary_version(known_drugs), known_drugs)
+    return spool.put(image_bytes), vocabulary
+
+
 @router.post(
     "/ocr/extract-drug",
     response_model=JobAcceptedResponse,
@@ -77,27 +86,18 @@ async def submit_ocr_job(
 ) -> Dict[str, Any]:
     _ensure_job_backend_available()
 
-    if str(image.content_type).lower() not in ALLOWED_CONTENT_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=f"Unsupported file type. Allowed types: {', '.join(ALLOWED_CONTENT_TYPES)}",
-        )
+    image_bytes = await read_upload_capped(image, ALLOWED_CONTENT_TYPES, MAX_FILE_SIZE_BYTES)
 
-    image_bytes = await image.read()
-    if len(image_bytes) > MAX_FILE_SIZE_BYTES:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="File size exceeds 5 MB.",
-        )
-    if not image_bytes:
+    try:
+        blob_key, vocabulary = await run_in_threadpool(_spool_ocr_job, get_blob_spool(), image_bytes, known_drugs)
+    except OSError as exc:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Uploaded file is empty.",
-        )
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to spool OCR upload: {str(exc)}",
+        ) from exc
 
-    encoded_image = base64.b64encode(image_bytes).decode("utf-8")
     try:
-        task = extract_drug_task.delay(encoded_image, known_drugs)
+        task = extract_drug_task.delay(blob_key, vocabulary)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
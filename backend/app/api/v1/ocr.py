@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import (
+    get_interaction_engine,
+    get_interaction_records,
     get_medication_repository,
     get_ocr_service,
     rate_limit_dependency,
 )
+from app.api.uploads import read_upload_capped
+from app.core.exceptions import ImageQualityException, ServiceOverloadedException
+from app.services.interactions.interaction_engine import InteractionEngine
+from app.services.interactions.models import InteractionRecord
 from app.services.ocr.ocr_service import OCRService
+from app.services.ocr.pdf_pages import PdfPages
 
 router = APIRouter(
     prefix="/ocr",
@@ -19,6 +29,35 @@ router = APIRouter(
 
 ALLOWED_CONTENT_TYPES = ["image/jpeg", "image/png", "image/webp"]
 MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024  # 5 MB limit
+MAX_BATCH_IMAGES = 20
+ALLOWED_CLIP_CONTENT_TYPES = ["video/mp4", "video/quicktime", "video/webm"]
+MAX_CLIP_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB limit
+MAX_BURST_FRAMES = 12
+ALLOWED_PDF_CONTENT_TYPES = ["application/pdf"]
+MAX_PDF_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB limit
+
+
+async def _read_upload(
+    image: UploadFile,
+    allowed_types: List[str] = ALLOWED_CONTENT_TYPES,
+    max_size_bytes: int = MAX_FILE_SIZE_BYTES,
+) -> memoryview:
+    return await read_upload_capped(image, allowed_types, max_size_bytes)
+
+
+def _unreadable(exc: ImageQualityException) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail={"reason": exc.reason, "message": exc.message},
+    )
+
+
+def _overloaded(exc: ServiceOverloadedException) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=exc.message,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 
 @router.post("/extract-drug", response_model=Dict[str, Any], status_code=status.HTTP_200_OK)
@@ -27,29 +66,90 @@ async def extract_drug(
     ocr_service: OCRService = Depends(get_ocr_service),
     known_drugs: list[str] = Depends(get_medication_repository),
 ):
-    if str(image.content_type).lower() not in ALLOWED_CONTENT_TYPES:
+    image_bytes = await _read_upload(image)
+
+    try:
+        raw_result = await ocr_service.extract_drug_from_image(image_bytes, known_drugs)
+        return {"success": True, "data": raw_result, "error": None}
+    except ImageQualityException as unreadable:
+        raise _unreadable(unreadable)
+    except ServiceOverloadedException as overloaded:
+        raise _overloaded(overloaded)
+    except ValueError as val_err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(val_err))
+    except Exception as exc:
         raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=f"Unsupported file type. Allowed types are: {', '.join(ALLOWED_CONTENT_TYPES)}",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"OCR pipeline failure: {str(exc)}",
         )
 
-    image_bytes = await image.read()
 
-    if len(image_bytes) > MAX_FILE_SIZE_BYTES:
+@router.post("/scan-and-check", response_model=Dict[str, Any], status_code=status.HTTP_200_OK)
+async def scan_and_check(
+    image: UploadFile = File(...),
+    ocr_service: OCRService = Depends(get_ocr_service),
+    known_drugs: list[str] = Depends(get_medication_repository),
+    engine: InteractionEngine = Depends(get_interaction_engine),
+    db_records: List[InteractionRecord] = Depends(get_interaction_records),
+):
+    """Reads every drug off a prescription photo and checks them for interactions."""
+    image_bytes = await _read_upload(image)
+
+    try:
+        extraction = await ocr_service.extract_drugs_from_image(image_bytes, known_drugs)
+        prescribed_drugs = [drug["drug_name"] for drug in extraction["drugs"]]
+        report = engine.analyze_prescription(prescribed_drugs, db_records)
+        return {
+            "success": True,
+            "data": {**extraction, "interaction_report": report},
+            "error": None,
+        }
+    except ImageQualityException as unreadable:
+        raise _unreadable(unreadable)
+    except ServiceOverloadedException as overloaded:
+        raise _overloaded(overloaded)
+    except ValueError as val_err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(val_err))
+    except Exception as exc:
         raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="File size exceeds the maximum limit of 5MB.",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Scan and check failure: {str(exc)}",
         )
 
-    if not image_bytes:
+
+@router.post("/extract-drug/burst", response_model=Dict[str, Any], status_code=status.HTTP_200_OK)
+async def extract_drug_burst(
+    frames: List[UploadFile] = File(...),
+    ocr_service: OCRService = Depends(get_ocr_service),
+    known_drugs: list[str] = Depends(get_medication_repository),
+):
+    """
+    Identifies one pack from several captures of it: up to MAX_BURST_FRAMES
+    stills, or a single short video clip. Only the sharpest, best-exposed
+    frames are OCR'd; `frame_index` in the result names the one used.
+    """
+    is_clip = len(frames) == 1 and str(frames[0].content_type).lower() in ALLOWED_CLIP_CONTENT_TYPES
+    if len(frames) > MAX_BURST_FRAMES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Uploaded file is completely empty.",
+            detail=f"A burst may contain at most {MAX_BURST_FRAMES} frames.",
         )
 
+    if is_clip:
+        clip_bytes = await _read_upload(frames[0], ALLOWED_CLIP_CONTENT_TYPES, MAX_CLIP_SIZE_BYTES)
+    else:
+        frame_bytes = [await _read_upload(frame) for frame in frames]
+
     try:
-        raw_result = await ocr_service.extract_drug_from_image(image_bytes, known_drugs)
+        if is_clip:
+            raw_result = await ocr_service.extract_drug_from_clip(clip_bytes, known_drugs)
+        else:
+            raw_result = await ocr_service.extract_drug_from_burst(frame_bytes, known_drugs)
         return {"success": True, "data": raw_result, "error": None}
+    except ImageQualityException as unreadable:
+        raise _unreadable(unreadable)
+    except ServiceOverloadedException as overloaded:
+        raise _overloaded(overloaded)
     except ValueError as val_err:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(val_err))
     except Exception as exc:
@@ -57,3 +157,160 @@ async def extract_drug(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"OCR pipeline failure: {str(exc)}",
         )
+
+
+def _failed_line(line: Dict[str, Any], exc: Exception) -> Dict[str, Any]:
+    """An NDJSON stream line for one image or page that failed."""
+    failed = {**line, "success": False, "data": None}
+    if isinstance(exc, HTTPException):
+        return {**failed, "error": exc.detail}
+    if isinstance(exc, ImageQualityException):
+        return {**failed, "error": exc.message, "reason": exc.reason}
+    if isinstance(exc, ServiceOverloadedException):
+        return {**failed, "error": exc.message, "retry_after": exc.retry_after}
+    if isinstance(exc, ValueError):
+        return {**failed, "error": str(exc)}
+    return {**failed, "error": f"OCR pipeline failure: {str(exc)}"}
+
+
+async def _extract_batch_item(
+    index: int,
+    filename: str | None,
+    upload: memoryview | HTTPException,
+    ocr_service: OCRService,
+    known_drugs: list[str],
+) -> Dict[str, Any]:
+    line: Dict[str, Any] = {"type": "result", "index": index, "filename": filename}
+    try:
+        if isinstance(upload, HTTPException):
+            raise upload
+        data = await ocr_service.extract_drug_from_image(upload, known_drugs)
+    except Exception as exc:
+        return _failed_line(line, exc)
+    return {**line, "success": True, "data": data, "error": None}
+
+
+def _summary_line(
+    matched_drugs: List[str], engine: InteractionEngine, db_records: List[InteractionRecord]
+) -> Dict[str, Any]:
+    """The closing NDJSON line: every matched drug and their interaction check."""
+    unique_drugs = sorted(set(matched_drugs))
+    try:
+        report = engine.analyze_prescription(unique_drugs, db_records)
+        return {
+            "type": "summary",
+            "success": True,
+            "data": {"matched_drugs": unique_drugs, "interaction_report": report},
+            "error": None,
+        }
+    except Exception as exc:
+        return {
+            "type": "summary",
+            "success": False,
+            "data": {"matched_drugs": unique_drugs},
+            "error": f"Interaction engine failure: {str(exc)}",
+        }
+
+
+@router.post("/extract-drug/batch", status_code=status.HTTP_200_OK)
+async def extract_drug_batch(
+    images: List[UploadFile] = File(...),
+    ocr_service: OCRService = Depends(get_ocr_service),
+    known_drugs: list[str] = Depends(get_medication_repository),
+    engine: InteractionEngine = Depends(get_interaction_engine),
+    db_records: List[InteractionRecord] = Depends(get_interaction_records),
+):
+    """
+    OCRs up to MAX_BATCH_IMAGES packaging photos concurrently and streams
+    NDJSON: one `result` line per image as soon as it finishes (in
+    completion order, tagged with its upload `index`), then one `summary`
+    line with the interaction check over every matched drug.
+
+    A bad or failed image only fails its own line.
+    """
+    if len(images) > MAX_BATCH_IMAGES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {MAX_BATCH_IMAGES} images.",
+        )
+
+    # Read every upload before streaming: request files are closed once the
+    # endpoint returns the StreamingResponse
+    uploads: List[memoryview | HTTPException] = []
+    for image in images:
+        try:
+            uploads.append(await _read_upload(image))
+        except HTTPException as rejected:
+            uploads.append(rejected)
+    filenames = [image.filename for image in images]
+
+    async def stream() -> AsyncIterator[str]:
+        tasks = [
+            asyncio.create_task(_extract_batch_item(index, filenames[index], upload, ocr_service, known_drugs))
+            for index, upload in enumerate(uploads)
+        ]
+        matched_drugs: List[str] = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                line = await finished
+                if line["success"]:
+                    matched_drugs.append(line["data"]["matched_drug"])
+                yield json.dumps(line) + "\n"
+
+            yield json.dumps(_summary_line(matched_drugs, engine, db_records)) + "\n"
+        finally:
+            # Client went away mid-stream: stop queued OCR work
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/scan-and-check/pdf", status_code=status.HTTP_200_OK)
+async def scan_and_check_pdf(
+    document: UploadFile = File(...),
+    ocr_service: OCRService = Depends(get_ocr_service),
+    known_drugs: list[str] = Depends(get_medication_repository),
+    engine: InteractionEngine = Depends(get_interaction_engine),
+    db_records: List[InteractionRecord] = Depends(get_interaction_records),
+):
+    """
+    Reads every drug off a multi-page PDF prescription and streams NDJSON:
+    one `page` line per page, in page order, as soon as that page is done,
+    then one `summary` line with the interaction check over all pages.
+
+    A page that cannot be read only fails its own line.
+    """
+    if not PdfPages.available():
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="PDF uploads are not supported on this server.",
+        )
+    pdf_bytes = await _read_upload(document, ALLOWED_PDF_CONTENT_TYPES, MAX_PDF_SIZE_BYTES)
+
+    # Opened before streaming so a broken or oversized PDF fails the request
+    try:
+        pages = await ocr_service.open_pdf(pdf_bytes)
+    except ServiceOverloadedException as overloaded:
+        raise _overloaded(overloaded)
+    except ValueError as val_err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(val_err))
+    del pdf_bytes
+
+    async def stream() -> AsyncIterator[str]:
+        matched_drugs: List[str] = []
+        try:
+            async for page_number, outcome in ocr_service.extract_drugs_from_pdf(pages, known_drugs):
+                line: Dict[str, Any] = {"type": "page", "page": page_number}
+                if isinstance(outcome, Exception):
+                    line = _failed_line(line, outcome)
+                else:
+                    line = {**line, "success": True, "data": outcome, "error": None}
+                    matched_drugs.extend(drug["drug_name"] for drug in outcome["drugs"])
+                yield json.dumps(line) + "\n"
+
+            yield json.dumps(_summary_line(matched_drugs, engine, db_records)) + "\n"
+        finally:
+            pages.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
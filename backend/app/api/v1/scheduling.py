@@ -6,13 +6,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
 from app.api.dependencies import (
-    get_cache,
     get_interaction_records,
     get_schedule_optimizer,
     rate_limit_dependency,
 )
-from app.core.config import get_settings
-from app.infrastructure.cache.cache import CacheClient, build_cache_key
 from app.services.interactions.models import InteractionRecord
 from app.services.scheduling.schedule_optimizer import MedicationDosage, ScheduleOptimizer
 
@@ -22,8 +19,6 @@ router = APIRouter(
     dependencies=[Depends(rate_limit_dependency)],
 )
 
-settings = get_settings()
-
 
 class ScheduleRequest(BaseModel):
     dosages: List[MedicationDosage]
@@ -34,7 +29,6 @@ async def generate_schedule(
     request: ScheduleRequest,
     optimizer: ScheduleOptimizer = Depends(get_schedule_optimizer),
     db_records: List[InteractionRecord] = Depends(get_interaction_records),
-    cache: CacheClient = Depends(get_cache),
 ):
     if not request.dosages:
         raise HTTPException(
@@ -42,20 +36,10 @@ async def generate_schedule(
             detail="Dosage list cannot be empty.",
         )
 
-    records_payload = [row.model_dump(mode="json") for row in db_records]
-    dosages_payload = [row.model_dump(mode="json") for row in request.dosages]
-    cache_key = build_cache_key(
-        namespace="schedule",
-        payload={"dosages": dosages_payload, "records": records_payload, "v": 1},
-    )
-
-    cached_result = cache.get_json(cache_key)
-    if cached_result is not None:
-        return {"success": True, "data": cached_result, "error": None}
-
+    # Solutions are memoized per drug-name-free problem shape inside the
+    # optimizer (see ScheduleSolutionCache), so no request-level cache here.
     try:
         raw_result = optimizer.generate_schedule(request.dosages, db_records)
-        cache.set_json(cache_key, raw_result, ttl=settings.cache_ttl_seconds)
         return {"success": True, "data": raw_result, "error": None}
     except Exception as exc:
         raise HTTPException(
@@ -20,6 +20,22 @@ def _to_int(value: str | None, default: int) -> int:
         return default
 
 
+def _to_float(value: str | None, default: float) -> float:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _to_choice(value: str | None, choices: tuple[str, ...], default: str) -> str:
+    if value is None:
+        return default
+    normalized = value.strip().lower()
+    return normalized if normalized in choices else default
+
+
 @dataclass(frozen=True)
 class Settings:
     app_name: str
@@ -37,14 +53,48 @@ class Settings:
 
     rate_limit_enabled: bool
     rate_limit_per_minute: int
+    health_refresh_interval_seconds: float
+    health_probe_timeout_seconds: float
 
     celery_enabled: bool
     celery_broker_url: str
     celery_result_backend: str
+    blob_spool_dir: str
+    blob_spool_ttl_seconds: int
 
     tesseract_cmd: str
     ocr_language: str
     ocr_required_for_readiness: bool
+    ocr_pipeline_mode: str
+    ocr_max_text_regions: int
+    ocr_engine: str
+    tessdata_path: str
+    ocr_cache_ttl_seconds: int
+    ocr_packaging_index_enabled: bool
+    ocr_packaging_max_distance: int
+    ocr_packaging_min_confidence: float
+    ocr_packaging_index_capacity: int
+    ocr_cascade_enabled: bool
+    ocr_cascade_min_confidence: float
+    ocr_max_workers: int
+    ocr_execution_mode: str
+    ocr_max_queue: int
+    ocr_queue_max_wait_seconds: float
+    ocr_profiling: str
+    ocr_quality_gate_enabled: bool
+    ocr_quality_min_sharpness: float
+    ocr_quality_min_text_height_px: float
+    ocr_quality_dark_level: int
+    ocr_quality_bright_level: int
+    ocr_quality_min_contrast: int
+    ocr_barcode_enabled: bool
+    ocr_product_index_path: str
+    ocr_burst_top_frames: int
+    ocr_vocabulary_hints_enabled: bool
+    ocr_vocabulary_cache_dir: str
+    ocr_pdf_dpi: int
+    ocr_pdf_max_pages: int
+    ocr_pdf_page_concurrency: int
 
     allowed_origins: tuple[str, ...]
 
@@ -69,6 +119,8 @@ def get_settings() -> Settings:
         cache_key_prefix=os.getenv("CACHE_KEY_PREFIX", "medigraph"),
         rate_limit_enabled=_to_bool(os.getenv("RATE_LIMIT_ENABLED"), True),
         rate_limit_per_minute=_to_int(os.getenv("RATE_LIMIT_PER_MINUTE"), 120),
+        health_refresh_interval_seconds=_to_float(os.getenv("HEALTH_REFRESH_INTERVAL_SECONDS"), 10.0),
+        health_probe_timeout_seconds=_to_float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS"), 2.0),
         celery_enabled=_to_bool(os.getenv("CELERY_ENABLED"), False),
         celery_broker_url=os.getenv(
             "CELERY_BROKER_URL", os.getenv("REDIS_URL", "redis://localhost:6379/1")
@@ -77,8 +129,41 @@ def get_settings() -> Settings:
             "CELERY_RESULT_BACKEND",
             os.getenv("REDIS_URL", "redis://localhost:6379/2"),
         ),
+        blob_spool_dir=os.getenv("BLOB_SPOOL_DIR", "").strip(),
+        blob_spool_ttl_seconds=_to_int(os.getenv("BLOB_SPOOL_TTL_SECONDS"), 86400),
         tesseract_cmd=os.getenv("TESSERACT_CMD", "").strip(),
         ocr_language=os.getenv("OCR_LANGUAGE", "eng").strip() or "eng",
         ocr_required_for_readiness=_to_bool(os.getenv("OCR_REQUIRED_FOR_READINESS"), False),
+        ocr_pipeline_mode=_to_choice(os.getenv("OCR_PIPELINE_MODE"), ("full", "roi", "regions"), "full"),
+        ocr_max_text_regions=_to_int(os.getenv("OCR_MAX_TEXT_REGIONS"), 3),
+        ocr_engine=_to_choice(os.getenv("OCR_ENGINE"), ("auto", "tesserocr", "pytesseract"), "auto"),
+        tessdata_path=os.getenv("TESSDATA_PATH", "").strip(),
+        ocr_cache_ttl_seconds=_to_int(os.getenv("OCR_CACHE_TTL_SECONDS"), 86400),
+        ocr_packaging_index_enabled=_to_bool(os.getenv("OCR_PACKAGING_INDEX_ENABLED"), True),
+        ocr_packaging_max_distance=_to_int(os.getenv("OCR_PACKAGING_MAX_DISTANCE"), 48),
+        ocr_packaging_min_confidence=_to_float(os.getenv("OCR_PACKAGING_MIN_CONFIDENCE"), 0.9),
+        ocr_packaging_index_capacity=_to_int(os.getenv("OCR_PACKAGING_INDEX_CAPACITY"), 50000),
+        ocr_cascade_enabled=_to_bool(os.getenv("OCR_CASCADE_ENABLED"), True),
+        # Defaults to DrugMatcher.MIN_CONFIDENCE_THRESHOLD
+        ocr_cascade_min_confidence=_to_float(os.getenv("OCR_CASCADE_MIN_CONFIDENCE"), 0.65),
+        ocr_max_workers=_to_int(os.getenv("OCR_MAX_WORKERS"), 0),
+        ocr_execution_mode=_to_choice(os.getenv("OCR_EXECUTION_MODE"), ("thread", "process"), "thread"),
+        ocr_max_queue=_to_int(os.getenv("OCR_MAX_QUEUE"), 32),
+        ocr_queue_max_wait_seconds=_to_float(os.getenv("OCR_QUEUE_MAX_WAIT_SECONDS"), 10.0),
+        ocr_profiling=_to_choice(os.getenv("OCR_PROFILING"), ("off", "metrics", "debug"), "metrics"),
+        ocr_quality_gate_enabled=_to_bool(os.getenv("OCR_QUALITY_GATE_ENABLED"), True),
+        ocr_quality_min_sharpness=_to_float(os.getenv("OCR_QUALITY_MIN_SHARPNESS"), 15.0),
+        ocr_quality_min_text_height_px=_to_float(os.getenv("OCR_QUALITY_MIN_TEXT_HEIGHT_PX"), 8.0),
+        ocr_quality_dark_level=_to_int(os.getenv("OCR_QUALITY_DARK_LEVEL"), 60),
+        ocr_quality_bright_level=_to_int(os.getenv("OCR_QUALITY_BRIGHT_LEVEL"), 200),
+        ocr_quality_min_contrast=_to_int(os.getenv("OCR_QUALITY_MIN_CONTRAST"), 32),
+        ocr_barcode_enabled=_to_bool(os.getenv("OCR_BARCODE_ENABLED"), True),
+        ocr_product_index_path=os.getenv("OCR_PRODUCT_INDEX_PATH", "").strip(),
+        ocr_burst_top_frames=_to_int(os.getenv("OCR_BURST_TOP_FRAMES"), 2),
+        ocr_vocabulary_hints_enabled=_to_bool(os.getenv("OCR_VOCABULARY_HINTS_ENABLED"), False),
+        ocr_vocabulary_cache_dir=os.getenv("OCR_VOCABULARY_CACHE_DIR", "").strip(),
+        ocr_pdf_dpi=_to_int(os.getenv("OCR_PDF_DPI"), 300),
+        ocr_pdf_max_pages=_to_int(os.getenv("OCR_PDF_MAX_PAGES"), 50),
+        ocr_pdf_page_concurrency=_to_int(os.getenv("OCR_PDF_PAGE_CONCURRENCY"), 2),
         allowed_origins=allowed_origins if allowed_origins else ("*",),
     )
@@ -16,3 +16,19 @@ class ValidationException(AppException):
 class DependencyUnavailableException(AppException):
     def __init__(self, message: str) -> None:
         super().__init__(message=message, status_code=503)
+
+
+class ServiceOverloadedException(AppException):
+    """Raised when work is shed under load; clients should retry after a delay."""
+
+    def __init__(self, message: str, retry_after: int = 1) -> None:
+        super().__init__(message=message, status_code=503)
+        self.retry_after = retry_after
+
+
+class ImageQualityException(AppException):
+    """Raised when an upload is too blurry, badly exposed or small to OCR; `reason` is machine-readable."""
+
+    def __init__(self, message: str, reason: str) -> None:
+        super().__init__(message=message, status_code=422)
+        self.reason = reason
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable
+
+try:
+    # The registry services record into and /metrics serves
+    from app.core.metrics import get_metrics_registry
+except ModuleNotFoundError:
+    from backend.app.core.metrics import get_metrics_registry
+
+# A probe returns a status dict with a boolean "ready" (like
+# get_ocr_runtime_status), or a bare bool; raising counts as not ready.
+Probe = Callable[[], Any]
+
+
+class HealthMonitor:
+    """
+    Dependency health probes refreshed in the background.
+
+    Every `interval_seconds` all probes run concurrently, each bounded by
+    `timeout_seconds`; endpoints read the latest snapshot without touching
+    any dependency. A probe still running from an earlier round is not
+    started again, so a hung database or binary cannot pile up threads.
+
+    Probes named in `optional` are reported but do not affect ready().
+    Results older than STALE_AFTER_INTERVALS refresh intervals are reported
+    as not ready, so a stuck refresh loop cannot look healthy forever.
+    """
+
+    STALE_AFTER_INTERVALS = 3
+
+    def __init__(
+        self,
+        probes: dict[str, Probe],
+        interval_seconds: float,
+        timeout_seconds: float,
+        optional: tuple[str, ...] = (),
+    ) -> None:
+        self._probes = probes
+        self._optional = optional
+        self._interval_seconds = interval_seconds
+        self._timeout_seconds = timeout_seconds
+        # Created on demand: stop() shuts it down, and a later start() or
+        # refresh() (e.g. the next app lifespan) gets a new one
+        self._pool: ThreadPoolExecutor | None = None
+        self._running: dict[str, Future] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._refresh_lock = threading.Lock()
+        # Replaced wholesale on refresh, so readers never need the lock
+        self._snapshot: dict[str, dict[str, Any]] = {
+            name: {"ready": False, "message": "Health check pending.", "checked_at": None}
+            for name in probes
+        }
+
+        metrics = get_metrics_registry()
+        self._duration_histogram = metrics.histogram(
+            "health_probe_seconds", "Duration of background dependency health probes."
+        )
+        self._timeout_counter = metrics.counter(
+            "health_probe_timeouts_total", "Health probes that exceeded their timeout."
+        )
+
+    @staticmethod
+    def _run_probe(probe: Probe) -> tuple[dict[str, Any], float]:
+        started_at = time.monotonic()
+        try:
+            outcome = probe()
+            if isinstance(outcome, dict):
+                status = {**outcome, "ready": bool(outcome.get("ready", False))}
+            else:
+                status = {"ready": bool(outcome)}
+        except Exception as exc:
+            status = {"ready": False, "message": f"Health probe failed: {exc}"}
+        return status, time.monotonic() - started_at
+
+    def refresh(self) -> dict[str, dict[str, Any]]:
+        """Runs every probe once, concurrently, and publishes the results."""
+        with self._refresh_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=max(1, len(self._probes)), thread_name_prefix="health-probe"
+                )
+            for name, probe in self._probes.items():
+                running = self._running.get(name)
+                if running is None or running.done():
+                    self._running[name] = self._pool.submit(self._run_probe, probe)
+
+            deadline = time.monotonic() + self._timeout_seconds
+            snapshot: dict[str, dict[str, Any]] = {}
+            for name, future in self._running.items():
+                try:
+                    status, duration = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    self._duration_histogram.observe(duration)
+                except FutureTimeoutError:
+                    self._timeout_counter.inc()
+                    status = {
+                        "ready": False,
+                        "message": f"Health probe timed out after {self._timeout_seconds:g}s.",
+                    }
+                snapshot[name] = {**status, "checked_at": time.time()}
+
+            self._snapshot = snapshot
+            return snapshot
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Latest probe results by name, each with its `checked_at` timestamp."""
+        snapshot = self._snapshot
+        now = time.time()
+        stale_before = now - self.STALE_AFTER_INTERVALS * self._interval_seconds - self._timeout_seconds
+        stale = {
+            name for name, status in snapshot.items()
+            if status["checked_at"] is not None and status["checked_at"] < stale_before
+        }
+        if not stale:
+            return snapshot
+        return {
+            name: {
+                **status,
+                "ready": False,
+                "message": f"Health check is stale; last checked {now - status['checked_at']:.0f}s ago.",
+            } if name in stale else status
+            for name, status in snapshot.items()
+        }
+
+    def ready(self) -> bool:
+        """Whether every required probe passed in the latest, non-stale snapshot."""
+        return all(status["ready"] for name, status in self.snapshot().items() if name not in self._optional)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the previous snapshot; the next round retries
+                pass
+            self._stop.wait(self._interval_seconds)
+
+    def start(self) -> None:
+        """Starts background refreshing; the first round runs immediately."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="health-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._timeout_seconds + 1)
+            self._thread = None
+        with self._refresh_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            self._running.clear()
@@ -6,7 +6,10 @@ import threading
 import time
 from typing import Any
 
-from app.core.config import get_settings
+try:
+    from app.core.config import get_settings
+except ImportError:
+    from backend.app.core.config import get_settings
 
 try:
     import redis as redis_lib
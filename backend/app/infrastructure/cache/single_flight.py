@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one computation.
+
+    The first caller (the leader) runs the work; callers arriving while it is
+    in flight wait on the leader's future instead of starting a duplicate.
+    Works for both thread-pool callers and asyncio callers, which await the
+    shared future without holding a thread.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # Strong references to running async leaders' work
+        self._tasks: set[asyncio.Task] = set()
+
+    def _claim(self, key: str) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _settle(self, key: str, future: Future, result: Any = None, error: BaseException | None = None) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def run(self, key: str, fn: Callable[[], Any]) -> Any:
+        future, is_leader = self._claim(key)
+        if not is_leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._settle(key, future, error=exc)
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    def _settle_task(self, key: str, future: Future, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            # Only on event loop shutdown; callers get an ordinary error
+            self._settle(key, future, error=RuntimeError("The shared computation was cancelled."))
+        elif task.exception() is not None:
+            self._settle(key, future, error=task.exception())
+        else:
+            self._settle(key, future, result=task.result())
+
+    async def run_async(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        `fn` is a coroutine function; followers share its outcome.
+
+        The work runs in its own task, so cancelling a caller (the leader
+        included, e.g. on client disconnect) only stops that caller waiting;
+        the others still get the result.
+        """
+        future, is_leader = self._claim(key)
+        if is_leader:
+            task = asyncio.ensure_future(fn())
+            self._tasks.add(task)
+            task.add_done_callback(functools.partial(self._settle_task, key, future))
+        # Shielded: a cancelled waiter must not cancel the shared future
+        return await asyncio.shield(asyncio.wrap_future(future))
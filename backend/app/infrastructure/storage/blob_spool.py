@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.core.config import get_settings
+from app.services.ocr.drug_matcher import DrugVocabulary
+
+_BLOB_KEY = re.compile(r"^[0-9a-f]{64}$")
+_VOCABULARY_VERSION = re.compile(r"^[0-9a-f]{16}$")
+
+
+class BlobNotFoundError(ValueError):
+    """The blob was never spooled, or expired before a worker read it."""
+
+
+class BlobSpool:
+    """
+    Content-addressed file store on a volume shared by the API and workers.
+
+    The API writes an upload once and sends workers only its SHA-256 key,
+    keeping image bytes out of the broker; identical uploads share one file.
+    Workers map blobs read-only instead of reading them into memory. Drug
+    vocabularies are spooled the same way, under their vocabulary version.
+
+    Blobs older than `ttl_seconds` are swept at most once per
+    `prune_interval_seconds`, from whichever process writes next.
+    """
+
+    # Vocabularies a worker keeps parsed in memory
+    WORKER_VOCABULARY_VERSIONS = 2
+
+    def __init__(self, root: str, ttl_seconds: int, prune_interval_seconds: int = 600) -> None:
+        self._root = root
+        self._ttl_seconds = ttl_seconds
+        self._prune_interval_seconds = prune_interval_seconds
+        self._last_prune = 0.0
+        self._prune_lock = threading.Lock()
+        self._vocabularies: OrderedDict[str, list[str]] = OrderedDict()
+        self._vocabularies_lock = threading.Lock()
+
+    def _blob_path(self, key: str) -> str:
+        if not _BLOB_KEY.match(key):
+            raise BlobNotFoundError(f"Invalid blob key: {key!r}")
+        # Two-level fan-out keeps directories small on busy volumes
+        return os.path.join(self._root, "blobs", key[:2], key)
+
+    def _vocabulary_path(self, version: str) -> str:
+        if not _VOCABULARY_VERSION.match(version):
+            raise BlobNotFoundError(f"Invalid vocabulary version: {version!r}")
+        return os.path.join(self._root, "vocabularies", version)
+
+    def _write_once(self, path: str, data: bytes | memoryview) -> None:
+        try:
+            # Refresh the TTL of content that is being submitted again
+            os.utime(path)
+            return
+        except FileNotFoundError:
+            # New content, or pruned between submissions: write it
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(handle, "wb") as tmp_file:
+                tmp_file.write(data)
+            # Readers never see a partial blob
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def put(self, data: bytes | memoryview) -> str:
+        """Stores `data` and returns its key (SHA-256 hex digest)."""
+        key = hashlib.sha256(data).hexdigest()
+        self._write_once(self._blob_path(key), data)
+        self._maybe_prune()
+        return key
+
+    @contextmanager
+    def open(self, key: str) -> Iterator[memoryview]:
+        """
+        Read-only view of a blob, memory-mapped for the duration of the block.
+
+        Raises:
+            BlobNotFoundError: Unknown or expired key.
+        """
+        try:
+            blob_file = open(self._blob_path(key), "rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"Blob {key} is not in the spool; it may have expired.") from None
+
+        with blob_file:
+            mapping = mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapping)
+            try:
+                yield view
+            finally:
+                view.release()
+                try:
+                    mapping.close()
+                except BufferError:
+                    # Something still holds a view (e.g. an array in a pending
+                    # traceback); the mapping is unmapped when that is collected
+                    pass
+
+    def delete(self, key: str) -> None:
+        """Removes a blob whose job is done; one already gone is not an error."""
+        try:
+            os.unlink(self._blob_path(key))
+        except FileNotFoundError:
+            pass
+
+    def put_vocabulary(self, version: str, known_drugs: list[str]) -> str:
+        """Stores a drug vocabulary under its vocabulary_version() and returns it."""
+        path = self._vocabulary_path(version)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._write_once(path, "\n".join(known_drugs).encode("utf-8"))
+        return version
+
+    def load_vocabulary(self, version: str) -> list[str]:
+        """
+        Vocabulary spooled under `version`, parsed once per worker process.
+
+        Raises:
+            BlobNotFoundError: Unknown or expired version.
+        """
+        with self._vocabularies_lock:
+            known_drugs = self._vocabularies.get(version)
+            if known_drugs is not None:
+                self._vocabularies.move_to_end(version)
+                return known_drugs
+
+        try:
+            with open(self._vocabulary_path(version), "rb") as vocabulary_file:
+                content = vocabulary_file.read().decode("utf-8")
+        except FileNotFoundError:
+            raise BlobNotFoundError(
+                f"Vocabulary {version} is not in the spool; it may have expired."
+            ) from None
+        known_drugs = DrugVocabulary(content.split("\n") if content else [], version=version)
+
+        with self._vocabularies_lock:
+            self._vocabularies[version] = known_drugs
+            while len(self._vocabularies) > self.WORKER_VOCABULARY_VERSIONS:
+                self._vocabularies.popitem(last=False)
+        return known_drugs
+
+    def _maybe_prune(self) -> None:
+        now = time.time()
+        with self._prune_lock:
+            if now - self._last_prune < self._prune_interval_seconds:
+                return
+            self._last_prune = now
+        self.prune(now - self._ttl_seconds)
+
+    def prune(self, older_than: float) -> int:
+        """Deletes blobs and vocabularies last written before `older_than`; returns the count."""
+        removed = 0
+        for directory, _, filenames in os.walk(self._root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    if os.stat(path).st_mtime < older_than:
+                        os.unlink(path)
+                        removed += 1
+                except FileNotFoundError:
+                    # Another process pruned it first
+                    continue
+        return removed
+
+
+_blob_spool_singleton: BlobSpool | None = None
+_blob_spool_lock = threading.Lock()
+
+
+def get_blob_spool() -> BlobSpool:
+    global _blob_spool_singleton
+    if _blob_spool_singleton is None:
+        with _blob_spool_lock:
+            if _blob_spool_singleton is None:
+                settings = get_settings()
+                _blob_spool_singleton = BlobSpool(
+                    root=settings.blob_spool_dir or os.path.join(tempfile.gettempdir(), "medgraph-blob-spool"),
+                    ttl_seconds=settings.blob_spool_ttl_seconds,
+                )
+    return _blob_spool_singleton
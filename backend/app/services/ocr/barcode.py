@@ -0,0 +1,205 @@
+import csv
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+try:
+    from pylibdmtx import pylibdmtx
+except ImportError:  # pragma: no cover - optional dependency fallback
+    pylibdmtx = None
+
+# Symbology identifiers scanners prepend to GS1 payloads (]d2 DataMatrix,
+# ]Q3 QR, ]C1 GS1-128, ]e0 DataBar)
+_SYMBOLOGY_PREFIX = re.compile(r"^\][A-Za-z][0-9]")
+_HRI_ELEMENT = re.compile(r"\((\d{2,4})\)([^(]*)")
+_DIGITAL_LINK_GTIN = re.compile(r"/01/(\d{8,14})(?:/|\?|$)")
+_GROUP_SEPARATOR = "\x1d"
+
+# GS1 application identifiers found on medicine packs: fixed payload length,
+# or None for variable-length fields ended by a group separator
+_APPLICATION_IDENTIFIERS = {
+    "01": 14,    # GTIN
+    "17": 6,     # expiry, YYMMDD
+    "10": None,  # batch / lot
+    "21": None,  # serial number
+    "11": 6,     # production date
+    "15": 6,     # best before
+}
+_AI_FIELDS = {"01": "gtin", "17": "expiry", "10": "batch", "21": "serial"}
+
+
+def normalize_gtin(code: str) -> Optional[str]:
+    """GTIN-8/12/13/14 as a zero-padded GTIN-14, or None when the check digit fails."""
+    digits = code.strip()
+    if not digits.isdigit() or len(digits) not in (8, 12, 13, 14):
+        return None
+    digits = digits.zfill(14)
+    # GS1 mod-10: weights 3,1,3,... from the digit left of the check digit
+    total = sum(int(digit) * (3 if position % 2 == 0 else 1) for position, digit in enumerate(reversed(digits[:-1])))
+    if (10 - total % 10) % 10 != int(digits[-1]):
+        return None
+    return digits
+
+
+def parse_gs1(data: str) -> Dict[str, str]:
+    """
+    GS1 fields (gtin, expiry, batch, serial) from a scanned payload: a raw
+    element string, bracketed human-readable form, GS1 Digital Link URL or
+    plain EAN/UPC digits. Unrecognised payloads yield an empty dict.
+    """
+    payload = _SYMBOLOGY_PREFIX.sub("", data.strip())
+
+    link = _DIGITAL_LINK_GTIN.search(payload)
+    if link is not None:
+        return {"gtin": link.group(1)}
+
+    if payload.startswith("("):
+        return {
+            _AI_FIELDS[ai]: value.strip()
+            for ai, value in _HRI_ELEMENT.findall(payload)
+            if ai in _AI_FIELDS
+        }
+
+    if payload.isdigit() and len(payload) in (8, 12, 13):
+        return {"gtin": payload}
+
+    fields: Dict[str, str] = {}
+    position = 0
+    while position < len(payload):
+        if payload[position] == _GROUP_SEPARATOR:
+            position += 1
+            continue
+        ai = payload[position:position + 2]
+        if ai not in _APPLICATION_IDENTIFIERS:
+            break
+        length = _APPLICATION_IDENTIFIERS[ai]
+        start = position + 2
+        if length is None:
+            end = payload.find(_GROUP_SEPARATOR, start)
+            end = len(payload) if end == -1 else end
+        else:
+            end = start + length
+        if ai in _AI_FIELDS:
+            fields[_AI_FIELDS[ai]] = payload[start:end]
+        position = end
+    return fields
+
+
+@dataclass(frozen=True)
+class BarcodeReading:
+    symbology: str
+    data: str
+    gtin: Optional[str]
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+class BarcodeScanner:
+    """
+    Finds and decodes product codes on a grayscale photo: EAN/UPC through
+    OpenCV's barcode detector, QR (including GS1 Digital Link) through its
+    QR detector, and GS1 DataMatrix when the optional pylibdmtx is installed.
+    """
+
+    # Long side (px) photos are scanned at: barcodes on a pack photo stay
+    # decodable, and detection cost stays flat for large uploads
+    SCAN_LONG_SIDE = 1280
+
+    DATAMATRIX_TIMEOUT_MS = 50
+
+    # OpenCV detectors keep per-call state, so each OCR worker thread owns a pair
+    _local = threading.local()
+
+    @staticmethod
+    def _detectors():
+        local = BarcodeScanner._local
+        if not hasattr(local, "barcode"):
+            local.barcode = cv2.barcode.BarcodeDetector()
+            local.qr = cv2.QRCodeDetector()
+        return local.barcode, local.qr
+
+    @staticmethod
+    def _reading(symbology: str, data: str) -> BarcodeReading:
+        fields = parse_gs1(data)
+        gtin = normalize_gtin(fields["gtin"]) if "gtin" in fields else None
+        return BarcodeReading(symbology=symbology, data=data, gtin=gtin, fields=fields)
+
+    @staticmethod
+    def scan(gray: np.ndarray) -> List[BarcodeReading]:
+        """Every code decoded on the image, linear barcodes first."""
+        barcode_detector, qr_detector = BarcodeScanner._detectors()
+        readings: List[BarcodeReading] = []
+
+        # 1. EAN-13 / EAN-8 / UPC (linear)
+        found, decoded, types, _ = barcode_detector.detectAndDecodeWithType(gray)
+        if found:
+            readings.extend(
+                BarcodeScanner._reading(symbology, data)
+                for data, symbology in zip(decoded, types)
+                if data
+            )
+
+        # 2. GS1 DataMatrix (optional native decoder)
+        if pylibdmtx is not None:
+            for symbol in pylibdmtx.decode(gray, timeout=BarcodeScanner.DATAMATRIX_TIMEOUT_MS, max_count=1):
+                readings.append(BarcodeScanner._reading("DATAMATRIX", symbol.data.decode("utf-8", "replace")))
+
+        # 3. QR
+        data, _, _ = qr_detector.detectAndDecode(gray)
+        if data:
+            readings.append(BarcodeScanner._reading("QR", data))
+
+        return readings
+
+
+class ProductIndex:
+    """
+    Local GTIN -> drug name table, loaded from a CSV with `gtin` and
+    `drug_name` columns. Rows with a malformed GTIN are skipped.
+    """
+
+    def __init__(self, products: Dict[str, str]) -> None:
+        self._products = products
+        digest = hashlib.sha256()
+        for gtin in sorted(products):
+            digest.update(f"{gtin}\t{products[gtin]}\n".encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ProductIndex":
+        products: Dict[str, str] = {}
+        with open(path, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                gtin = normalize_gtin(row.get("gtin") or "")
+                drug_name = (row.get("drug_name") or "").strip()
+                if gtin is not None and drug_name:
+                    products[gtin] = drug_name
+        return cls(products)
+
+    def lookup(self, gtin: Optional[str]) -> Optional[str]:
+        if gtin is None:
+            return None
+        return self._products.get(gtin)
+
+
+_product_indexes: Dict[str, ProductIndex] = {}
+_product_index_lock = threading.Lock()
+
+
+def get_product_index(path: str) -> ProductIndex:
+    """One index per product file, loaded on first use."""
+    index = _product_indexes.get(path)
+    if index is None:
+        with _product_index_lock:
+            index = _product_indexes.get(path)
+            if index is None:
+                index = ProductIndex.from_csv(path)
+                _product_indexes[path] = index
+    return index
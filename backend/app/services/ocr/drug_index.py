@@ -0,0 +1,175 @@
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from .drug_matcher import vocabulary_version
+
+T = TypeVar("T")
+
+# Systematic Tesseract misreads folded onto one representative glyph:
+# O/0 -> O, I/1/L/| -> I, S/5 -> S, B/8 -> B. "RN" (read for "M") is folded
+# first, since it spans two characters.
+_CONFUSION_TABLE = str.maketrans({"0": "O", "1": "I", "L": "I", "|": "I", "5": "S", "8": "B"})
+_WHITESPACE = re.compile(r"\s+")
+
+
+def confusion_key(text: str) -> str:
+    """Case- and OCR-confusion-insensitive lookup key for a drug name or token run."""
+    folded = _WHITESPACE.sub(" ", text.upper()).strip().replace("RN", "M")
+    return folded.translate(_CONFUSION_TABLE)
+
+
+class ConfusionKeyMap:
+    """
+    Hash map from confusion_key to drug name, precomputed per vocabulary.
+
+    Resolves the common case of an OCR token run that equals a drug name up
+    to systematic misreads in O(tokens), before any fuzzy scoring. Keys
+    shared by two different drugs are dropped, so a hit is never ambiguous.
+    """
+
+    def __init__(self, known_drugs: List[str]) -> None:
+        entries: Dict[str, Tuple[int, str]] = {}
+        ambiguous: Set[str] = set()
+        max_words = 1
+        for name_id, name in enumerate(known_drugs):
+            key = confusion_key(name)
+            if not key:
+                continue
+            existing = entries.get(key)
+            if existing is None:
+                entries[key] = (name_id, name)
+                max_words = max(max_words, key.count(" ") + 1)
+            elif existing[1] != name:
+                ambiguous.add(key)
+        for key in ambiguous:
+            del entries[key]
+        self._entries = entries
+        self._max_words = max_words
+
+    def get(self, text: str) -> Optional[str]:
+        """Drug whose whole name equals `text` up to systematic misreads."""
+        hit = self._entries.get(confusion_key(text))
+        return hit[1] if hit is not None else None
+
+    def lookup(self, text: str) -> Optional[str]:
+        """
+        Drug named by any run of consecutive tokens in `text`. When several
+        drugs are named, the first in vocabulary order wins, as it would for
+        equal partial_ratio scores.
+        """
+        tokens = confusion_key(text).split(" ")
+        best: Optional[Tuple[int, str]] = None
+        for start in range(len(tokens)):
+            for end in range(start + 1, min(len(tokens), start + self._max_words) + 1):
+                hit = self._entries.get(" ".join(tokens[start:end]))
+                if hit is not None and (best is None or hit[0] < best[0]):
+                    best = hit
+        return best[1] if best is not None else None
+
+
+class DrugNameIndex:
+    """
+    Prebuilt fuzzy-match index over one drug vocabulary.
+
+    Every name is split into padded character trigrams stored in inverted
+    lists. A query only touches the lists of its own trigrams: names are
+    ranked by the fraction of their trigrams found in the query (the
+    partial_ratio analogue of containment), and only the top candidates are
+    rescored with RapidFuzz. Match cost therefore tracks the number of names
+    sharing trigrams with the query, not the vocabulary size.
+    """
+
+    NGRAM = 3
+
+    # Candidates rescored exactly per query. Large enough that a name with a
+    # few OCR misreads still ranks in, small enough to keep rescoring flat.
+    DEFAULT_CANDIDATES = 256
+
+    def __init__(self, known_drugs: List[str]) -> None:
+        self._names = list(known_drugs)
+        postings: Dict[str, List[int]] = defaultdict(list)
+        gram_counts = np.ones(len(self._names), dtype=np.float32)
+
+        for name_id, name in enumerate(self._names):
+            grams = self._ngrams(name)
+            gram_counts[name_id] = max(1, len(grams))
+            for gram in grams:
+                postings[gram].append(name_id)
+
+        self._postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._gram_counts = gram_counts
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @classmethod
+    def _ngrams(cls, text: str) -> Set[str]:
+        padded = f" {text.upper()} "
+        return {padded[i:i + cls.NGRAM] for i in range(len(padded) - cls.NGRAM + 1)}
+
+    def candidates(self, text: str, limit: int = DEFAULT_CANDIDATES) -> List[int]:
+        """Ids of the `limit` names sharing the largest share of trigrams with `text`."""
+        lists = [self._postings[gram] for gram in self._ngrams(text) if gram in self._postings]
+        if not lists:
+            return []
+
+        # Sparse counts over the posting hits only; a dense bincount would
+        # allocate and scan one slot per vocabulary name on every query
+        hits, counts = np.unique(np.concatenate(lists), return_counts=True)
+        if len(hits) > limit:
+            coverage = counts / self._gram_counts[hits]
+            hits = hits[np.argpartition(-coverage, limit - 1)[:limit]]
+        # Vocabulary order, so score ties resolve like a linear scan would
+        return sorted(hits.tolist())
+
+    def match(
+        self, text: str, min_score: float, limit: int = DEFAULT_CANDIDATES
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Best partial_ratio match among the candidates, as (name, score 0.0-1.0),
+        or None when no candidate reaches `min_score`.
+        """
+        names = [self._names[name_id] for name_id in self.candidates(text, limit)]
+        if not names:
+            return None
+        result = process.extractOne(text, names, scorer=fuzz.partial_ratio, score_cutoff=min_score * 100)
+        if result is None:
+            return None
+        name, score, _ = result
+        return name, score / 100.0
+
+
+_index_cache: "OrderedDict[str, DrugNameIndex]" = OrderedDict()
+_confusion_cache: "OrderedDict[str, ConfusionKeyMap]" = OrderedDict()
+_index_lock = threading.Lock()
+MAX_CACHED_INDEXES = 2
+
+
+def _per_vocabulary(cache: "OrderedDict[str, T]", known_drugs: List[str], factory: Callable[[List[str]], T]) -> T:
+    # Built under the lock, so concurrent first requests for a new
+    # catalogue wait for a single build
+    version = vocabulary_version(known_drugs)
+    with _index_lock:
+        built = cache.get(version)
+        if built is None:
+            built = factory(known_drugs)
+            cache[version] = built
+            while len(cache) > MAX_CACHED_INDEXES:
+                cache.popitem(last=False)
+        cache.move_to_end(version)
+        return built
+
+
+def get_drug_name_index(known_drugs: List[str]) -> DrugNameIndex:
+    """One trigram index per vocabulary version."""
+    return _per_vocabulary(_index_cache, known_drugs, DrugNameIndex)
+
+
+def get_confusion_key_map(known_drugs: List[str]) -> ConfusionKeyMap:
+    """One confusion-key map per vocabulary version."""
+    return _per_vocabulary(_confusion_cache, known_drugs, ConfusionKeyMap)
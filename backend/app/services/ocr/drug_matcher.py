@@ -1,6 +1,38 @@
-from typing import List, Tuple, Optional
+import hashlib
+from typing import Callable, List, Tuple, Optional
+
+import numpy as np
 from rapidfuzz import process, fuzz
 
+
+def vocabulary_version(known_drugs: List[str]) -> str:
+    """
+    Short content hash identifying a drug vocabulary. Order-sensitive on
+    purpose (no sort over ~200k names per request): repositories return the
+    catalogue in a stable order.
+
+    O(1) for a DrugVocabulary, which carries the hash computed at load time;
+    any other list is hashed on every call.
+    """
+    if isinstance(known_drugs, DrugVocabulary):
+        return known_drugs.version
+    digest = hashlib.sha256("\n".join(known_drugs).encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+class DrugVocabulary(list):
+    """
+    Drug catalogue as loaded by a repository, with its vocabulary_version()
+    computed once. Hashing ~200k names takes milliseconds, and one request
+    looks the version up several times (result cache, hints, indexes).
+
+    Treat as read-only: mutating it in place leaves `version` stale.
+    """
+
+    def __init__(self, known_drugs: List[str] = (), version: Optional[str] = None) -> None:
+        super().__init__(known_drugs)
+        self.version = version or vocabulary_version(list(self))
+
 class DrugMatcher:
     """
     Fuzzy string matching for drug interactions using rapidfuzz C++ bindings
@@ -11,6 +43,14 @@ class DrugMatcher:
     # A score of 0.65 allows for severe multi-character misreads by Tesseract 
     # (e.g., 'AM0XIC1LL1N 500 MG' extracting to 'AMOXICILLIN').
     MIN_CONFIDENCE_THRESHOLD = 0.65
+
+    # Vocabularies at least this large are matched through the prebuilt
+    # trigram index (drug_index.py); smaller ones are scanned linearly.
+    INDEX_MIN_VOCABULARY = 2000
+
+    # Upper bound on score-matrix cells held at once by match_many
+    # (32M float32 cells ~ 128 MB); larger query batches are chunked.
+    MAX_MATRIX_CELLS = 32_000_000
     
     @staticmethod
     def match_drug(extracted_text: str, known_drugs: List[str]) -> Optional[Tuple[str, float]]:
@@ -29,6 +69,22 @@ class DrugMatcher:
         if not extracted_text or not known_drugs:
             return None
 
+        # Imported here: drug_index depends on vocabulary_version above
+        from .drug_index import get_confusion_key_map, get_drug_name_index
+
+        # Fast path: a token run equal to a drug name up to systematic OCR
+        # misreads (0/O, 1/I/L, 5/S, 8/B, RN/M) is an exact hit
+        exact_match = get_confusion_key_map(known_drugs).lookup(extracted_text)
+        if exact_match is not None:
+            return (exact_match, 1.0)
+
+        if len(known_drugs) >= DrugMatcher.INDEX_MIN_VOCABULARY:
+            # Candidate generation from trigram inverted lists, then RapidFuzz
+            # rescoring of the shortlist only
+            return get_drug_name_index(known_drugs).match(
+                extracted_text, DrugMatcher.MIN_CONFIDENCE_THRESHOLD
+            )
+
         # Extract best match using the partial_ratio scorer (handles substring alignment
         # and ignores noise like ' 500 MG' appended to the actual drug name)
         # Returns a tuple of (MatchString, Score[0-100], Index)
@@ -50,3 +106,72 @@ class DrugMatcher:
             return (matched_string, confidence_score)
             
         return None
+
+    @staticmethod
+    def score_matrix(
+        queries: List[str],
+        known_drugs: List[str],
+        scorer: Callable = fuzz.partial_ratio,
+        min_confidence: float = MIN_CONFIDENCE_THRESHOLD,
+    ) -> np.ndarray:
+        """
+        Scores every query against every drug in one multithreaded RapidFuzz
+        call.
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(queries), len(known_drugs))
+            with confidences in 0.0-1.0; entries below `min_confidence` are 0.
+        """
+        matrix = process.cdist(
+            queries,
+            known_drugs,
+            scorer=scorer,
+            score_cutoff=min_confidence * 100,
+            dtype=np.float32,
+            workers=-1,
+        )
+        matrix /= 100.0
+        return matrix
+
+    @staticmethod
+    def match_many(
+        queries: List[str],
+        known_drugs: List[str],
+        top_k: int = 1,
+        scorer: Callable = fuzz.partial_ratio,
+        min_confidence: float = MIN_CONFIDENCE_THRESHOLD,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Batched counterpart of match_drug for many strings at once (multi-line
+        OCR output, bulk imports). Queries are scored in chunks bounded by
+        MAX_MATRIX_CELLS, so memory stays flat for any batch size.
+
+        Returns:
+            For each query, up to `top_k` (drug, confidence) pairs at or above
+            `min_confidence`, best first; score ties keep vocabulary order.
+        """
+        if not queries or not known_drugs or top_k < 1:
+            return [[] for _ in queries]
+
+        top_k = min(top_k, len(known_drugs))
+        chunk_size = max(1, DrugMatcher.MAX_MATRIX_CELLS // len(known_drugs))
+        results: List[List[Tuple[str, float]]] = []
+
+        for offset in range(0, len(queries), chunk_size):
+            matrix = DrugMatcher.score_matrix(
+                queries[offset:offset + chunk_size], known_drugs, scorer, min_confidence
+            )
+            if top_k == 1:
+                # argmax returns the first maximum, matching extractOne's tie-break
+                best = matrix.argmax(axis=1)[:, None]
+            else:
+                best = np.argpartition(-matrix, top_k - 1, axis=1)[:, :top_k]
+
+            for row, columns in zip(matrix, best):
+                ordered = columns[np.lexsort((columns, -row[columns]))]
+                results.append([
+                    (known_drugs[column], float(row[column]))
+                    for column in ordered
+                    if row[column] > 0 and row[column] >= min_confidence
+                ])
+        return results
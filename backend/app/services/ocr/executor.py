@@ -0,0 +1,230 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from backend.app.core.config import get_settings
+except ModuleNotFoundError:
+    from app.core.config import get_settings
+# Same module path as the routers that catch it and serve /metrics whenever
+# that root is importable; a backend.app copy would be a different class and
+# a second registry
+try:
+    from app.core.exceptions import ServiceOverloadedException
+    from app.core.metrics import get_metrics_registry
+except ImportError:
+    from backend.app.core.exceptions import ServiceOverloadedException
+    from backend.app.core.metrics import get_metrics_registry
+from .tesseract_engine import get_tesseract_engine
+
+
+class OCRExecutor:
+    """
+    Dedicated, bounded thread pool for CPU-bound OCR work.
+
+    OCR jobs never borrow the event loop's default executor, so a burst of
+    uploads cannot starve other `to_thread` users. Admission is bounded:
+    once `max_queue` jobs are waiting for a worker, new work is rejected
+    immediately with a Retry-After estimate, and jobs that waited longer
+    than `max_wait_seconds` are dropped before any CPU is spent on them.
+    """
+
+    # Weight of the newest sample in the service-time moving average
+    SERVICE_TIME_SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        max_wait_seconds: float,
+        initializer: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._max_workers = max(1, max_workers)
+        self._max_queue = max(0, max_queue)
+        self._max_wait_seconds = max_wait_seconds
+        self._pool = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="ocr-worker",
+            initializer=initializer,
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._service_time: Optional[float] = None
+
+        metrics = get_metrics_registry()
+        self._queue_depth_gauge = metrics.gauge("ocr_queue_depth", "OCR jobs waiting for a worker.")
+        self._busy_gauge = metrics.gauge("ocr_workers_busy", "OCR workers currently processing a job.")
+        self._wait_gauge = metrics.gauge(
+            "ocr_queue_wait_seconds", "Queue wait of the most recently started OCR job."
+        )
+        self._wait_histogram = metrics.histogram(
+            "ocr_queue_wait_seconds_distribution", "Time OCR jobs spent waiting for a worker."
+        )
+        self._rejected_counter = metrics.counter(
+            "ocr_rejected_total", "OCR jobs rejected because the queue was full or the wait deadline passed."
+        )
+
+    def _retry_after_locked(self) -> int:
+        """Rough seconds until a queue slot frees up, for the Retry-After header."""
+        per_job = self._service_time if self._service_time is not None else 1.0
+        return max(1, math.ceil(per_job * (self._queued + 1) / self._max_workers))
+
+    def _publish_locked(self) -> None:
+        self._queue_depth_gauge.set(self._queued)
+        self._busy_gauge.set(self._running)
+
+    def _abandon(self, future: Future) -> None:
+        # A job cancelled before it started (e.g. the client disconnected)
+        # never reaches _invoke, so release its queue slot here.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._publish_locked()
+
+    def _invoke(self, enqueued_at: float, fn: Callable[..., Any], args: tuple) -> Any:
+        waited = time.monotonic() - enqueued_at
+        with self._lock:
+            self._queued -= 1
+            expired = waited > self._max_wait_seconds
+            if not expired:
+                self._running += 1
+            self._publish_locked()
+            retry_after = self._retry_after_locked()
+        self._wait_gauge.set(waited)
+        self._wait_histogram.observe(waited)
+
+        if expired:
+            self._rejected_counter.inc()
+            raise ServiceOverloadedException(
+                f"OCR request waited {waited:.1f}s for a worker and was dropped.", retry_after=retry_after
+            )
+
+        started_at = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.monotonic() - started_at
+            with self._lock:
+                self._running -= 1
+                if self._service_time is None:
+                    self._service_time = elapsed
+                else:
+                    self._service_time += self.SERVICE_TIME_SMOOTHING * (elapsed - self._service_time)
+                self._publish_locked()
+
+    def _invoke_subtask(self, fn: Callable[[Any], Any], item: Any) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._publish_locked()
+        try:
+            return fn(item)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._publish_locked()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs `fn(*args)` on an OCR worker and awaits its result.
+
+        Raises:
+            ServiceOverloadedException: The wait queue is full, or the job
+                exceeded the max-wait deadline before a worker picked it up.
+        """
+        with self._lock:
+            # Jobs that will start on an idle worker right away do not count as waiting
+            waiting = self._queued + self._running - self._max_workers
+            if waiting >= self._max_queue:
+                self._rejected_counter.inc()
+                raise ServiceOverloadedException(
+                    "OCR service is at capacity. Please retry shortly.",
+                    retry_after=self._retry_after_locked(),
+                )
+            self._queued += 1
+            self._publish_locked()
+
+        future = self._pool.submit(self._invoke, time.monotonic(), fn, args)
+        future.add_done_callback(self._abandon)
+        return await asyncio.wrap_future(future)
+
+    def map_inline(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Runs `fn` over `items` in parallel from inside a running OCR job and
+        returns the results in order.
+
+        Items after the first go to the pool; the calling worker runs the
+        first itself, then any item no worker has picked up yet. It never
+        blocks on a queued item, so fanning out from a saturated pool cannot
+        deadlock. Sub-tasks are never rejected or expired (the parent job
+        already holds its slot), but they count as queued and running like
+        any job, so admission and the gauges see the workers they occupy.
+        """
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+
+        with self._lock:
+            self._queued += len(items) - 1
+            self._publish_locked()
+        futures = []
+        for item in items[1:]:
+            future = self._pool.submit(self._invoke_subtask, fn, item)
+            future.add_done_callback(self._abandon)
+            futures.append(future)
+        try:
+            results = [fn(items[0])]
+            for item, future in zip(items[1:], futures):
+                results.append(fn(item) if future.cancel() else future.result())
+            return results
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "max_queue": self._max_queue,
+                "max_wait_seconds": self._max_wait_seconds,
+                "queued": self._queued,
+                "running": self._running,
+                "avg_service_seconds": self._service_time,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _warm_ocr_worker() -> None:
+    """Loads the OCR engine on each worker thread before its first job."""
+    try:
+        warm = getattr(get_tesseract_engine(), "warm", None)
+        if warm is not None:
+            warm()
+    except Exception:
+        # Best effort: a failed warm-up resurfaces as a normal job error
+        pass
+
+
+_executor_singleton: Optional[OCRExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_ocr_executor() -> OCRExecutor:
+    global _executor_singleton
+    if _executor_singleton is None:
+        with _executor_lock:
+            if _executor_singleton is None:
+                settings = get_settings()
+                _executor_singleton = OCRExecutor(
+                    max_workers=settings.ocr_max_workers or (os.cpu_count() or 1),
+                    max_queue=settings.ocr_max_queue,
+                    max_wait_seconds=settings.ocr_queue_max_wait_seconds,
+                    initializer=_warm_ocr_worker,
+                )
+    return _executor_singleton
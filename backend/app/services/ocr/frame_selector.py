@@ -0,0 +1,118 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import List
+
+import cv2
+import numpy as np
+
+from .quality_gate import ImageQualityGate, QualityReport
+
+
+@dataclass(frozen=True)
+class SelectedFrame:
+    index: int
+    image_bytes: bytes
+    score: float
+
+
+class FrameSelector:
+    """
+    Picks the frames of a burst or short clip worth a full OCR run.
+
+    Frames are ranked on ImageQualityGate thumbnails by sharpness scaled by
+    contrast, so a steady, well-lit frame beats a shaken or glare-washed one
+    at a few milliseconds per frame, without any Tesseract work.
+    """
+
+    # Frames sampled evenly across a clip
+    MAX_CLIP_FRAMES = 12
+
+    @staticmethod
+    def score(report: QualityReport) -> float:
+        """Laplacian variance weighted by the 0.5-99.5 percentile brightness spread."""
+        contrast = max(0, report.bright_level - report.dark_level) / 255.0
+        return report.sharpness * contrast
+
+    @staticmethod
+    def _ranked(reports: List[QualityReport]) -> List[int]:
+        # Stable: equal scores keep capture order
+        return sorted(range(len(reports)), key=lambda index: -FrameSelector.score(reports[index]))
+
+    @staticmethod
+    def select(frames: List[bytes], top: int) -> List[SelectedFrame]:
+        """
+        The `top` best still frames, best first. Frames that cannot be decoded
+        rank last, so a burst of only broken frames still reaches the
+        pipeline and gets its format error.
+        """
+        reports: List[QualityReport] = []
+        for image_bytes in frames:
+            report = ImageQualityGate.measure(image_bytes)
+            reports.append(report or QualityReport(0, 0, 0.0, 0, 0, None))
+        return [
+            SelectedFrame(index=index, image_bytes=frames[index], score=FrameSelector.score(reports[index]))
+            for index in FrameSelector._ranked(reports)[:top]
+        ]
+
+    @staticmethod
+    def _clip_frames(clip_bytes: bytes, max_frames: int) -> List[np.ndarray]:
+        # OpenCV's video backends read from files only
+        handle, path = tempfile.mkstemp(suffix=".clip")
+        try:
+            with os.fdopen(handle, "wb") as clip_file:
+                clip_file.write(clip_bytes)
+            capture = cv2.VideoCapture(path)
+            try:
+                if not capture.isOpened():
+                    raise ValueError("Invalid video file or format.")
+                total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+                if total > 0:
+                    # Evenly spaced over the whole clip, first and last frame included
+                    wanted = set(np.linspace(0, total - 1, min(max_frames, total)).round().astype(int).tolist())
+                else:
+                    # Unknown length: the leading frames
+                    wanted = set(range(max_frames))
+                last_wanted = max(wanted)
+
+                # Sequential grab() skips frames without decoding them, and is
+                # more reliable than seeking in short phone clips
+                frames: List[np.ndarray] = []
+                position = 0
+                while position <= last_wanted and capture.grab():
+                    if position in wanted:
+                        ok, frame = capture.retrieve()
+                        if ok:
+                            frames.append(frame)
+                    position += 1
+            finally:
+                capture.release()
+        finally:
+            os.unlink(path)
+
+        if not frames:
+            raise ValueError("No frames could be decoded from the video.")
+        return frames
+
+    @staticmethod
+    def select_from_clip(clip_bytes: bytes, top: int) -> List[SelectedFrame]:
+        """
+        The `top` best frames sampled from a short clip, best first,
+        re-encoded losslessly as PNG for the OCR pipeline.
+        """
+        frames = FrameSelector._clip_frames(clip_bytes, FrameSelector.MAX_CLIP_FRAMES)
+        reports = []
+        for frame in frames:
+            height, width = frame.shape[:2]
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+            reports.append(ImageQualityGate.measure_gray(gray, width, height))
+
+        selected = []
+        for index in FrameSelector._ranked(reports)[:top]:
+            ok, encoded = cv2.imencode(".png", frames[index])
+            if not ok:
+                continue
+            selected.append(
+                SelectedFrame(index=index, image_bytes=encoded.tobytes(), score=FrameSelector.score(reports[index]))
+            )
+        return selected
@@ -1,5 +1,39 @@
+import io
+from typing import List, Optional, Tuple
+
 import cv2
 import numpy as np
+from PIL import Image
+
+from .profiling import stage
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over a bytes-like object, without copying it."""
+
+    def __init__(self, data: bytes) -> None:
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
 
 class ImageProcessor:
     """
@@ -7,6 +41,273 @@ class ImageProcessor:
     for Tesseract OCR extraction with high robustness against noise and skew.
     """
 
+    # Tesseract is most accurate when capital letters are roughly 30-33 px tall.
+    TARGET_TEXT_HEIGHT_PX = 32
+
+    # Scale bounds: never upscale beyond the historical fixed 2x, and never
+    # shrink so far that thin strokes disappear.
+    MAX_UPSCALE = 2.0
+    MIN_SCALE = 0.125
+
+    # Long side (px) of the pyramid level used for text-height estimation.
+    ESTIMATION_LONG_SIDE = 800
+
+    # Fallback target long side (px) when no glyph-like components are found.
+    FALLBACK_LONG_SIDE = 2000
+
+    # Pipeline modes for preprocess_for_ocr():
+    # "full" binarizes, deskews and crops the whole normalized frame;
+    # "roi" locates the text block on the estimation thumbnail and only
+    # processes the mapped crop at working resolution;
+    # "regions" keeps the largest few text blocks (preprocess_regions()),
+    # since the drug name is often a separate block from the brand.
+    MODE_FULL = "full"
+    MODE_ROI = "roi"
+    MODE_REGIONS = "regions"
+    PIPELINE_MODES = (MODE_FULL, MODE_ROI, MODE_REGIONS)
+
+    # Regions at least this many times wider than tall are single text lines
+    SINGLE_LINE_MIN_ASPECT = 6.0
+
+    # Multi-line documents (prescriptions): binarize and deskew, but keep the
+    # whole page since every line may name a different drug.
+    MODE_DOCUMENT = "document"
+
+    # libjpeg can decode directly at 1/2, 1/4 and 1/8 scale (DCT scaling), so
+    # reduced decodes skip most of the work for large phone photos.
+    _REDUCED_GRAYSCALE_FLAGS = {
+        1: cv2.IMREAD_GRAYSCALE,
+        2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+        4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+        8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+    }
+
+    @staticmethod
+    def _probe_dimensions(image_bytes: bytes) -> Optional[Tuple[int, int]]:
+        """
+        Reads (width, height) from the image header without decoding pixels.
+        """
+        try:
+            # io.BytesIO would copy a memoryview upload whole just to read its header
+            with Image.open(_BufferReader(image_bytes)) as probe:
+                return probe.size
+        except Exception:
+            return None
+
+    @staticmethod
+    def _decode_grayscale(image_bytes: bytes, reduction: int = 1) -> np.ndarray:
+        """
+        Decodes straight to single-channel 8-bit, optionally at 1/2, 1/4 or 1/8 scale.
+        """
+        np_arr = np.frombuffer(image_bytes, np.uint8)
+        gray = cv2.imdecode(np_arr, ImageProcessor._REDUCED_GRAYSCALE_FLAGS[reduction])
+        if gray is None:
+            raise ValueError("Invalid image file or format.")
+        return gray
+
+    @staticmethod
+    def _largest_reduction(max_factor: float) -> int:
+        """Largest supported decode reduction not exceeding `max_factor`."""
+        for reduction in (8, 4, 2):
+            if reduction <= max_factor:
+                return reduction
+        return 1
+
+    @staticmethod
+    def _otsu_foreground(gray_img: np.ndarray) -> np.ndarray:
+        """
+        Otsu-binarizes so that text (the minority class) is white foreground,
+        regardless of dark-on-light or light-on-dark packaging.
+        """
+        _, binary = cv2.threshold(gray_img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        if cv2.countNonZero(binary) > binary.size // 2:
+            binary = cv2.bitwise_not(binary)
+        return binary
+
+    @staticmethod
+    def _glyph_components(gray_img: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Connected components of the Otsu foreground, with a mask selecting
+        glyph-like blobs: not specks, not frame edges or long rules, plausible
+        aspect and fill.
+
+        Returns:
+            (labels, stats, glyph_mask) where glyph_mask indexes stats[1:].
+        """
+        img_h, img_w = gray_img.shape[:2]
+        binary = ImageProcessor._otsu_foreground(cv2.GaussianBlur(gray_img, (3, 3), 0))
+
+        _, labels, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+
+        widths = stats[1:, cv2.CC_STAT_WIDTH]
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+        areas = stats[1:, cv2.CC_STAT_AREA]
+
+        glyph_mask = (
+            (heights >= 3)
+            & (areas >= 6)
+            & (heights < img_h * 0.5)
+            & (widths < img_w * 0.5)
+            & (widths <= heights * 3)
+            & (heights <= widths * 8)
+            & (areas >= 0.1 * widths * heights)
+        )
+        return labels, stats, glyph_mask
+
+    @staticmethod
+    def estimate_text_height(gray_img: np.ndarray) -> Optional[float]:
+        """
+        Estimates the typical glyph height (px) from connected components of
+        an Otsu-binarized image. Returns None when too few glyph-like
+        components are found for a reliable estimate.
+        """
+        _, stats, glyph_mask = ImageProcessor._glyph_components(gray_img)
+        glyph_heights = stats[1:, cv2.CC_STAT_HEIGHT][glyph_mask]
+        if glyph_heights.size < 3:
+            return None
+
+        return float(np.median(glyph_heights))
+
+    @staticmethod
+    def _load_pyramid(image_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (working, thumbnail): the grayscale image at OCR resolution and
+        the reduced level used for text-height estimation. Small uploads may
+        share one array for both.
+
+        Text height is estimated on a reduced pyramid level first; the image is
+        then decoded at the closest reduced scale and resized the remaining way
+        so glyphs land near TARGET_TEXT_HEIGHT_PX. Large photos are shrunk and
+        only small crops are upscaled.
+        """
+        dimensions = ImageProcessor._probe_dimensions(image_bytes)
+        if dimensions is None:
+            # Unknown header: decode at full size and scale from there
+            gray = ImageProcessor._decode_grayscale(image_bytes)
+            dimensions = (gray.shape[1], gray.shape[0])
+            estimation_reduction, estimation_img = 1, gray
+        else:
+            estimation_reduction = ImageProcessor._largest_reduction(
+                max(dimensions) / ImageProcessor.ESTIMATION_LONG_SIDE
+            )
+            estimation_img = ImageProcessor._decode_grayscale(image_bytes, estimation_reduction)
+
+        long_side = max(dimensions)
+        text_height = ImageProcessor.estimate_text_height(estimation_img)
+        if text_height is not None:
+            scale = ImageProcessor.TARGET_TEXT_HEIGHT_PX / (text_height * estimation_reduction)
+        else:
+            scale = ImageProcessor.FALLBACK_LONG_SIDE / float(long_side)
+        scale = min(ImageProcessor.MAX_UPSCALE, max(ImageProcessor.MIN_SCALE, scale))
+
+        # Decode as close to the target scale as the codec allows, then resize the rest
+        reduction = ImageProcessor._largest_reduction(1.0 / scale)
+        if reduction == estimation_reduction:
+            gray = estimation_img
+        else:
+            gray = ImageProcessor._decode_grayscale(image_bytes, reduction)
+
+        residual = scale * reduction
+        if abs(residual - 1.0) > 0.05:
+            interpolation = cv2.INTER_AREA if residual < 1.0 else cv2.INTER_CUBIC
+            gray = cv2.resize(gray, None, fx=residual, fy=residual, interpolation=interpolation)
+
+        return gray, estimation_img
+
+    @staticmethod
+    def load_grayscale_for_ocr(image_bytes: bytes) -> np.ndarray:
+        """
+        Decodes the upload to grayscale at the resolution Tesseract prefers.
+        """
+        gray, _ = ImageProcessor._load_pyramid(image_bytes)
+        return gray
+
+    @staticmethod
+    def load_grayscale_capped(image_bytes: bytes, long_side: int) -> np.ndarray:
+        """
+        Decodes to grayscale at native scale, or at the largest codec
+        reduction that keeps the long side at or above `long_side`.
+        """
+        dimensions = ImageProcessor._probe_dimensions(image_bytes)
+        reduction = 1
+        if dimensions is not None:
+            reduction = ImageProcessor._largest_reduction(max(dimensions) / float(long_side))
+        return ImageProcessor._decode_grayscale(image_bytes, reduction)
+
+    @staticmethod
+    def _binarize(gray_img: np.ndarray) -> np.ndarray:
+        """
+        CLAHE, blur, adaptive threshold and morphological close.
+        Returns an inverted binary image (text white on black).
+        """
+        # Contrast Enhancement (CLAHE)
+        # Prevents washout from camera flash on glossy medicine boxes
+        enhanced_gray = ImageProcessor._apply_clahe(gray_img)
+
+        # Gaussian Blur
+        blurred = cv2.GaussianBlur(enhanced_gray, (5, 5), 0)
+
+        # Adaptive Thresholding
+        binary = cv2.adaptiveThreshold(
+            blurred, 
+            255, 
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
+            cv2.THRESH_BINARY_INV, 
+            11, 
+            2
+        )
+
+        # Morphological Operations (Noise Removal)
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+        return cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+
+    @staticmethod
+    def _locate_text_block(thumb: np.ndarray) -> Optional[Tuple[Tuple[int, int, int, int], float]]:
+        """
+        Finds the main text block on a small pyramid level.
+
+        Returns:
+            ((x, y, w, h), skew_angle) in thumbnail coordinates, or None when
+            no text-like block stands out from the frame.
+        """
+        labels, stats, glyph_mask = ImageProcessor._glyph_components(thumb)
+        glyph_heights = stats[1:, cv2.CC_STAT_HEIGHT][glyph_mask]
+        if glyph_heights.size < 3:
+            return None
+        text_height = float(np.median(glyph_heights))
+
+        # Keep only glyphs of roughly the dominant text size, so rules, box
+        # outlines, barcodes and speckle never seed the text block
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+        keep = glyph_mask & (heights >= text_height * 0.5) & (heights <= text_height * 2.0)
+        lookup = np.zeros(len(stats), dtype=np.uint8)
+        lookup[1:][keep] = 255
+        glyphs = lookup[labels]
+
+        # Dilate with a kernel proportional to glyph size so letters and
+        # neighbouring lines merge into one block at any input resolution
+        kernel = cv2.getStructuringElement(
+            cv2.MORPH_RECT, (max(3, int(text_height * 1.5)), max(1, int(text_height * 0.6)))
+        )
+        dilated = cv2.dilate(glyphs, kernel, iterations=2)
+        contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        # The block with the most glyph pixels wins
+        best_contour = None
+        max_ink = 0
+        for c in contours:
+            x, y, w, h = cv2.boundingRect(c)
+            ink = cv2.countNonZero(glyphs[y:y + h, x:x + w])
+            if ink > max_ink:
+                max_ink = ink
+                best_contour = c
+
+        if best_contour is None:
+            return None
+
+        angle = ImageProcessor._skew_angle(cv2.minAreaRect(best_contour))
+        return cv2.boundingRect(best_contour), angle
+
     @staticmethod
     def _apply_clahe(gray_img: np.ndarray) -> np.ndarray:
         """
@@ -40,16 +341,30 @@ class ImageProcessor:
         largest_contour = max(contours, key=cv2.contourArea)
         
         # Calculate minimum bounding rectangle and its angle
-        rect = cv2.minAreaRect(largest_contour)
-        angle = rect[-1]
-        
-        # Standardize the angle
-        if angle < -45:
-            angle = -(90 + angle)
-        else:
-            angle = -angle
-            
-        # Ignore negligible skew
+        angle = ImageProcessor._skew_angle(cv2.minAreaRect(largest_contour))
+        return ImageProcessor._rotate(image, angle)
+
+    @staticmethod
+    def _skew_angle(rect) -> float:
+        """
+        Converts a cv2.minAreaRect into the rotation that levels its long side
+        (the text baseline). Independent of OpenCV's angle range convention.
+        """
+        (_, _), (rect_w, rect_h), angle = rect
+        if rect_w < rect_h:
+            angle += 90.0
+        while angle <= -90.0:
+            angle += 180.0
+        while angle > 90.0:
+            angle -= 180.0
+        # Steeper "baselines" are vertical layouts, not skew; leave them alone
+        if abs(angle) > 45.0:
+            return 0.0
+        return angle
+
+    @staticmethod
+    def _rotate(image: np.ndarray, angle: float) -> np.ndarray:
+        """Rotates around the image center, ignoring negligible skew."""
         if abs(angle) < 1.0:
             return image
             
@@ -66,39 +381,26 @@ class ImageProcessor:
         return rotated
 
     @staticmethod
-    def _extract_text_region(image: np.ndarray) -> np.ndarray:
+    def _text_regions(mask: np.ndarray, limit: int) -> List[Tuple[int, int, int, int]]:
         """
-        Filters contours by aspect ratio isolating the text block 
-        and cropping out surrounding background noise.
+        Bounding boxes (x, y, w, h) of the `limit` largest wide blobs of the
+        white foreground of `mask`, largest first.
         """
-        working_img = cv2.bitwise_not(image.copy())
-        
         kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 5))
-        dilated = cv2.dilate(working_img, kernel, iterations=2)
+        dilated = cv2.dilate(mask, kernel, iterations=2)
         
         contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        if not contours:
-            return image
-            
-        # Find the contour with the largest area that matches a text-like aspect ratio (W > H)
-        best_contour = None
-        max_area = 0
-        
-        for c in contours:
-            x, y, w, h = cv2.boundingRect(c)
-            area = w * h
-            aspect_ratio = w / float(h)
-            
-            # Text lines generally have an aspect ratio > 2
-            if aspect_ratio > 1.5 and area > max_area:
-                max_area = area
-                best_contour = c
-                
-        if best_contour is None:
-            return image
-            
-        x, y, w, h = cv2.boundingRect(best_contour)
+
+        # Text lines generally have an aspect ratio > 2
+        boxes = [cv2.boundingRect(c) for c in contours]
+        boxes = [box for box in boxes if box[2] / float(box[3]) > 1.5]
+        # Stable sort: among equal areas the first contour wins
+        boxes.sort(key=lambda box: -(box[2] * box[3]))
+        return boxes[:limit]
+
+    @staticmethod
+    def _crop_with_margin(image: np.ndarray, box: Tuple[int, int, int, int]) -> np.ndarray:
+        x, y, w, h = box
         
         # Add a 5% margin to avoid clipping character edges
         margin_x = int(w * 0.05)
@@ -114,59 +416,158 @@ class ImageProcessor:
         return image[y1:y2, x1:x2]
 
     @staticmethod
-    def preprocess_for_ocr(image_bytes: bytes) -> np.ndarray:
+    def _extract_text_region(image: np.ndarray) -> np.ndarray:
+        """
+        Filters contours by aspect ratio isolating the text block 
+        and cropping out surrounding background noise.
+        """
+        boxes = ImageProcessor._text_regions(cv2.bitwise_not(image), 1)
+        if not boxes:
+            return image
+        return ImageProcessor._crop_with_margin(image, boxes[0])
+
+    @staticmethod
+    def region_psm(region: np.ndarray) -> int:
+        """
+        Tesseract page segmentation mode for a cropped region: 7 (single
+        text line) for long thin strips, 6 (uniform block) otherwise.
+        """
+        height, width = region.shape[:2]
+        if height and width / float(height) >= ImageProcessor.SINGLE_LINE_MIN_ASPECT:
+            return 7
+        return 6
+
+    @staticmethod
+    def _preprocess_roi(gray: np.ndarray, thumb: np.ndarray) -> Optional[np.ndarray]:
+        """
+        ROI-first path: locate and deskew on the thumbnail, then binarize and
+        rotate only the mapped crop. Returns None if no text block is found.
+        """
+        located = ImageProcessor._locate_text_block(thumb)
+        if located is None:
+            return None
+        (x, y, w, h), angle = located
+
+        # Map thumbnail coordinates to the working resolution
+        img_h, img_w = gray.shape[:2]
+        fx = img_w / float(thumb.shape[1])
+        fy = img_h / float(thumb.shape[0])
+
+        # Add a 5% margin (at least one pixel on the thumbnail) to avoid clipping glyph edges
+        margin_x = max(1, int(w * 0.05))
+        margin_y = max(1, int(h * 0.05))
+        x1 = max(0, int((x - margin_x) * fx))
+        y1 = max(0, int((y - margin_y) * fy))
+        x2 = min(img_w, int(round((x + w + margin_x) * fx)))
+        y2 = min(img_h, int(round((y + h + margin_y) * fy)))
+
+        roi = gray[y1:y2, x1:x2]
+        binary = ImageProcessor._binarize(roi)
+        rotated = ImageProcessor._rotate(binary, angle)
+        return cv2.bitwise_not(rotated)
+
+    @staticmethod
+    def preprocess_minimal(image_bytes: bytes) -> np.ndarray:
+        """
+        Cheapest cascade tier: grayscale decode at native scale plus a global
+        Otsu threshold, with no resizing, CLAHE, morphology, deskew or crop.
+        Photos with a long side beyond FALLBACK_LONG_SIDE are decoded at a
+        codec-reduced scale rather than handed to Tesseract at full size.
+
+        Returns:
+            np.ndarray: Black-on-white binarized 8-bit single channel image.
+        """
+        with stage("preprocess.decode") as decode:
+            gray = ImageProcessor.load_grayscale_capped(image_bytes, ImageProcessor.FALLBACK_LONG_SIDE)
+            decode.record(gray)
+
+        with stage("preprocess.otsu", gray) as otsu:
+            binary = cv2.bitwise_not(ImageProcessor._otsu_foreground(gray))
+            otsu.record(binary)
+        return binary
+
+    @staticmethod
+    def preprocess_for_ocr(image_bytes: bytes, mode: str = MODE_FULL) -> np.ndarray:
         """
         Executes a deterministic pipeline of OpenCV operations optimized
         for printed drug packaging text.
         
         Args:
             image_bytes: Raw bytes from the uploaded image.
+            mode: "full" (whole frame), "roi" (thumbnail-located text block only)
+                or "document" (whole page, no text-block cropping).
             
         Returns:
             np.ndarray: A preprocessed, binarized 8-bit single channel image.
         """
-        # 1. Image Validation and Loading
-        np_arr = np.frombuffer(image_bytes, np.uint8)
-        img = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-        if img is None:
-            raise ValueError("Invalid image file or format.")
+        # 1-3. Validation, Grayscale Decoding and Adaptive Resize Normalization
+        # Scales toward Tesseract's preferred glyph height instead of a fixed 2x
+        with stage("preprocess.decode") as decode:
+            gray, thumb = ImageProcessor._load_pyramid(image_bytes)
+            decode.record(gray)
 
-        # 2. Resize Normalization
-        img = cv2.resize(img, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC)
+        if mode == ImageProcessor.MODE_ROI:
+            with stage("preprocess.roi", gray) as roi:
+                roi_img = ImageProcessor._preprocess_roi(gray, thumb)
+                roi.record(roi_img)
+            if roi_img is not None:
+                return roi_img
 
-        # 3. Grayscale Conversion
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-        # 4. Contrast Enhancement (CLAHE)
-        # Prevents washout from camera flash on glossy medicine boxes
-        enhanced_gray = ImageProcessor._apply_clahe(gray)
-
-        # 5. Gaussian Blur
-        blurred = cv2.GaussianBlur(enhanced_gray, (5, 5), 0)
-
-        # 6. Adaptive Thresholding
-        binary = cv2.adaptiveThreshold(
-            blurred, 
-            255, 
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY_INV, 
-            11, 
-            2
-        )
-
-        # 7. Morphological Operations (Noise Removal)
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-        processed_img = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+        # 4-7. CLAHE, Gaussian Blur, Adaptive Thresholding, Morphological Close
+        with stage("preprocess.binarize", gray) as binarize:
+            processed_img = ImageProcessor._binarize(gray)
+            binarize.record(processed_img)
 
         # 8. Auto-Rotation Correction
         # Needs to happen on the binarized image for contour detection
-        rotated_img = ImageProcessor._auto_rotate(processed_img)
+        with stage("preprocess.rotate", processed_img) as rotate:
+            rotated_img = ImageProcessor._auto_rotate(processed_img)
+            rotate.record(rotated_img)
+
+        if mode == ImageProcessor.MODE_DOCUMENT:
+            return cv2.bitwise_not(rotated_img)
         
         # 9. Text Region Cropping
         # Crops away non-text structural noise like box edges
-        cropped_img = ImageProcessor._extract_text_region(rotated_img)
+        with stage("preprocess.crop", rotated_img) as crop:
+            cropped_img = ImageProcessor._extract_text_region(rotated_img)
+            crop.record(cropped_img)
 
         # 10. Invert the image back: Tesseract expects black text on white background
         final_img = cv2.bitwise_not(cropped_img)
 
         return final_img
+
+    @staticmethod
+    def preprocess_regions(image_bytes: bytes, limit: int) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """
+        Full preprocessing, keeping up to `limit` text blocks instead of only
+        the largest.
+
+        Returns:
+            (page, regions): the whole deskewed page and the region crops in
+            reading order (top to bottom, then left to right), all black text
+            on white. Without any text-like block, the page is the only region.
+        """
+        # 1-8. Decoding, normalization, binarization and deskew as in "full" mode
+        with stage("preprocess.decode") as decode:
+            gray, _ = ImageProcessor._load_pyramid(image_bytes)
+            decode.record(gray)
+
+        with stage("preprocess.binarize", gray) as binarize:
+            processed_img = ImageProcessor._binarize(gray)
+            binarize.record(processed_img)
+
+        with stage("preprocess.rotate", processed_img) as rotate:
+            rotated_img = ImageProcessor._auto_rotate(processed_img)
+            rotate.record(rotated_img)
+
+        # 9. Top-N text blocks, read top to bottom
+        with stage("preprocess.regions", rotated_img):
+            page = cv2.bitwise_not(rotated_img)
+            # Dilating the white glyphs merges each line into one block
+            boxes = ImageProcessor._text_regions(rotated_img, limit)
+            boxes.sort(key=lambda box: (box[1], box[0]))
+            regions = [ImageProcessor._crop_with_margin(page, box) for box in boxes]
+
+        return page, regions or [page]
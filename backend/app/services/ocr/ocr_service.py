@@ -1,5 +1,8 @@
 import asyncio
-from typing import List, Dict, Any
+import functools
+import hashlib
+from collections import deque
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
 import pytesseract
@@ -7,11 +10,40 @@ import cv2
 
 try:
     from backend.app.core.config import get_settings
+    from backend.app.infrastructure.cache.cache import CacheClient, build_cache_key
+    from backend.app.infrastructure.cache.single_flight import SingleFlight
 except ModuleNotFoundError:
     from app.core.config import get_settings
+    from app.infrastructure.cache.cache import CacheClient, build_cache_key
+    from app.infrastructure.cache.single_flight import SingleFlight
+# Raised and counted across layers: the routers' module path when importable
+try:
+    from app.core.exceptions import ServiceOverloadedException
+    from app.core.metrics import get_metrics_registry
+except ImportError:
+    from backend.app.core.exceptions import ServiceOverloadedException
+    from backend.app.core.metrics import get_metrics_registry
 from .image_processor import ImageProcessor
 from .text_cleaner import TextCleaner
-from .drug_matcher import DrugMatcher
+from .drug_matcher import DrugMatcher, vocabulary_version
+from .tesseract_engine import get_tesseract_engine
+from .packaging_index import PackagingMatch, get_packaging_index, perceptual_hash
+from .executor import OCRExecutor, get_ocr_executor
+from .process_pool import get_process_pipeline_runner
+from .prescription_parser import PrescriptionParser
+from .barcode import BarcodeScanner, get_product_index
+from .frame_selector import FrameSelector, SelectedFrame
+from .pdf_pages import PdfPages, open_pdf
+from .quality_gate import ImageQualityGate
+from .vocabulary_hints import VocabularyHints, get_vocabulary_hints
+from .profiling import (
+    PROFILING_DEBUG,
+    PROFILING_OFF,
+    StageTimer,
+    record_stage_metrics,
+    stage,
+    stage_scope,
+)
 
 
 def get_ocr_runtime_status() -> Dict[str, Any]:
@@ -21,6 +53,8 @@ def get_ocr_runtime_status() -> Dict[str, Any]:
 
     status: Dict[str, Any] = {
         "ready": False,
+        "engine": get_tesseract_engine().name,
+        "executor": get_ocr_executor().stats(),
         "configured_tesseract_cmd": configured_cmd or None,
         "ocr_language": settings.ocr_language,
         "version": None,
@@ -59,58 +93,310 @@ def get_ocr_runtime_status() -> Dict[str, Any]:
     return status
 
 
+# Bump whenever preprocessing, OCR configuration or matching changes what a
+# given image resolves to, so cached results from older pipelines are ignored.
+OCR_PIPELINE_VERSION = 7
+
+# Pixel space of multi-drug bounding boxes: the resized, deskewed page
+COORDINATES_PREPROCESSED = "preprocessed"
+
+# Process-wide: concurrent uploads of the same image join one computation.
+_inflight_ocr = SingleFlight()
+
+# Tiers of the single-drug cascade, cheapest first: a product barcode, then
+# text OCR on minimally and fully preprocessed images
+TIER_BARCODE = "barcode"
+TIER_MINIMAL = "minimal"
+TIER_FULL = "full"
+
+_metrics = get_metrics_registry()
+_tier_counters = {
+    tier: _metrics.counter(f"ocr_cascade_{tier}_total", f"Single-drug OCR results produced by the {tier} tier.")
+    for tier in (TIER_BARCODE, TIER_MINIMAL, TIER_FULL)
+}
+_cascade_escalations = _metrics.counter(
+    "ocr_cascade_escalations_total", "Images the minimal tier could not match confidently."
+)
+
+# Extraction pipelines: one drug per packaging photo, or every drug named
+# on a multi-line document such as a prescription.
+PIPELINE_SINGLE = "single"
+PIPELINE_MULTI = "multi"
+
+
 class OCRService:
     """
     Orchestrates the OpenCV preprocessing, Tesseract extraction,
     and RapidFuzz matching entirely off the main event loop.
     Returns the required REST API JSON envelope.
+
+    Results are content-addressed: keyed by the image hash plus pipeline and
+    vocabulary versions, cached in CacheClient when one is injected.
     """
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache: Optional[CacheClient] = None,
+        executor: Optional[OCRExecutor] = None,
+        execution_mode: Optional[str] = None,
+    ) -> None:
         settings = get_settings()
-        self._ocr_language = settings.ocr_language
-        if settings.tesseract_cmd:
-            # Honor explicit binary path from env (useful on macOS/Homebrew).
-            pytesseract.pytesseract.tesseract_cmd = settings.tesseract_cmd
+        self._pipeline_mode = settings.ocr_pipeline_mode
+        self._max_text_regions = max(1, settings.ocr_max_text_regions)
+        self._cache = cache
+        self._cache_ttl = settings.ocr_cache_ttl_seconds
+        self._packaging_index = (
+            get_packaging_index(settings.ocr_packaging_index_capacity)
+            if settings.ocr_packaging_index_enabled
+            else None
+        )
+        self._packaging_max_distance = settings.ocr_packaging_max_distance
+        self._packaging_min_confidence = settings.ocr_packaging_min_confidence
+        self._cascade_enabled = settings.ocr_cascade_enabled
+        self._cascade_min_confidence = settings.ocr_cascade_min_confidence
+        self._burst_top_frames = max(1, settings.ocr_burst_top_frames)
+        self._vocabulary_hints = settings.ocr_vocabulary_hints_enabled
+        self._vocabulary_cache_dir = settings.ocr_vocabulary_cache_dir
+        self._pdf_dpi = settings.ocr_pdf_dpi
+        self._pdf_max_pages = settings.ocr_pdf_max_pages
+        self._pdf_page_concurrency = max(1, settings.ocr_pdf_page_concurrency)
+        self._profiling = settings.ocr_profiling
+        # Without a product file there is nothing to resolve a code against
+        self._product_index = (
+            get_product_index(settings.ocr_product_index_path)
+            if settings.ocr_barcode_enabled and settings.ocr_product_index_path
+            else None
+        )
+        self._quality_gate = (
+            ImageQualityGate(
+                min_sharpness=settings.ocr_quality_min_sharpness,
+                min_text_height=settings.ocr_quality_min_text_height_px,
+                dark_level=settings.ocr_quality_dark_level,
+                bright_level=settings.ocr_quality_bright_level,
+                min_contrast=settings.ocr_quality_min_contrast,
+            )
+            if settings.ocr_quality_gate_enabled
+            else None
+        )
+        # Shared per process: in-process Tesseract pool, or pytesseract fallback
+        self._engine = get_tesseract_engine()
+        # Bounded OCR worker pool, separate from the event loop's default executor
+        self._executor = executor or get_ocr_executor()
+        # "process": executor threads only hand jobs to warm worker processes
+        self._process_runner = (
+            get_process_pipeline_runner()
+            if (execution_mode or settings.ocr_execution_mode) == "process"
+            else None
+        )
 
-    def _execute_sync_pipeline(self, image_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
+    def _result_key(self, image_bytes: bytes, known_drugs: List[str], pipeline: str = PIPELINE_SINGLE) -> str:
+        single = pipeline == PIPELINE_SINGLE
+        mode = self._pipeline_mode
+        if mode == ImageProcessor.MODE_REGIONS:
+            mode = f"{mode}:{self._max_text_regions}"
+        return build_cache_key(
+            namespace="ocr-result" if single else "ocr-multi-result",
+            payload={
+                "image": hashlib.sha256(image_bytes).hexdigest(),
+                "pipeline": OCR_PIPELINE_VERSION,
+                "mode": mode if single else ImageProcessor.MODE_DOCUMENT,
+                "vocabulary": vocabulary_version(known_drugs),
+                "products": self._product_index.version if single and self._product_index is not None else None,
+            },
+        )
+
+    def _cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._cache is None:
+            return None
+        return self._cache.get_json(key)
+
+    def _store_result(self, key: str, result: Dict[str, Any]) -> None:
+        if self._cache is not None:
+            self._cache.set_json(key, result, ttl=self._cache_ttl)
+
+    @staticmethod
+    def _fingerprint(processed_img: Any) -> Optional[int]:
         """
-        The heavy lifting pipeline designed to run in a separate thread.
-        This contains NO database logic (SqlAlchemy sessions) and relies
-        entirely on the provided `known_drugs` list.
+        Perceptual hash of the preprocessed text region. Best effort: the
+        packaging index is an optimization and must never fail a request.
         """
         try:
+            return perceptual_hash(processed_img)
+        except (cv2.error, AttributeError, TypeError, ValueError):
+            return None
+
+    def _match_barcode(self, image_bytes: bytes, known_drugs: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Barcode tier: a product code resolving through the product index to a
+        known drug identifies the pack exactly, without any text OCR. Best
+        effort, like the packaging index: any failure falls through to OCR.
+        """
+        try:
+            with stage_scope(TIER_BARCODE):
+                with stage("decode") as decode:
+                    gray = ImageProcessor.load_grayscale_capped(image_bytes, BarcodeScanner.SCAN_LONG_SIDE)
+                    decode.record(gray)
+                with stage("scan", gray):
+                    readings = BarcodeScanner.scan(gray)
+        except Exception:
+            return None
+
+        for reading in readings:
+            product = self._product_index.lookup(reading.gtin)
+            if product is None:
+                continue
+            drug_name = next((name for name in known_drugs if name.upper() == product.upper()), None)
+            if drug_name is None:
+                continue
+            return {
+                "extracted_text": reading.data,
+                "matched_drug": drug_name,
+                "confidence_score": 1.0,
+                "recognition_source": "barcode",
+                "preprocessing_tier": TIER_BARCODE,
+                "barcode": {"symbology": reading.symbology, **reading.fields, "gtin": reading.gtin},
+            }
+        return None
+
+    def _run_tier(
+        self,
+        tier: str,
+        image_bytes: bytes,
+        known_drugs: List[str],
+        vocabulary: Optional[str],
+        hints: Optional[VocabularyHints] = None,
+    ) -> Dict[str, Any]:
+        """
+        One preprocessing tier of the single-drug pipeline, from preprocessing
+        to a confident match. Raises ValueError when the tier finds no text or
+        no match.
+        """
+        with stage_scope(tier):
             # 1. Image Preprocessing (OpenCV)
-            processed_img = ImageProcessor.preprocess_for_ocr(image_bytes)
+            regions = None
+            if tier == TIER_MINIMAL:
+                processed_img = ImageProcessor.preprocess_minimal(image_bytes)
+            elif self._pipeline_mode == ImageProcessor.MODE_REGIONS:
+                # The whole page keys the packaging lookup; the regions are OCR'd
+                processed_img, regions = ImageProcessor.preprocess_regions(image_bytes, self._max_text_regions)
+            else:
+                processed_img = ImageProcessor.preprocess_for_ocr(image_bytes, mode=self._pipeline_mode)
+
+            # 1b. Near-duplicate packaging lookup: a close perceptual-hash match
+            # to a previously recognised box skips Tesseract entirely. Tiers
+            # produce different images, so each keeps its own hash space.
+            fingerprint = None
+            packaging_key = f"{vocabulary}/{tier}"
+            if self._packaging_index is not None:
+                with stage("packaging_lookup", processed_img):
+                    fingerprint = self._fingerprint(processed_img)
+                    known_package = None
+                    if fingerprint is not None:
+                        known_package = self._packaging_index.lookup(
+                            packaging_key, fingerprint, self._packaging_max_distance
+                        )
+                if known_package is not None:
+                    return {
+                        "extracted_text": known_package.extracted_text,
+                        "matched_drug": known_package.drug_name,
+                        "confidence_score": known_package.confidence,
+                        "recognition_source": "packaging_index",
+                        "preprocessing_tier": tier,
+                    }
 
             # 2. Extract Text (Tesseract)
-            # PSM 6 assumes a single uniform block of text (ideal for medicine boxes)
-            raw_text = pytesseract.image_to_string(
-                processed_img,
-                config="--psm 6",
-                lang=self._ocr_language,
-            )
+            # PSM 6 assumes a single uniform block of text (ideal for medicine boxes);
+            # vocabulary hints steer it toward catalogue names and strengths
+            with stage("ocr", processed_img):
+                if regions is None:
+                    raw_text = self._engine.image_to_string(processed_img, psm=6, hints=hints)
+                else:
+                    # Regions run side by side on the OCR pool, so latency
+                    # tracks the slowest region; texts stay in reading order
+                    texts = self._executor.map_inline(
+                        lambda region: self._engine.image_to_string(
+                            region, psm=ImageProcessor.region_psm(region), hints=hints
+                        ),
+                        regions,
+                    )
+                    raw_text = " ".join(text.strip() for text in texts if text.strip())
 
             if not raw_text.strip():
                  raise ValueError("No recognizable text found in the image.")
 
             # 3. Clean and sanitize the string
-            clean_text = TextCleaner.clean_ocr_text(raw_text)
+            with stage("clean"):
+                clean_text = TextCleaner.clean_ocr_text(raw_text)
 
             # 4. Fuzzy Match against the known drugs array
-            match_result = DrugMatcher.match_drug(clean_text, known_drugs)
+            with stage("match"):
+                match_result = DrugMatcher.match_drug(clean_text, known_drugs)
 
             if not match_result:
                  raise ValueError(f"Extracted text '{clean_text}' did not confidently match any known drugs.")
 
             drug_name, confidence = match_result
 
+            # 5. Remember confidently recognised packaging for near-duplicate uploads
+            if fingerprint is not None and confidence >= self._packaging_min_confidence:
+                self._packaging_index.add(
+                    packaging_key,
+                    fingerprint,
+                    PackagingMatch(drug_name=drug_name, confidence=confidence, extracted_text=clean_text),
+                )
+
             # Return raw Domain details (SRP - Let the router handle HTTP Envelope wrapping)
             return {
                 "extracted_text": clean_text,
                 "matched_drug": drug_name,
-                "confidence_score": confidence
+                "confidence_score": confidence,
+                "recognition_source": "ocr",
+                "preprocessing_tier": tier,
             }
 
+    def _execute_sync_pipeline(self, image_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
+        """
+        The heavy lifting pipeline designed to run in a separate thread
+        (or worker process, where `image_bytes` is a shared-memory view).
+        This contains NO database logic (SqlAlchemy sessions) and relies
+        entirely on the provided `known_drugs` list.
+
+        Cheap-first cascade: a product barcode found in the product index
+        settles the pack without OCR. Otherwise grayscale + Otsu at native
+        scale is tried first, and only images it cannot match confidently get
+        the full CLAHE/threshold/morphology/deskew/crop chain. The winning tier
+        is reported as `preprocessing_tier`.
+        """
+        try:
+            if self._product_index is not None:
+                result = self._match_barcode(image_bytes, known_drugs)
+                if result is not None:
+                    _tier_counters[TIER_BARCODE].inc()
+                    return result
+
+            vocabulary = None
+            if self._packaging_index is not None or self._vocabulary_hints:
+                vocabulary = vocabulary_version(known_drugs)
+            hints = None
+            if self._vocabulary_hints and known_drugs:
+                with stage("vocabulary_hints"):
+                    hints = get_vocabulary_hints(known_drugs, vocabulary, self._vocabulary_cache_dir)
+
+            if self._cascade_enabled:
+                try:
+                    result = self._run_tier(TIER_MINIMAL, image_bytes, known_drugs, vocabulary, hints)
+                except Exception:
+                    # Any failure here (no text, no match, odd format) is the
+                    # full tier's to report
+                    result = None
+                if result is not None and result["confidence_score"] >= self._cascade_min_confidence:
+                    _tier_counters[TIER_MINIMAL].inc()
+                    return result
+                _cascade_escalations.inc()
+
+            result = self._run_tier(TIER_FULL, image_bytes, known_drugs, vocabulary, hints)
+            _tier_counters[TIER_FULL].inc()
+            return result
+
         except ValueError as val_err:
              # Captured from ImageProcessor format exceptions
              raise val_err
@@ -118,16 +404,265 @@ class OCRService:
              # Catch-all for Tesseract binary path failures, memory faults, etc.
              raise RuntimeError(f"OCR pipeline failure: {str(e)}")
 
+    def _execute_multi_drug_pipeline(self, image_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
+        """
+        Prescription variant of the sync pipeline: OCRs the whole page at
+        word level and reports every known drug it names, with bounding
+        boxes in the preprocessed page's pixel space.
+        """
+        try:
+            with stage_scope("document"):
+                # 1. Whole-page preprocessing (no single text-block crop)
+                processed_img = ImageProcessor.preprocess_for_ocr(image_bytes, mode=ImageProcessor.MODE_DOCUMENT)
+
+                # 2. Word-level extraction (Tesseract)
+                # PSM 4 assumes a single column of text of variable sizes (prescription lines)
+                with stage("ocr", processed_img):
+                    words = self._engine.image_to_data(processed_img, psm=4)
+
+                if not words:
+                    raise ValueError("No recognizable text found in the image.")
+
+                # 3. Line segmentation, n-gram candidates and vocabulary matching
+                with stage("parse"):
+                    drugs = PrescriptionParser.extract_drugs(words, known_drugs)
+                extracted_text = "\n".join(
+                    " ".join(word.text for word in line) for line in PrescriptionParser.group_lines(words)
+                )
+
+                if not drugs:
+                    raise ValueError(
+                        f"Extracted text '{TextCleaner.clean_ocr_text(extracted_text)}' did not confidently match any known drugs."
+                    )
+
+                height, width = processed_img.shape[:2]
+                return {
+                    "extracted_text": extracted_text,
+                    "drugs": drugs,
+                    "page_size": {"width": width, "height": height},
+                    "coordinate_space": COORDINATES_PREPROCESSED,
+                }
+
+        except ValueError as val_err:
+             raise val_err
+        except Exception as e:
+             raise RuntimeError(f"OCR pipeline failure: {str(e)}")
+
+    @staticmethod
+    def _profiled(run, image_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
+        """Runs a pipeline under a fresh StageTimer and attaches its breakdown as `profile`."""
+        timer = StageTimer()
+        with timer.activate():
+            result = run(image_bytes, known_drugs)
+        return {**result, "profile": timer.breakdown()}
+
+    def _pipeline(self, pipeline: str):
+        run = self._execute_multi_drug_pipeline if pipeline == PIPELINE_MULTI else self._execute_sync_pipeline
+        if self._profiling == PROFILING_OFF:
+            return run
+        return functools.partial(self._profiled, run)
+
+    def _compute_and_store(
+        self, key: str, image_bytes: bytes, known_drugs: List[str], pipeline: str = PIPELINE_SINGLE
+    ) -> Dict[str, Any]:
+        if self._process_runner is not None:
+            result = self._process_runner.run(image_bytes, known_drugs, pipeline=pipeline)
+        else:
+            result = self._pipeline(pipeline)(image_bytes, known_drugs)
+
+        # Recorded here rather than in the pipeline so process-mode workers
+        # report into this process's metrics registry
+        profile = result.get("profile")
+        if profile is None:
+            self._store_result(key, result)
+            return result
+
+        record_stage_metrics(profile)
+        # Timings describe this run only; a cache hit must not replay them
+        result = {name: value for name, value in result.items() if name != "profile"}
+        self._store_result(key, result)
+        if self._profiling == PROFILING_DEBUG:
+            return {**result, "profile": profile}
+        return result
+
+    def _check_quality(self, image_bytes: bytes) -> None:
+        if self._quality_gate is not None:
+            self._quality_gate.check(image_bytes)
+
+    def _extract(self, image_bytes: bytes, known_drugs: List[str], pipeline: str) -> Dict[str, Any]:
+        key = self._result_key(image_bytes, known_drugs, pipeline)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        self._check_quality(image_bytes)
+        return _inflight_ocr.run(key, lambda: self._compute_and_store(key, image_bytes, known_drugs, pipeline))
+
+    async def _extract_async(self, image_bytes: bytes, known_drugs: List[str], pipeline: str) -> Dict[str, Any]:
+        key = self._result_key(image_bytes, known_drugs, pipeline)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+
+        # Decoding and measuring a large photo takes tens of milliseconds, too
+        # long for the event loop; the default thread pool keeps unreadable
+        # uploads from occupying an OCR worker or a queue slot
+        await asyncio.to_thread(self._check_quality, image_bytes)
+
+        # Execute the CPU-bound OpenCV and Tesseract processing on an OCR worker
+        return await _inflight_ocr.run_async(
+            key,
+            lambda: self._executor.run(self._compute_and_store, key, image_bytes, known_drugs, pipeline),
+        )
+
+    def extract_drug(self, image_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
+        """
+        Synchronous, cache-aware entry point for worker processes (Celery).
+        """
+        return self._extract(image_bytes, known_drugs, PIPELINE_SINGLE)
+
+    def extract_drugs(self, image_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
+        """
+        Synchronous multi-drug entry point (Celery); see extract_drugs_from_image.
+        """
+        return self._extract(image_bytes, known_drugs, PIPELINE_MULTI)
+
     async def extract_drug_from_image(self, image_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
         """
-        Asynchronous facade utilizing asyncio.to_thread()
-        to prevent blocking the Uvicorn/FastAPI event loop.
+        Asynchronous facade running the pipeline on the dedicated OCR
+        executor to prevent blocking the Uvicorn/FastAPI event loop.
+
+        Re-uploads of the same image are served from the result cache, and
+        identical uploads already in flight await the running computation.
         
         Args:
             image_bytes (bytes): The raw file bytes uploaded by the frontend.
             known_drugs (List[str]): Extracted from the Domain/Repository layer 
                                      prior to calling this service.
+
+        Raises:
+            ImageQualityException: The upload is too blurry, badly exposed
+                or small to read; rejected before reaching the OCR executor.
+            ServiceOverloadedException: The OCR queue is full or the job
+                waited past its deadline.
         """
-        # Execute the CPU-bound OpenCV and Tesseract processing in a separate thread
-        result = await asyncio.to_thread(self._execute_sync_pipeline, image_bytes, known_drugs)
-        return result
+        return await self._extract_async(image_bytes, known_drugs, PIPELINE_SINGLE)
+
+    async def extract_drugs_from_image(self, image_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
+        """
+        Extracts every known drug from a full prescription image in one pass.
+
+        Returns:
+            Dict with the line-joined `extracted_text`, the matched `drugs`
+            (drug_name, confidence, ocr_confidence, matched_text,
+            bounding_box) and the `page_size` the boxes refer to.
+            `coordinate_space` is "preprocessed": boxes are on the page after
+            resize normalisation and deskew, not on the uploaded image, so
+            clients scale them by page_size and not by the upload's size.
+
+        Raises:
+            ValueError: No text, or no confident drug match, on the page.
+            ImageQualityException: The upload is too blurry, badly exposed
+                or small to read.
+            ServiceOverloadedException: The OCR queue is full or the job
+                waited past its deadline.
+        """
+        return await self._extract_async(image_bytes, known_drugs, PIPELINE_MULTI)
+
+    async def _extract_best_frame(self, selected: List[SelectedFrame], known_drugs: List[str]) -> Dict[str, Any]:
+        # Best-ranked frame first; the next one only runs when it fails or
+        # matches below the cascade threshold
+        best: Optional[Dict[str, Any]] = None
+        first_error: Optional[Exception] = None
+        for frame in selected:
+            try:
+                result = await self._extract_async(frame.image_bytes, known_drugs, PIPELINE_SINGLE)
+            except ServiceOverloadedException:
+                raise
+            except Exception as exc:
+                first_error = first_error or exc
+                continue
+            result = {**result, "frame_index": frame.index}
+            if result["confidence_score"] >= self._cascade_min_confidence:
+                return result
+            if best is None or result["confidence_score"] > best["confidence_score"]:
+                best = result
+
+        if best is not None:
+            return best
+        if first_error is not None:
+            raise first_error
+        raise ValueError("No usable frame in the upload.")
+
+    async def extract_drug_from_burst(self, frames: List[bytes], known_drugs: List[str]) -> Dict[str, Any]:
+        """
+        Single-drug extraction from a burst of stills of the same pack.
+
+        Frames are ranked by a thumbnail sharpness/contrast score on the OCR
+        executor, and the full pipeline runs on at most OCR_BURST_TOP_FRAMES
+        of them, best first. The result carries the `frame_index` it came from.
+
+        Raises:
+            ValueError / ImageQualityException: No selected frame could be read.
+            ServiceOverloadedException: The OCR queue is full or the job
+                waited past its deadline.
+        """
+        selected = await self._executor.run(FrameSelector.select, frames, self._burst_top_frames)
+        return await self._extract_best_frame(selected, known_drugs)
+
+    async def extract_drug_from_clip(self, clip_bytes: bytes, known_drugs: List[str]) -> Dict[str, Any]:
+        """
+        Like extract_drug_from_burst, over frames sampled evenly from a short
+        video clip; `frame_index` counts sampled frames.
+        """
+        selected = await self._executor.run(FrameSelector.select_from_clip, clip_bytes, self._burst_top_frames)
+        return await self._extract_best_frame(selected, known_drugs)
+
+    async def open_pdf(self, pdf_bytes: bytes) -> PdfPages:
+        """
+        Opens a PDF prescription for extract_drugs_from_pdf. The caller owns
+        the returned pages and closes them.
+
+        Raises:
+            ValueError: PDF support is missing, or the file is unreadable,
+                empty or longer than OCR_PDF_MAX_PAGES.
+            ServiceOverloadedException: The OCR queue is full.
+        """
+        return await self._executor.run(open_pdf, pdf_bytes, self._pdf_dpi, self._pdf_max_pages)
+
+    async def _extract_pdf_page(self, pages: PdfPages, index: int, known_drugs: List[str]) -> Dict[str, Any]:
+        page_bytes = await self._executor.run(pages.render, index)
+        return await self._extract_async(page_bytes, known_drugs, PIPELINE_MULTI)
+
+    async def extract_drugs_from_pdf(
+        self, pages: PdfPages, known_drugs: List[str]
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Multi-drug extraction over every page of a PDF, streamed page by page.
+
+        Yields (page_number, outcome) in page order, page numbers starting at
+        1. The outcome is the extract_drugs_from_image result for that page,
+        or the exception it raised: one unreadable page does not end the
+        document.
+
+        Pages are rasterised only when they start, and at most
+        OCR_PDF_PAGE_CONCURRENCY are in flight at once, so memory stays at a
+        few page images for any document length.
+        """
+        window: "deque[asyncio.Task]" = deque()
+        next_index = 0
+        try:
+            while next_index < len(pages) or window:
+                while next_index < len(pages) and len(window) < self._pdf_page_concurrency:
+                    window.append(asyncio.ensure_future(self._extract_pdf_page(pages, next_index, known_drugs)))
+                    next_index += 1
+
+                page_number = next_index - len(window) + 1
+                try:
+                    outcome: Any = await window.popleft()
+                except Exception as exc:
+                    outcome = exc
+                yield page_number, outcome
+        finally:
+            # Consumer stopped early (e.g. client disconnect): drop pending pages
+            for task in window:
+                task.cancel()
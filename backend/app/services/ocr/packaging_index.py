@@ -0,0 +1,161 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# 16x16 low-frequency DCT block -> 256-bit hashes. Binarized text crops are
+# high-contrast, and the classic 64-bit pHash leaves too little margin between
+# re-photographed boxes and different products.
+HASH_SIDE = 16
+
+
+def perceptual_hash(image: np.ndarray) -> int:
+    """
+    256-bit DCT perceptual hash (pHash) of a single-channel image.
+
+    The image is shrunk to 64x64, transformed with a DCT, and the 16x16
+    lowest-frequency block (excluding the DC term from the median) is
+    thresholded against its median. Robust to rescaling, mild blur, JPEG
+    artefacts and small exposure changes.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    side = HASH_SIDE * 4
+    small = cv2.resize(image, (side, side), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low_freq = cv2.dct(small)[:HASH_SIDE, :HASH_SIDE]
+    median = np.median(low_freq.flatten()[1:])
+    bits = (low_freq > median).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+@dataclass(frozen=True)
+class PackagingMatch:
+    """A previously recognised package and what it resolved to."""
+    drug_name: str
+    confidence: float
+    extracted_text: str
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over Hamming distance. Range queries only descend
+    into children whose edge distance lies within [d - r, d + r], which
+    prunes most of the tree for small radii.
+    """
+
+    def __init__(self) -> None:
+        self._root: Optional[list] = None  # [hash, payload, {distance: child}]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: int, payload: PackagingMatch) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = [key, payload, {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming_distance(key, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [key, payload, {}]
+                return
+            node = child
+
+    def search(self, key: int, radius: int) -> List[Tuple[int, PackagingMatch]]:
+        if self._root is None:
+            return []
+        matches = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(key, node[0])
+            if distance <= radius:
+                matches.append((distance, node[1]))
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+
+class PackagingRecognitionIndex:
+    """
+    Near-duplicate index of recognised medicine packaging.
+
+    One BK-tree per drug vocabulary version, so a stored match is never
+    returned for a vocabulary that no longer contains it. Only the most
+    recent versions are kept.
+    """
+
+    MAX_VOCABULARY_VERSIONS = 2
+
+    # Entries this close to an existing one for the same drug add nothing
+    DUPLICATE_DISTANCE = 8
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._trees: "OrderedDict[str, BKTree]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _tree(self, vocabulary: str) -> BKTree:
+        tree = self._trees.get(vocabulary)
+        if tree is None:
+            tree = BKTree()
+            self._trees[vocabulary] = tree
+            while len(self._trees) > self.MAX_VOCABULARY_VERSIONS:
+                self._trees.popitem(last=False)
+        self._trees.move_to_end(vocabulary)
+        return tree
+
+    def lookup(self, vocabulary: str, fingerprint: int, max_distance: int) -> Optional[PackagingMatch]:
+        with self._lock:
+            matches = self._tree(vocabulary).search(fingerprint, max_distance)
+        if not matches:
+            return None
+
+        # Nearest neighbours must agree; conflicting drugs within the radius
+        # mean the hash cannot tell these packages apart
+        best_distance, best = matches[0]
+        for distance, match in matches[1:]:
+            if distance == best_distance and match.drug_name != best.drug_name:
+                return None
+        return best
+
+    def add(self, vocabulary: str, fingerprint: int, match: PackagingMatch) -> bool:
+        """
+        Stores a confident recognition. Returns False when the index is full
+        or an equivalent entry already exists.
+        """
+        with self._lock:
+            tree = self._tree(vocabulary)
+            if len(tree) >= self._capacity:
+                return False
+            for _, existing in tree.search(fingerprint, self.DUPLICATE_DISTANCE):
+                if existing.drug_name == match.drug_name:
+                    return False
+            tree.add(fingerprint, match)
+            return True
+
+
+_index_singleton: Optional[PackagingRecognitionIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_packaging_index(capacity: int) -> PackagingRecognitionIndex:
+    global _index_singleton
+    if _index_singleton is None:
+        with _index_lock:
+            if _index_singleton is None:
+                _index_singleton = PackagingRecognitionIndex(capacity=capacity)
+    return _index_singleton
@@ -0,0 +1,116 @@
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pragma: no cover - optional dependency fallback
+    pdfium = None
+
+# PDFium is not thread-safe, not even across documents: every call into it
+# from any OCR worker goes through this lock
+_pdfium_lock = threading.Lock()
+
+
+class PdfPages:
+    """
+    Pages of a PDF, rasterised one at a time on demand.
+
+    Nothing is rendered up front, so memory holds the compressed document
+    plus only the pages the caller is working on, however long the PDF is.
+    Requires the optional `pypdfium2` package.
+    """
+
+    # PDF user space is 1/72 inch
+    POINTS_PER_INCH = 72.0
+
+    # Longest rendered side (px): oversized page boxes (posters, scans stored
+    # at their sensor size) would otherwise rasterise to hundreds of MB
+    MAX_LONG_SIDE = 4200
+
+    # Fast PNG compression: page images only travel between workers
+    PNG_COMPRESSION = 1
+
+    def __init__(self, pdf_bytes: bytes, dpi: int) -> None:
+        if pdfium is None:
+            raise ValueError("PDF support is not installed (pip install pypdfium2).")
+        self._dpi = dpi
+        self._closed = False
+        with _pdfium_lock:
+            try:
+                # PDFium keeps a reference to the data while the document is
+                # open; bytes() is a no-op for bytes, a copy for upload views
+                self._document = pdfium.PdfDocument(bytes(pdf_bytes))
+                self._page_count = len(self._document)
+            except Exception:
+                raise ValueError("Invalid PDF file.")
+
+    @staticmethod
+    def available() -> bool:
+        return pdfium is not None
+
+    def __len__(self) -> int:
+        return self._page_count
+
+    def _scale(self, page) -> float:
+        width, height = page.get_size()
+        scale = self._dpi / self.POINTS_PER_INCH
+        long_side = max(width, height) * scale
+        if long_side > self.MAX_LONG_SIDE:
+            scale *= self.MAX_LONG_SIDE / long_side
+        return scale
+
+    def render_gray(self, index: int) -> np.ndarray:
+        """Page `index` (0-based) as an 8-bit grayscale image at the configured DPI."""
+        with _pdfium_lock:
+            # A stream cancelled mid-render may close the document under us
+            if self._closed:
+                raise ValueError("The PDF document was closed.")
+            page = self._document[index]
+            try:
+                bitmap = page.render(scale=self._scale(page), grayscale=True)
+                try:
+                    # Copy out: the array views PDFium-owned memory
+                    pixels = np.array(bitmap.to_numpy(), copy=True)
+                finally:
+                    bitmap.close()
+            finally:
+                page.close()
+
+        if pixels.ndim == 3:
+            pixels = pixels[:, :, 0] if pixels.shape[2] == 1 else cv2.cvtColor(pixels, cv2.COLOR_BGR2GRAY)
+        return pixels
+
+    def render(self, index: int) -> bytes:
+        """Page `index` (0-based) as lossless PNG bytes for the OCR pipeline."""
+        ok, encoded = cv2.imencode(
+            ".png", self.render_gray(index), [cv2.IMWRITE_PNG_COMPRESSION, self.PNG_COMPRESSION]
+        )
+        if not ok:
+            raise ValueError(f"Page {index + 1} could not be rasterised.")
+        return encoded.tobytes()
+
+    def close(self) -> None:
+        with _pdfium_lock:
+            if not self._closed:
+                self._closed = True
+                self._document.close()
+
+
+def open_pdf(pdf_bytes: bytes, dpi: int, max_pages: Optional[int] = None) -> PdfPages:
+    """
+    Opens a PDF for page-by-page rasterisation.
+
+    Raises:
+        ValueError: PDF support is missing, the file is not a readable PDF,
+            or it has no pages or more than `max_pages`.
+    """
+    pages = PdfPages(pdf_bytes, dpi)
+    if len(pages) == 0 or (max_pages is not None and len(pages) > max_pages):
+        pages.close()
+        if len(pages) == 0:
+            raise ValueError("The PDF has no pages.")
+        raise ValueError(f"A PDF may contain at most {max_pages} pages.")
+    return pages
@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from rapidfuzz import fuzz
+
+from .drug_index import get_confusion_key_map, get_drug_name_index
+from .drug_matcher import DrugMatcher
+from .tesseract_engine import OCRWord
+from .text_cleaner import TextCleaner
+
+
+class PrescriptionParser:
+    """
+    Turns word-level OCR output of a whole prescription into every drug it
+    names, each with a confidence and the bounding box of the matched words.
+    """
+
+    # Whole-token fuzz.ratio is stricter than the single-drug partial_ratio
+    # match, because a page yields dozens of n-grams that could match by chance.
+    MIN_CONFIDENCE = 0.8
+
+    # Longest multi-word drug name considered (e.g. "INSULIN GLARGINE U100")
+    MAX_NGRAM_WORDS = 3
+
+    MIN_TOKEN_LENGTH = 3
+
+    # Common prescription words that are never drug names
+    STOP_TOKENS = frozenset({
+        "TAB", "TABS", "TABLET", "TABLETS", "CAP", "CAPS", "CAPSULE", "CAPSULES",
+        "MCG", "BID", "TID", "QID", "DAILY", "SIG", "DISP", "REFILL", "REFILLS",
+        "TAKE", "ONCE", "TWICE", "AFTER", "BEFORE", "FOOD", "MEALS", "DAYS",
+    })
+
+    @staticmethod
+    def group_lines(words: List[OCRWord]) -> List[List[OCRWord]]:
+        """Groups words by Tesseract line, each line ordered left to right."""
+        lines: "OrderedDict[Tuple[int, int, int], List[OCRWord]]" = OrderedDict()
+        for word in words:
+            lines.setdefault(word.line, []).append(word)
+        return [sorted(line, key=lambda word: word.left) for line in lines.values()]
+
+    @staticmethod
+    def _is_candidate_token(token: str) -> bool:
+        return (
+            len(token) >= PrescriptionParser.MIN_TOKEN_LENGTH
+            and any(char.isalpha() for char in token)
+            and token not in PrescriptionParser.STOP_TOKENS
+        )
+
+    @staticmethod
+    def candidate_ngrams(tokens: List[str]) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yields (start, end, text) for runs of up to MAX_NGRAM_WORDS
+        consecutive candidate tokens. Doses and stop words break a run, so
+        "AMOXICILLIN 500 MG" only yields "AMOXICILLIN".
+        """
+        for start in range(len(tokens)):
+            for end in range(start + 1, min(len(tokens), start + PrescriptionParser.MAX_NGRAM_WORDS) + 1):
+                if not PrescriptionParser._is_candidate_token(tokens[end - 1]):
+                    break
+                yield start, end, " ".join(tokens[start:end])
+
+    @staticmethod
+    def _bounding_box(words: List[OCRWord]) -> Dict[str, int]:
+        left = min(word.left for word in words)
+        top = min(word.top for word in words)
+        right = max(word.left + word.width for word in words)
+        bottom = max(word.top + word.height for word in words)
+        return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+    @staticmethod
+    def _match_line(
+        ngrams: List[Tuple[int, int, str]], known_drugs: List[str]
+    ) -> List[Optional[Tuple[str, float]]]:
+        """
+        (drug, score) or None per n-gram of one line. Confusion-key hits
+        score 1.0; the rest are scored with one cdist call against the
+        union of their trigram candidates instead of the whole vocabulary.
+        """
+        exact_names = get_confusion_key_map(known_drugs)
+        matches: List[Optional[Tuple[str, float]]] = []
+        for _, _, text in ngrams:
+            exact = exact_names.get(text)
+            matches.append((exact, 1.0) if exact is not None else None)
+
+        pending = [position for position, match in enumerate(matches) if match is None]
+        if not pending:
+            return matches
+        name_index = get_drug_name_index(known_drugs)
+        name_ids = sorted({
+            name_id for position in pending for name_id in name_index.candidates(ngrams[position][2])
+        })
+        names_by_key: Dict[str, str] = {}
+        for name_id in name_ids:
+            key = TextCleaner.clean_ocr_text(known_drugs[name_id])
+            if key:
+                names_by_key.setdefault(key, known_drugs[name_id])
+        if not names_by_key:
+            return matches
+
+        fuzzy = DrugMatcher.match_many(
+            [ngrams[position][2] for position in pending],
+            list(names_by_key),
+            top_k=1,
+            scorer=fuzz.ratio,
+            min_confidence=PrescriptionParser.MIN_CONFIDENCE,
+        )
+        for position, best in zip(pending, fuzzy):
+            if best:
+                key, score = best[0]
+                matches[position] = (names_by_key[key], score)
+        return matches
+
+    @staticmethod
+    def extract_drugs(words: List[OCRWord], known_drugs: List[str]) -> List[Dict[str, Any]]:
+        """
+        Matches every line's n-grams against the vocabulary.
+
+        Within a line, the best-scoring non-overlapping n-grams win (longer
+        n-grams first on ties). A drug found on several lines is reported
+        once, at its most confident occurrence.
+
+        Returns:
+            Matches in reading order: drug_name, confidence (0.0-1.0),
+            ocr_confidence (0.0-1.0), matched_text and bounding_box. Boxes
+            are in the pixel space of the words, i.e. the preprocessed page.
+        """
+        lines = PrescriptionParser.group_lines(words)
+
+        # 1. Every candidate n-gram of each line, matched in one batch per line
+        scored_by_line: Dict[int, list] = {}
+        for line_number, line in enumerate(lines):
+            tokens = [TextCleaner.clean_ocr_text(word.text) for word in line]
+            ngrams = list(PrescriptionParser.candidate_ngrams(tokens))
+            for (start, end, text), match in zip(ngrams, PrescriptionParser._match_line(ngrams, known_drugs)):
+                if match is not None:
+                    scored_by_line.setdefault(line_number, []).append(
+                        (match[1], end - start, start, end, text, match[0])
+                    )
+
+        # 2. Best non-overlapping n-grams per line, best occurrence per drug
+        best_by_drug: Dict[str, Dict[str, Any]] = {}
+        for line_number, scored in scored_by_line.items():
+            line = lines[line_number]
+            taken = [False] * len(line)
+            for score, _, start, end, text, drug_name in sorted(scored, key=lambda item: (-item[0], -item[1], item[2])):
+                if any(taken[start:end]):
+                    continue
+                taken[start:end] = [True] * (end - start)
+
+                matched_words = line[start:end]
+                candidate = {
+                    "drug_name": drug_name,
+                    "confidence": score,
+                    "ocr_confidence": round(
+                        sum(max(word.confidence, 0.0) for word in matched_words) / (100.0 * len(matched_words)), 4
+                    ),
+                    "matched_text": text,
+                    "bounding_box": PrescriptionParser._bounding_box(matched_words),
+                    "_order": (line_number, matched_words[0].left),
+                }
+                current = best_by_drug.get(drug_name)
+                if current is None or score > current["confidence"]:
+                    best_by_drug[drug_name] = candidate
+
+        matches = sorted(best_by_drug.values(), key=lambda match: match["_order"])
+        for match in matches:
+            del match["_order"]
+        return matches
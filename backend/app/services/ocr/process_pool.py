@@ -0,0 +1,232 @@
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from backend.app.core.config import get_settings
+except ModuleNotFoundError:
+    from app.core.config import get_settings
+from .drug_matcher import DrugVocabulary, vocabulary_version
+from .tesseract_engine import get_tesseract_engine
+
+# (shared memory block name, payload size in bytes)
+SharedRef = Tuple[str, int]
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+_worker_service = None
+_worker_vocabularies: "OrderedDict[str, List[str]]" = OrderedDict()
+WORKER_VOCABULARY_VERSIONS = 2
+
+
+def _init_worker() -> None:
+    """
+    Runs once per worker process: builds the OCR service and loads the
+    Tesseract model so the first upload does not pay for it.
+    """
+    global _worker_service
+    from .ocr_service import OCRService
+
+    # Result caching and single-flight stay in the parent; workers only compute
+    _worker_service = OCRService(cache=None, execution_mode="thread")
+    warm = getattr(get_tesseract_engine(), "warm", None)
+    if warm is not None:
+        warm()
+
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+
+def _worker_vocabulary(version: str, ref: SharedRef) -> List[str]:
+    known_drugs = _worker_vocabularies.get(version)
+    if known_drugs is None:
+        name, size = ref
+        block = SharedMemory(name=name)
+        try:
+            names = bytes(block.buf[:size]).decode("utf-8").split("\n") if size else []
+            known_drugs = DrugVocabulary(names, version=version)
+        finally:
+            block.close()
+        _worker_vocabularies[version] = known_drugs
+        while len(_worker_vocabularies) > WORKER_VOCABULARY_VERSIONS:
+            _worker_vocabularies.popitem(last=False)
+    _worker_vocabularies.move_to_end(version)
+    return known_drugs
+
+
+def _run_pipeline_in_worker(
+    image_ref: SharedRef, vocabulary: str, vocabulary_ref: SharedRef, pipeline: str
+) -> Dict[str, Any]:
+    known_drugs = _worker_vocabulary(vocabulary, vocabulary_ref)
+    name, size = image_ref
+    block = SharedMemory(name=name)
+    view = block.buf[:size]
+    error: Optional[BaseException] = None
+    try:
+        # The pipeline reads the upload straight from the shared mapping
+        return _worker_service._pipeline(pipeline)(view, known_drugs)
+    except Exception as exc:
+        # Drop the traceback: its frames still reference the shared buffer,
+        # which would keep the mapping from being closed
+        error = exc.with_traceback(None)
+        error.__context__ = None
+        error.__cause__ = None
+    finally:
+        try:
+            view.release()
+            block.close()
+        except BufferError:  # pragma: no cover - a stray view outlived the pipeline
+            pass
+    raise error
+
+
+# ---------------------------------------------------------------------------
+# Parent process side
+# ---------------------------------------------------------------------------
+
+class _PublishedVocabulary:
+    """A vocabulary block plus the number of in-flight jobs referencing it."""
+
+    def __init__(self, block: SharedMemory, size: int) -> None:
+        self.block = block
+        self.size = size
+        self.refs = 0
+        self.retired = False
+
+    def unlink(self) -> None:
+        self.block.close()
+        self.block.unlink()
+
+
+class ProcessPipelineRunner:
+    """
+    Runs the OCRService sync pipelines in a pool of warm worker
+    processes, sidestepping the GIL-bound stages (contour loops, text
+    cleaning, fuzzy matching).
+
+    Upload bytes are written to a shared-memory block that the worker maps
+    directly instead of receiving a pickled copy. The drug vocabulary is
+    published to shared memory once per vocabulary version and cached by
+    each worker, so steady-state jobs only send two block names.
+    """
+
+    # Vocabulary blocks kept published for reuse by later jobs
+    PUBLISHED_VOCABULARY_VERSIONS = 4
+
+    def __init__(self, max_workers: int) -> None:
+        self._max_workers = max(1, max_workers)
+        self._pool = self._new_pool()
+        self._pool_lock = threading.Lock()
+        self._vocabularies: "OrderedDict[str, _PublishedVocabulary]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that already runs threads is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Swaps in a fresh pool after a worker died (segfault, OOM kill). Only
+        the first caller to notice replaces it. Vocabulary blocks live in
+        this process, so new workers attach to them as before.
+        """
+        with self._pool_lock:
+            if self._pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+
+    def warm(self) -> None:
+        """Starts every worker process and waits until they are initialised."""
+        pings = [self._pool.submit(_worker_ping) for _ in range(self._max_workers)]
+        for ping in pings:
+            ping.result()
+
+    def _acquire_vocabulary(self, known_drugs: List[str], version: str) -> _PublishedVocabulary:
+        """Publishes the vocabulary if needed and takes a reference for one job."""
+        with self._lock:
+            published = self._vocabularies.get(version)
+            if published is None:
+                payload = "\n".join(known_drugs).encode("utf-8")
+                block = SharedMemory(create=True, size=max(1, len(payload)))
+                block.buf[:len(payload)] = payload
+                published = _PublishedVocabulary(block, len(payload))
+                self._vocabularies[version] = published
+                while len(self._vocabularies) > self.PUBLISHED_VOCABULARY_VERSIONS:
+                    stale = self._vocabularies.popitem(last=False)[1]
+                    # Jobs still queued or running keep their block attached-to
+                    stale.retired = True
+                    if stale.refs == 0:
+                        stale.unlink()
+            self._vocabularies.move_to_end(version)
+            published.refs += 1
+            return published
+
+    def _release_vocabulary(self, published: _PublishedVocabulary) -> None:
+        with self._lock:
+            published.refs -= 1
+            if published.retired and published.refs == 0:
+                published.unlink()
+
+    def run(self, image_bytes: bytes, known_drugs: List[str], pipeline: str = "single") -> Dict[str, Any]:
+        """Blocks the calling (OCR executor) thread until a worker finishes."""
+        version = vocabulary_version(known_drugs)
+        vocabulary = self._acquire_vocabulary(known_drugs, version)
+        try:
+            block = SharedMemory(create=True, size=max(1, len(image_bytes)))
+            try:
+                block.buf[:len(image_bytes)] = image_bytes
+                job = (_run_pipeline_in_worker, (block.name, len(image_bytes)), version,
+                       (vocabulary.block.name, vocabulary.size), pipeline)
+                # One retry on a fresh pool; a job that kills its worker twice
+                # fails alone, and later requests still get a working pool
+                for attempt in range(2):
+                    pool = self._pool
+                    try:
+                        return pool.submit(*job).result()
+                    except BrokenProcessPool:
+                        self._replace_broken_pool(pool)
+                        if attempt:
+                            raise
+            finally:
+                block.close()
+                block.unlink()
+        finally:
+            self._release_vocabulary(vocabulary)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            for published in self._vocabularies.values():
+                published.retired = True
+                if published.refs == 0:
+                    published.unlink()
+            self._vocabularies.clear()
+
+
+_runner_singleton: Optional[ProcessPipelineRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_process_pipeline_runner() -> ProcessPipelineRunner:
+    global _runner_singleton
+    if _runner_singleton is None:
+        with _runner_lock:
+            if _runner_singleton is None:
+                settings = get_settings()
+                runner = ProcessPipelineRunner(max_workers=settings.ocr_max_workers or (os.cpu_count() or 1))
+                runner.warm()
+                _runner_singleton = runner
+    return _runner_singleton
@@ -0,0 +1,123 @@
+"""
+Replays a directory of images through the OCR pipeline and prints where the
+time goes, stage by stage.
+
+    python -m app.services.ocr.profile_cli path/to/images [--pipeline multi] [--drugs names.txt]
+
+Runs in-process and uncached, with the same settings (cascade, pipeline
+mode, OCR engine) the API would use.
+"""
+import argparse
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .ocr_service import PIPELINE_MULTI, PIPELINE_SINGLE, OCRService
+from .profiling import StageRecord, StageTimer
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff")
+
+
+def _load_vocabulary(path: Optional[str]) -> List[str]:
+    if path is None:
+        try:
+            from backend.app.api.dependencies import get_medication_repository
+        except ModuleNotFoundError:
+            from app.api.dependencies import get_medication_repository
+        return get_medication_repository()
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(records: List[StageRecord]) -> List[Dict[str, float]]:
+    """Per-stage aggregates, in the order stages first ran."""
+    by_stage: "OrderedDict[str, List[StageRecord]]" = OrderedDict()
+    for record in records:
+        by_stage.setdefault(record.stage, []).append(record)
+
+    rows = []
+    for name, runs in by_stage.items():
+        walls = [run.wall_seconds for run in runs]
+        rows.append({
+            "stage": name,
+            "runs": len(runs),
+            "total_ms": sum(walls) * 1000,
+            "mean_ms": sum(walls) / len(runs) * 1000,
+            "p95_ms": _percentile(walls, 0.95) * 1000,
+            "cpu_ms": sum(run.cpu_seconds for run in runs) / len(runs) * 1000,
+            "megapixels": sum(run.input_pixels for run in runs) / len(runs) / 1e6,
+            "peak_mb": max(run.array_bytes for run in runs) / 1e6,
+        })
+    return rows
+
+
+def _print_table(rows: List[Dict[str, float]], out) -> None:
+    header = f"{'stage':<34}{'runs':>6}{'total ms':>11}{'mean ms':>10}{'p95 ms':>10}{'cpu ms':>10}{'Mpx':>8}{'peak MB':>9}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for row in rows:
+        print(
+            f"{row['stage']:<34}{row['runs']:>6}{row['total_ms']:>11.1f}{row['mean_ms']:>10.2f}"
+            f"{row['p95_ms']:>10.2f}{row['cpu_ms']:>10.2f}{row['megapixels']:>8.2f}{row['peak_mb']:>9.2f}",
+            file=out,
+        )
+
+
+def replay(
+    images: Sequence[Path], known_drugs: List[str], pipeline: str = PIPELINE_SINGLE, out=sys.stdout
+) -> List[StageRecord]:
+    """
+    OCRs every image once, printing one line per image, and returns all
+    stage records. Failed images still contribute the stages they ran.
+    """
+    service = OCRService(cache=None, execution_mode="thread")
+    run = (
+        service._execute_multi_drug_pipeline if pipeline == PIPELINE_MULTI else service._execute_sync_pipeline
+    )
+
+    records: List[StageRecord] = []
+    for path in images:
+        timer = StageTimer()
+        with timer.activate():
+            try:
+                result = run(path.read_bytes(), known_drugs)
+                if pipeline == PIPELINE_MULTI:
+                    outcome = ", ".join(drug["drug_name"] for drug in result["drugs"])
+                else:
+                    outcome = f"{result['matched_drug']} ({result['preprocessing_tier']})"
+            except (ValueError, RuntimeError) as exc:
+                outcome = f"failed: {exc}"
+        wall_ms = sum(record.wall_seconds for record in timer.records) * 1000
+        print(f"{path.name}: {wall_ms:.1f} ms, {outcome}", file=out)
+        records.extend(timer.records)
+    return records
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-stage OCR pipeline profile over a directory of images.")
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--pipeline", choices=(PIPELINE_SINGLE, PIPELINE_MULTI), default=PIPELINE_SINGLE)
+    parser.add_argument("--drugs", help="File with one known drug name per line (default: the API's list)")
+    args = parser.parse_args(argv)
+
+    images = sorted(
+        path for path in args.directory.iterdir() if path.suffix.lower() in IMAGE_SUFFIXES
+    )
+    if not images:
+        print(f"No images found in {args.directory}", file=sys.stderr)
+        return 1
+
+    records = replay(images, _load_vocabulary(args.drugs), args.pipeline)
+    print()
+    _print_table(summarize(records), sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
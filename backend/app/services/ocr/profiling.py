@@ -0,0 +1,149 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from app.core.metrics import get_metrics_registry
+except ImportError:
+    from backend.app.core.metrics import get_metrics_registry
+
+# OCR_PROFILING modes: no timing at all, per-stage metrics histograms only,
+# or histograms plus a `profile` field on every OCR result.
+PROFILING_OFF = "off"
+PROFILING_METRICS = "metrics"
+PROFILING_DEBUG = "debug"
+PROFILING_MODES = (PROFILING_OFF, PROFILING_METRICS, PROFILING_DEBUG)
+
+
+@dataclass(frozen=True)
+class StageRecord:
+    """
+    Cost of one pipeline stage.
+
+    cpu_seconds is the calling thread's CPU time, so work OpenCV fans out to
+    its own thread pool shows up as wall time only. array_bytes is the size
+    of the stage's input and output arrays, both resident when it ends.
+    """
+
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    input_pixels: int
+    array_bytes: int
+
+
+class _StageHandle:
+    """Lets a stage body report the array it produced."""
+
+    __slots__ = ("output",)
+
+    def __init__(self) -> None:
+        self.output: Any = None
+
+    def record(self, output: Any) -> None:
+        self.output = output
+
+
+class StageTimer:
+    """
+    Collects StageRecords for one pipeline run.
+
+    A timer is activated for the current context; ImageProcessor and
+    OCRService report stages through the module-level `stage()` helper, which
+    is a no-op when no timer is active.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[StageRecord] = []
+
+    @contextmanager
+    def activate(self) -> Iterator["StageTimer"]:
+        token = _active_timer.set(self)
+        try:
+            yield self
+        finally:
+            _active_timer.reset(token)
+
+    @contextmanager
+    def stage(self, name: str, image: Any = None) -> Iterator[_StageHandle]:
+        handle = _StageHandle()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield handle
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            measured = image if image is not None else handle.output
+            self.records.append(
+                StageRecord(
+                    stage=name,
+                    wall_seconds=wall,
+                    cpu_seconds=cpu,
+                    input_pixels=_pixels(measured),
+                    array_bytes=_nbytes(image) + _nbytes(handle.output),
+                )
+            )
+
+    def breakdown(self) -> List[Dict[str, Any]]:
+        """Records in execution order, as JSON-ready dicts."""
+        return [asdict(record) for record in self.records]
+
+
+_active_timer: ContextVar[Optional[StageTimer]] = ContextVar("ocr_stage_timer", default=None)
+_stage_scope: ContextVar[str] = ContextVar("ocr_stage_scope", default="")
+
+
+def _pixels(image: Any) -> int:
+    shape = getattr(image, "shape", None)
+    if not shape or len(shape) < 2:
+        return 0
+    return int(shape[0]) * int(shape[1])
+
+
+def _nbytes(image: Any) -> int:
+    return int(getattr(image, "nbytes", 0) or 0)
+
+
+@contextmanager
+def stage(name: str, image: Any = None) -> Iterator[_StageHandle]:
+    """
+    Times the enclosed block as stage `name` on the active timer, if any.
+    `image` is the stage's input array; without one (e.g. decoding from
+    bytes) pixels are counted on the array passed to `handle.record()`.
+    """
+    timer = _active_timer.get()
+    if timer is None:
+        yield _StageHandle()
+        return
+    with timer.stage(_stage_scope.get() + name, image) as handle:
+        yield handle
+
+
+@contextmanager
+def stage_scope(prefix: str) -> Iterator[None]:
+    """Prefixes stages recorded in the block, e.g. "full." for a cascade tier."""
+    token = _stage_scope.set(f"{prefix}.")
+    try:
+        yield
+    finally:
+        _stage_scope.reset(token)
+
+
+def _metric_name(stage_name: str) -> str:
+    return stage_name.replace(".", "_").replace("-", "_")
+
+
+def record_stage_metrics(profile: List[Dict[str, Any]]) -> None:
+    """Feeds a StageTimer breakdown into the per-stage wall and CPU histograms."""
+    registry = get_metrics_registry()
+    for record in profile:
+        name = _metric_name(record["stage"])
+        registry.histogram(
+            f"ocr_stage_{name}_seconds", f"Wall time of the OCR {record['stage']} stage."
+        ).observe(record["wall_seconds"])
+        registry.histogram(
+            f"ocr_stage_{name}_cpu_seconds", f"CPU time of the OCR {record['stage']} stage."
+        ).observe(record["cpu_seconds"])
@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+try:
+    from app.core.exceptions import ImageQualityException
+    from app.core.metrics import get_metrics_registry
+except ImportError:
+    from backend.app.core.exceptions import ImageQualityException
+    from backend.app.core.metrics import get_metrics_registry
+from .image_processor import ImageProcessor
+
+# Rejection reasons, reported to clients and counted per reason
+REASON_TOO_SMALL = "too_small"
+REASON_TOO_DARK = "too_dark"
+REASON_OVEREXPOSED = "overexposed"
+REASON_LOW_CONTRAST = "low_contrast"
+REASON_BLURRY = "blurry"
+REASON_TEXT_TOO_SMALL = "text_too_small"
+REASONS = (
+    REASON_TOO_SMALL,
+    REASON_TOO_DARK,
+    REASON_OVEREXPOSED,
+    REASON_LOW_CONTRAST,
+    REASON_BLURRY,
+    REASON_TEXT_TOO_SMALL,
+)
+
+_metrics = get_metrics_registry()
+_checked = _metrics.counter("ocr_quality_checks_total", "Uploads inspected by the image quality gate.")
+_rejections = {
+    reason: _metrics.counter(
+        f"ocr_quality_rejected_{reason}_total", f"Uploads rejected by the quality gate as {reason}."
+    )
+    for reason in REASONS
+}
+
+
+@dataclass(frozen=True)
+class QualityReport:
+    """Measurements on the gate thumbnail; text_height is in upload pixels."""
+
+    width: int
+    height: int
+    sharpness: float
+    dark_level: int
+    bright_level: int
+    text_height: Optional[float]
+
+
+class ImageQualityGate:
+    """
+    Millisecond pre-check that turns away uploads Tesseract cannot read,
+    before they take an OCR worker.
+
+    Everything is measured on a grayscale thumbnail decoded at a reduced
+    scale: Laplacian variance for focus, the 0.5th/99.5th brightness
+    percentiles for exposure, and the median glyph height (mapped back to
+    upload pixels) for text size. Thresholds are deliberately lenient; the
+    gate only rejects what the pipeline would certainly fail on.
+    """
+
+    # Long side (px) the sharpness is measured at, so the variance does not
+    # depend on the upload's resolution
+    THUMBNAIL_LONG_SIDE = 512
+
+    # Neither side of the upload may be shorter than this
+    MIN_IMAGE_SIDE = 32
+
+    # Share of pixels cut off each end of the histogram for dark/bright levels
+    EXPOSURE_PERCENTILE = 0.005
+
+    def __init__(
+        self,
+        min_sharpness: float,
+        min_text_height: float,
+        dark_level: int,
+        bright_level: int,
+        min_contrast: int,
+    ) -> None:
+        self._min_sharpness = min_sharpness
+        self._min_text_height = min_text_height
+        self._dark_level = dark_level
+        self._bright_level = bright_level
+        self._min_contrast = min_contrast
+
+    @staticmethod
+    def measure(image_bytes: bytes) -> Optional[QualityReport]:
+        """
+        Quality measurements of the upload, or None when it cannot be decoded
+        (format errors stay the pipeline's to report).
+        """
+        dimensions = ImageProcessor._probe_dimensions(image_bytes)
+        if dimensions is None:
+            return None
+        try:
+            thumb = ImageProcessor.load_grayscale_capped(image_bytes, ImageQualityGate.THUMBNAIL_LONG_SIDE)
+        except ValueError:
+            return None
+        return ImageQualityGate.measure_gray(thumb, *dimensions)
+
+    @staticmethod
+    def measure_gray(gray: np.ndarray, width: int, height: int) -> QualityReport:
+        """Measurements of an already decoded grayscale image of a `width` x `height` upload."""
+        thumb = gray
+        if max(thumb.shape[:2]) > ImageQualityGate.THUMBNAIL_LONG_SIDE:
+            fit = ImageQualityGate.THUMBNAIL_LONG_SIDE / float(max(thumb.shape[:2]))
+            thumb = cv2.resize(thumb, None, fx=fit, fy=fit, interpolation=cv2.INTER_AREA)
+
+        # Exposure: near-extreme percentiles of the brightness histogram. Tight
+        # enough that a label whose text covers well under 1% of the frame
+        # still registers its ink as the dark end.
+        histogram = cv2.calcHist([thumb], [0], None, [256], [0, 256]).ravel()
+        cumulative = np.cumsum(histogram) / max(1.0, float(histogram.sum()))
+        dark_level = int(np.searchsorted(cumulative, ImageQualityGate.EXPOSURE_PERCENTILE))
+        bright_level = int(np.searchsorted(cumulative, 1.0 - ImageQualityGate.EXPOSURE_PERCENTILE))
+
+        sharpness = float(cv2.Laplacian(thumb, cv2.CV_64F).var())
+
+        text_height = ImageProcessor.estimate_text_height(thumb)
+        if text_height is not None:
+            text_height *= max(width, height) / float(max(thumb.shape[:2]))
+
+        return QualityReport(
+            width=width,
+            height=height,
+            sharpness=sharpness,
+            dark_level=dark_level,
+            bright_level=bright_level,
+            text_height=text_height,
+        )
+
+    def verdict(self, report: QualityReport) -> Optional[ImageQualityException]:
+        """The first failed check, as the exception to raise, or None."""
+        if min(report.width, report.height) < self.MIN_IMAGE_SIDE:
+            return ImageQualityException(
+                f"Image is only {report.width}x{report.height} px. Upload the original photo, not a thumbnail.",
+                REASON_TOO_SMALL,
+            )
+        # Exposure first: a dark or washed-out frame also looks blurry
+        if report.bright_level < self._dark_level:
+            return ImageQualityException(
+                "Image is too dark to read. Move to better light or turn on the flash.",
+                REASON_TOO_DARK,
+            )
+        if report.dark_level > self._bright_level:
+            return ImageQualityException(
+                "Image is overexposed. Avoid direct flash or glare on the packaging.",
+                REASON_OVEREXPOSED,
+            )
+        if report.bright_level - report.dark_level < self._min_contrast:
+            return ImageQualityException(
+                "Image has too little contrast to separate text from background. Retake it in even light.",
+                REASON_LOW_CONTRAST,
+            )
+        if report.sharpness < self._min_sharpness:
+            return ImageQualityException(
+                "Image is too blurry to read. Hold the camera steady and tap the label to focus.",
+                REASON_BLURRY,
+            )
+        if report.text_height is not None and report.text_height < self._min_text_height:
+            return ImageQualityException(
+                "Text on the image is too small to read. Move the camera closer to the drug name.",
+                REASON_TEXT_TOO_SMALL,
+            )
+        return None
+
+    def check(self, image_bytes: bytes) -> Optional[QualityReport]:
+        """
+        Raises:
+            ImageQualityException: The upload fails a check; `reason` names it.
+        """
+        report = self.measure(image_bytes)
+        if report is None:
+            return None
+        _checked.inc()
+        rejection = self.verdict(report)
+        if rejection is not None:
+            _rejections[rejection.reason].inc()
+            raise rejection
+        return report
@@ -0,0 +1,251 @@
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pytesseract
+
+try:
+    from backend.app.core.config import get_settings
+except ModuleNotFoundError:
+    from app.core.config import get_settings
+from .vocabulary_hints import VocabularyHints
+
+try:
+    import tesserocr
+except ImportError:  # pragma: no cover - optional dependency fallback
+    tesserocr = None
+
+
+@dataclass(frozen=True)
+class OCRWord:
+    """A recognised word and its box in the processed image's pixel space."""
+    text: str
+    left: int
+    top: int
+    width: int
+    height: int
+    confidence: float  # Tesseract word confidence, 0-100
+    line: Tuple[int, int, int]  # (block, paragraph, line) the word belongs to
+
+
+class TesseractEngine(ABC):
+    """
+    Recognizes text from a preprocessed single-channel image.
+    Implementations must be safe to call from multiple OCR worker threads.
+    """
+    name = "abstract"
+
+    @abstractmethod
+    def image_to_string(self, image: np.ndarray, psm: int = 6, hints: Optional[VocabularyHints] = None) -> str:
+        """Plain text; `hints` bias recognition toward a drug vocabulary."""
+        pass
+
+    @abstractmethod
+    def image_to_data(self, image: np.ndarray, psm: int = 6) -> List[OCRWord]:
+        """Word-level recognition with bounding boxes, in reading order."""
+        pass
+
+
+class PytesseractEngine(TesseractEngine):
+    """
+    Fallback engine: one `tesseract` subprocess (and temp file) per image.
+    Always available whenever the binary is installed.
+    """
+    name = "pytesseract"
+
+    def __init__(self, language: str) -> None:
+        self._language = language
+
+    def image_to_string(self, image: np.ndarray, psm: int = 6, hints: Optional[VocabularyHints] = None) -> str:
+        config = f"--psm {psm}"
+        if hints is not None:
+            config = f"{config} {hints.tesseract_config()}"
+        return pytesseract.image_to_string(image, config=config, lang=self._language)
+
+    def image_to_data(self, image: np.ndarray, psm: int = 6) -> List[OCRWord]:
+        data = pytesseract.image_to_data(
+            image, config=f"--psm {psm}", lang=self._language, output_type=pytesseract.Output.DICT
+        )
+        words = []
+        for index, text in enumerate(data["text"]):
+            if not str(text).strip():
+                continue
+            words.append(OCRWord(
+                text=str(text),
+                left=int(data["left"][index]),
+                top=int(data["top"][index]),
+                width=int(data["width"][index]),
+                height=int(data["height"][index]),
+                confidence=float(data["conf"][index]),
+                line=(int(data["block_num"][index]), int(data["par_num"][index]), int(data["line_num"][index])),
+            ))
+        return words
+
+
+class TesserocrPoolEngine(TesseractEngine):
+    """
+    In-process engine backed by the Tesseract C API (tesserocr).
+
+    Each OCR worker thread lazily initialises one PyTessBaseAPI handle and
+    keeps it for its lifetime, so the language model is loaded once per
+    thread instead of once per image. Handles are not thread-safe, hence the
+    per-thread pool rather than a shared instance.
+
+    User words and patterns can only be set when a handle is initialised, so
+    hinted recognition uses a second per-thread handle, rebuilt when the
+    vocabulary version changes.
+    """
+    name = "tesserocr"
+
+    def __init__(self, language: str, tessdata_path: Optional[str] = None) -> None:
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed.")
+        self._language = language
+        self._tessdata_path = tessdata_path
+        self._local = threading.local()
+        self._handles: List[object] = []
+        self._handles_lock = threading.Lock()
+
+    def _new_api(self, variables: Optional[dict] = None):
+        kwargs = {"lang": self._language}
+        if self._tessdata_path:
+            kwargs["path"] = self._tessdata_path
+        if variables:
+            kwargs["variables"] = variables
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        with self._handles_lock:
+            self._handles.append(api)
+        return api
+
+    def _thread_api(self, hints: Optional[VocabularyHints] = None):
+        if hints is not None:
+            return self._hinted_api(hints)
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = self._new_api()
+            self._local.api = api
+        return api
+
+    def _hinted_api(self, hints: VocabularyHints):
+        api = getattr(self._local, "hinted_api", None)
+        if api is not None and self._local.hinted_version != hints.version:
+            with self._handles_lock:
+                self._handles.remove(api)
+            api.End()
+            api = None
+        if api is None:
+            api = self._new_api(hints.tesseract_variables())
+            self._local.hinted_api = api
+            self._local.hinted_version = hints.version
+        return api
+
+    def warm(self) -> None:
+        """Initialises the calling thread's handle ahead of its first image."""
+        self._thread_api()
+
+    def _set_image(self, image: np.ndarray, psm: int, hints: Optional[VocabularyHints] = None):
+        api = self._thread_api(hints)
+        pixels = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = pixels.shape[:2]
+        api.SetPageSegMode(psm)
+        api.SetImageBytes(pixels.tobytes(), width, height, 1, width)
+        return api
+
+    def image_to_string(self, image: np.ndarray, psm: int = 6, hints: Optional[VocabularyHints] = None) -> str:
+        api = self._set_image(image, psm, hints)
+        try:
+            return api.GetUTF8Text()
+        finally:
+            # Drop the image and recognition results but keep the loaded model
+            api.Clear()
+
+    def image_to_data(self, image: np.ndarray, psm: int = 6) -> List[OCRWord]:
+        api = self._set_image(image, psm)
+        try:
+            api.Recognize()
+            words = []
+            block = paragraph = line = 0
+            iterator = api.GetIterator()
+            for word in tesserocr.iterate_level(iterator, tesserocr.RIL.WORD):
+                if word.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                    block, paragraph, line = block + 1, 0, 0
+                if word.IsAtBeginningOf(tesserocr.RIL.PARA):
+                    paragraph, line = paragraph + 1, 0
+                if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line += 1
+                text = word.GetUTF8Text(tesserocr.RIL.WORD)
+                box = word.BoundingBox(tesserocr.RIL.WORD)
+                if not text or not text.strip() or box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                words.append(OCRWord(
+                    text=text,
+                    left=x1,
+                    top=y1,
+                    width=x2 - x1,
+                    height=y2 - y1,
+                    confidence=float(word.Confidence(tesserocr.RIL.WORD)),
+                    line=(block, paragraph, line),
+                ))
+            return words
+        finally:
+            api.Clear()
+
+    @property
+    def pool_size(self) -> int:
+        with self._handles_lock:
+            return len(self._handles)
+
+    def close(self) -> None:
+        with self._handles_lock:
+            for api in self._handles:
+                api.End()
+            self._handles.clear()
+        self._local = threading.local()
+
+
+def build_tesseract_engine(
+    engine: str, language: str, tesseract_cmd: str = "", tessdata_path: Optional[str] = None
+) -> TesseractEngine:
+    """
+    Selects the OCR backend. "auto" prefers the in-process pool and falls
+    back to pytesseract when tesserocr is not installed or fails to load.
+    """
+    if tesseract_cmd:
+        # Honor explicit binary path from env (useful on macOS/Homebrew).
+        # Also used by the pytesseract-based runtime status checks.
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    if engine in ("auto", "tesserocr") and tesserocr is not None:
+        try:
+            pool = TesserocrPoolEngine(language=language, tessdata_path=tessdata_path)
+            # Fail fast on missing language data; the handle stays with this thread
+            pool.warm()
+            return pool
+        except Exception:
+            if engine == "tesserocr":
+                raise
+    elif engine == "tesserocr":
+        raise RuntimeError("OCR_ENGINE=tesserocr requested, but tesserocr is not installed.")
+    return PytesseractEngine(language=language)
+
+
+_engine_singleton: Optional[TesseractEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_tesseract_engine() -> TesseractEngine:
+    global _engine_singleton
+    if _engine_singleton is None:
+        with _engine_lock:
+            if _engine_singleton is None:
+                settings = get_settings()
+                _engine_singleton = build_tesseract_engine(
+                    engine=settings.ocr_engine,
+                    language=settings.ocr_language,
+                    tesseract_cmd=settings.tesseract_cmd,
+                    tessdata_path=settings.tessdata_path or None,
+                )
+    return _engine_singleton
@@ -0,0 +1,142 @@
+import os
+import shlex
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .drug_matcher import vocabulary_version
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "medgraph-ocr-vocabulary")
+
+# Tesseract user-patterns for strengths printed next to drug names
+# (\d digit, \* repeat the previous class zero or more times)
+STRENGTH_PATTERNS = (
+    r"\d\d\*MG",
+    r"\d\d\*.\d\d\*MG",
+    r"\d\d\*MCG",
+    r"\d\d\*ML",
+    r"\d\d\*IU",
+    r"\d\d\*%",
+)
+
+# Characters packs print around the name besides the vocabulary's own:
+# strengths ("2.5MG", "5%"), combinations ("A/B") and hyphenated names
+BASE_WHITELIST = "0123456789ACGILMUacgilmu.-/%"
+
+WORDS_FILE = "user-words"
+PATTERNS_FILE = "user-patterns"
+WHITELIST_FILE = "whitelist"
+
+
+@dataclass(frozen=True)
+class VocabularyHints:
+    """
+    Compiled Tesseract hints for one drug vocabulary: a user-words file of
+    the catalogue's name tokens, a user-patterns file of strength formats,
+    and a character whitelist limited to what those can contain.
+    """
+    version: str
+    words_path: str
+    patterns_path: str
+    whitelist: str
+
+    def tesseract_config(self) -> str:
+        """Command-line options for the `tesseract` binary (pytesseract)."""
+        return (
+            f"--user-words {shlex.quote(self.words_path)} "
+            f"--user-patterns {shlex.quote(self.patterns_path)} "
+            f"-c tessedit_char_whitelist={shlex.quote(self.whitelist)}"
+        )
+
+    def tesseract_variables(self) -> Dict[str, str]:
+        """Init-time variables for a Tesseract API handle (tesserocr)."""
+        return {
+            "user_words_file": self.words_path,
+            "user_patterns_file": self.patterns_path,
+            "tessedit_char_whitelist": self.whitelist,
+        }
+
+
+def _name_tokens(known_drugs: List[str]) -> List[str]:
+    tokens = set()
+    for name in known_drugs:
+        for token in name.split():
+            # Packs print names in capitals or title case
+            tokens.add(token.upper())
+            tokens.add(token.capitalize())
+    return sorted(tokens)
+
+
+def _whitelist(tokens: List[str]) -> str:
+    characters = set(BASE_WHITELIST)
+    for token in tokens:
+        characters.update(token)
+    characters.discard("\\")
+    return "".join(sorted(characters))
+
+
+def _write_atomic(path: str, content: str) -> None:
+    # Concurrent workers may compile the same version; the last rename wins
+    # and every reader sees a complete file
+    handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def compile_vocabulary_hints(known_drugs: List[str], version: str, cache_dir: str) -> VocabularyHints:
+    """
+    Hints for `known_drugs`, read from `cache_dir/<version>/` when a previous
+    run (or another worker) already compiled them, written there otherwise.
+    """
+    directory = os.path.join(cache_dir, version)
+    words_path = os.path.join(directory, WORDS_FILE)
+    patterns_path = os.path.join(directory, PATTERNS_FILE)
+    whitelist_path = os.path.join(directory, WHITELIST_FILE)
+
+    try:
+        # The whitelist is written last, so its presence marks a complete set
+        with open(whitelist_path, encoding="utf-8") as whitelist_file:
+            whitelist = whitelist_file.read()
+    except FileNotFoundError:
+        os.makedirs(directory, exist_ok=True)
+        tokens = _name_tokens(known_drugs)
+        whitelist = _whitelist(tokens)
+        _write_atomic(words_path, "".join(f"{token}\n" for token in tokens))
+        _write_atomic(patterns_path, "".join(f"{pattern}\n" for pattern in STRENGTH_PATTERNS))
+        _write_atomic(whitelist_path, whitelist)
+
+    return VocabularyHints(
+        version=version, words_path=words_path, patterns_path=patterns_path, whitelist=whitelist
+    )
+
+
+# Vocabulary versions kept in memory; the catalogue rarely has more than
+# one live version outside a rollout
+MAX_CACHED_VERSIONS = 4
+
+_hints: "OrderedDict[str, VocabularyHints]" = OrderedDict()
+_hints_lock = threading.Lock()
+
+
+def get_vocabulary_hints(
+    known_drugs: List[str], version: Optional[str] = None, cache_dir: str = ""
+) -> VocabularyHints:
+    """Hints for a vocabulary, compiled once per version and process."""
+    version = version or vocabulary_version(known_drugs)
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    with _hints_lock:
+        hints = _hints.get(version)
+        if hints is None or os.path.dirname(hints.words_path) != os.path.join(cache_dir, version):
+            hints = compile_vocabulary_hints(known_drugs, version, cache_dir)
+            _hints[version] = hints
+            while len(_hints) > MAX_CACHED_VERSIONS:
+                _hints.popitem(last=False)
+        _hints.move_to_end(version)
+    return hints
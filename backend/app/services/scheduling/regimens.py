@@ -0,0 +1,149 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.services.interactions.interaction_engine import InteractionRecord
+from app.services.scheduling.schedule_optimizer import MedicationDosage, ScheduleOptimizer
+
+
+class PeriodicRegimen(BaseModel):
+    """
+    Compact multi-day regimen: a per-day dose pattern anchored at `start_date`.
+
+    Examples:
+        Alternate days:  daily_pattern=[1, 0]
+        Weekly:          daily_pattern=[1, 0, 0, 0, 0, 0, 0]
+        Taper 3-2-1:     daily_pattern=[3, 3, 3, 2, 2, 2, 1, 1, 1], repeat=False
+    """
+    drug_name: str
+    daily_pattern: List[int] = Field(min_length=1)  # Doses on each day of the period
+    start_date: date
+    end_date: Optional[date] = None  # Inclusive; open-ended when omitted
+    repeat: bool = True  # False plays the pattern once (e.g. tapering courses)
+
+    @field_validator("daily_pattern")
+    @classmethod
+    def _non_negative(cls, pattern: List[int]) -> List[int]:
+        if any(doses < 0 for doses in pattern):
+            raise ValueError("daily_pattern entries must be non-negative dose counts.")
+        max_doses = ScheduleOptimizer.max_daily_doses()
+        if any(doses > max_doses for doses in pattern):
+            raise ValueError(
+                f"daily_pattern entries cannot exceed {max_doses} doses: the daily timeline has no "
+                f"more slots {ScheduleOptimizer.SAME_DRUG_MIN_GAP_HOURS}h apart."
+            )
+        return pattern
+
+    @classmethod
+    def from_dosage(cls, dosage: MedicationDosage, start_date: date) -> "PeriodicRegimen":
+        """Lifts a plain doses-per-day prescription into a 1-day period."""
+        return cls(drug_name=dosage.drug_name, daily_pattern=[dosage.frequency], start_date=start_date)
+
+    @property
+    def period_days(self) -> int:
+        return len(self.daily_pattern)
+
+    def doses_on(self, day: date) -> int:
+        """Number of doses due on `day` (0 outside the regimen's active window)."""
+        if day < self.start_date or (self.end_date is not None and day > self.end_date):
+            return 0
+        offset = (day - self.start_date).days
+        if not self.repeat and offset >= self.period_days:
+            return 0
+        return self.daily_pattern[offset % self.period_days]
+
+
+@dataclass(frozen=True)
+class DoseEvent:
+    """
+    A single concrete, timezone-aware dose.
+
+    A dose the optimizer could not place (interaction separation windows
+    leave no safe slot) is still reported, with `placed=False`, a
+    `warning`, and `scheduled_at` at the start of its day, so reminder
+    and adherence feeds never drop it silently.
+    """
+    drug_name: str
+    scheduled_at: datetime
+    placed: bool = True
+    warning: Optional[str] = None
+
+
+def iter_dose_events(
+    regimens: List[PeriodicRegimen],
+    interactions: List[InteractionRecord],
+    start: date,
+    end: date,
+    tz: str = "UTC",
+    optimizer: Optional[ScheduleOptimizer] = None,
+) -> Iterator[DoseEvent]:
+    """
+    Lazily materialises dose events for every day in [start, end].
+
+    Each day is reduced to the plain doses-per-day problem the optimizer
+    already solves. Days with the same active dose counts share one solved
+    timeline, so months of events cost one optimizer call per distinct day
+    shape and O(1) memory per yielded event.
+
+    Args:
+        regimens: Periodic regimens for one patient.
+        interactions: Interaction constraints between the prescribed drugs.
+        start: First calendar day (inclusive).
+        end: Last calendar day (inclusive).
+        tz: IANA timezone the slot times are local to.
+        optimizer: Optional pre-configured optimizer (e.g. with a solution cache).
+
+    Yields:
+        DoseEvent objects in chronological order; a day's unplaced doses
+        come first, stamped at midnight.
+    """
+    zone = ZoneInfo(tz)
+    optimizer = optimizer or ScheduleOptimizer()
+    day_timelines: Dict[Tuple[Tuple[str, int], ...], List[Tuple[time, List[str]]]] = {}
+    day_unplaced: Dict[Tuple[Tuple[str, int], ...], List[str]] = {}
+
+    day = start
+    while day <= end:
+        active = tuple(sorted(
+            (regimen.drug_name.upper(), doses)
+            for regimen in regimens
+            if (doses := regimen.doses_on(day)) > 0
+        ))
+
+        if active:
+            if active not in day_timelines:
+                result = optimizer.generate_schedule(
+                    [MedicationDosage(drug_name=name, frequency=doses) for name, doses in active],
+                    interactions,
+                )
+                day_timelines[active] = [
+                    (time.fromisoformat(entry["time"]), entry["medications"])
+                    for entry in result["schedule"]
+                ]
+                # Whatever the timeline is short of could not be placed
+                placed = Counter(name for _, medications in day_timelines[active] for name in medications)
+                day_unplaced[active] = [
+                    name for name, doses in active for _ in range(doses - placed[name])
+                ]
+
+            for drug_name in day_unplaced[active]:
+                yield DoseEvent(
+                    drug_name=drug_name,
+                    scheduled_at=datetime.combine(day, time.min, tzinfo=zone),
+                    placed=False,
+                    warning=(
+                        f"No safe time slot for this dose of '{drug_name}': it violates interaction "
+                        "separation windows. Please consult a physician to adjust the regimen."
+                    ),
+                )
+
+            for slot_time, medications in day_timelines[active]:
+                scheduled_at = datetime.combine(day, slot_time, tzinfo=zone)
+                for drug_name in medications:
+                    yield DoseEvent(drug_name=drug_name, scheduled_at=scheduled_at)
+
+        day += timedelta(days=1)
@@ -1,7 +1,12 @@
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Hashable, Optional
 from pydantic import BaseModel
 from collections import defaultdict
 from app.services.interactions.interaction_engine import InteractionRecord, SeverityLevel
+from app.services.scheduling.solution_cache import (
+    ScheduleShape,
+    ScheduleSolutionCache,
+    canonicalize_schedule_problem,
+)
 
 class MedicationDosage(BaseModel):
     """Data Transfer Object representing a medication to be scheduled and its required frequency."""
@@ -20,6 +25,9 @@ class ScheduleOptimizer:
     # 8 discrete 2-hour slots representing a typical 16-hour waking day
     # (08:00 to 22:00)
     AVAILABLE_SLOTS = [8, 10, 12, 14, 16, 18, 20, 22]
+
+    # Minimum spacing (in hours) between two doses of the same medication
+    SAME_DRUG_MIN_GAP_HOURS = 4
     
     # Required temporal separation (in hours) based on interaction severity
     SEPARATION_CONSTRAINTS = {
@@ -29,6 +37,22 @@ class ScheduleOptimizer:
         SeverityLevel.CONTRAINDICATED: 24 # Cannot be scheduled on the same day safely
     }
 
+    def __init__(self, solution_cache: Optional[ScheduleSolutionCache] = None):
+        """
+        Inject an optional solution cache (see solution_cache.py). Without one,
+        every call solves its canonical shape from scratch.
+        """
+        self.solution_cache = solution_cache
+
+    @classmethod
+    def max_daily_doses(cls) -> int:
+        """Most doses of one medication that fit in a day under the same-drug spacing rule."""
+        doses, last_slot = 0, None
+        for slot in sorted(cls.AVAILABLE_SLOTS):
+            if last_slot is None or slot - last_slot >= cls.SAME_DRUG_MIN_GAP_HOURS:
+                doses, last_slot = doses + 1, slot
+        return doses
+
     def _build_constraint_graph(self, interactions: List[InteractionRecord]) -> Dict[str, Dict[str, int]]:
         """
         Maps DrugA -> DrugB -> Minimum Required Separation Hours.
@@ -46,39 +70,19 @@ class ScheduleOptimizer:
                 
         return constraint_map
 
-    def generate_schedule(
-        self, 
-        dosages: List[MedicationDosage], 
-        interactions: List[InteractionRecord]
-    ) -> Dict[str, Any]:
+    def _assign_slots(
+        self,
+        pills_to_schedule: List[Hashable],
+        constraint_map: Dict[Hashable, Dict[Hashable, int]]
+    ) -> Tuple[Dict[int, List[Hashable]], List[Hashable]]:
         """
-        Calculates the optimized conflict-free daily timeline.
-        
-        Args:
-            dosages: List of prescribed drugs and their daily frequencies.
-            interactions: List of exact db constraints for this specific drug combination.
-            
-        Returns:
-            JSON-serializable Schedule payload and explicit constraint notes.
+        Greedy constraint-based router. Places pills in order and returns the
+        slot assignment plus every pill that could not be placed.
         """
-        constraint_map = self._build_constraint_graph(interactions)
-        
-        # Flatten the dosages into individual pills that need mapping
-        # e.g., Aspirin (fre=2) -> ['ASPIRIN', 'ASPIRIN']
-        pills_to_schedule = []
-        for dosage in dosages:
-            pills_to_schedule.extend([dosage.drug_name.upper()] * dosage.frequency)
-            
-        # We want to schedule the "hardest" medications first.
-        # Heuristic: sort by the number of constraint edges they have in the graph.
-        pills_to_schedule.sort(key=lambda d: len(constraint_map.get(d, {})), reverse=True)
-        
-        # Final timeline representation: SlotTime -> List[DrugNames]
-        schedule_slots: Dict[int, List[str]] = {slot: [] for slot in self.AVAILABLE_SLOTS}
-        
-        notes = []
-        
-        # Greedy Constraint-Based Router
+        # Final timeline representation: SlotTime -> List[Drugs]
+        schedule_slots: Dict[int, List[Hashable]] = {slot: [] for slot in self.AVAILABLE_SLOTS}
+        unplaced = []
+
         for pill in pills_to_schedule:
             placed = False
             
@@ -95,7 +99,7 @@ class ScheduleOptimizer:
                 same_drug_gap_violation = False
                 for check_slot, placed_drugs in schedule_slots.items():
                     if pill in placed_drugs:
-                        if abs(check_slot - slot) < 4:
+                        if abs(check_slot - slot) < self.SAME_DRUG_MIN_GAP_HOURS:
                             same_drug_gap_violation = True
                             break
                 if same_drug_gap_violation:
@@ -123,7 +127,76 @@ class ScheduleOptimizer:
                     break # Move to next pill
             
             if not placed:
-                notes.append(f"WARNING: Insufficient safe time slots to schedule '{pill}'. It violates rigid interaction separation windows or frequency caps. Please consult a physician to adjust dosage.")
+                unplaced.append(pill)
+
+        return schedule_slots, unplaced
+
+    def solve_shape(self, shape: ScheduleShape) -> Dict[str, Any]:
+        """
+        Solves a canonical problem where drugs are identified by position only.
+
+        Returns:
+            JSON-serializable solution: occupied slots with the canonical drug
+            indices placed in them, and the indices of unplaceable doses.
+        """
+        constraint_map: Dict[Hashable, Dict[Hashable, int]] = defaultdict(dict)
+        for index_a, index_b, required_gap in shape.separations:
+            constraint_map[index_a][index_b] = required_gap
+            constraint_map[index_b][index_a] = required_gap
+
+        # Flatten the dosages into individual pills that need mapping
+        # e.g., drug 0 (freq=2) -> [0, 0]
+        pills_to_schedule = []
+        for index, frequency in enumerate(shape.frequencies):
+            pills_to_schedule.extend([index] * frequency)
+            
+        # We want to schedule the "hardest" medications first.
+        # Heuristic: sort by the number of constraint edges they have in the graph.
+        pills_to_schedule.sort(key=lambda d: len(constraint_map.get(d, {})), reverse=True)
+
+        schedule_slots, unplaced = self._assign_slots(pills_to_schedule, constraint_map)
+        return {
+            "slots": [[slot, drugs] for slot, drugs in sorted(schedule_slots.items()) if drugs],
+            "unplaced": unplaced,
+        }
+
+    def generate_schedule(
+        self, 
+        dosages: List[MedicationDosage], 
+        interactions: List[InteractionRecord]
+    ) -> Dict[str, Any]:
+        """
+        Calculates the optimized conflict-free daily timeline.
+
+        The problem is reduced to its drug-name-free canonical shape first, so
+        regimens that differ only in drug names share one cached solution,
+        relabelled with this request's drug names.
+        
+        Args:
+            dosages: List of prescribed drugs and their daily frequencies.
+            interactions: List of exact db constraints for this specific drug combination.
+            
+        Returns:
+            JSON-serializable Schedule payload and explicit constraint notes.
+        """
+        constraint_map = self._build_constraint_graph(interactions)
+        shape, drug_labels = canonicalize_schedule_problem(dosages, constraint_map)
+
+        solution = self.solution_cache.get(shape) if self.solution_cache else None
+        if solution is None:
+            solution = self.solve_shape(shape)
+            if self.solution_cache:
+                self.solution_cache.set(shape, solution)
+
+        # Relabel canonical positions with this request's drug names
+        schedule_slots: Dict[int, List[str]] = {slot: [] for slot in self.AVAILABLE_SLOTS}
+        for slot, drug_indices in solution["slots"]:
+            schedule_slots[int(slot)] = [drug_labels[index] for index in drug_indices]
+
+        notes = []
+        for index in solution["unplaced"]:
+            pill = drug_labels[index]
+            notes.append(f"WARNING: Insufficient safe time slots to schedule '{pill}'. It violates rigid interaction separation windows or frequency caps. Please consult a physician to adjust dosage.")
         
         # Format the timeline output for the API contract
         formatted_schedule = []
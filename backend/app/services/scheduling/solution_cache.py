@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+
+@dataclass(frozen=True)
+class ScheduleShape:
+    """
+    Drug-name-free form of a scheduling problem.
+
+    Position ``i`` stands for the i-th drug in canonical order. Regimens that
+    differ only in drug names (e.g. "two BID drugs 4h apart plus one QD",
+    listed in corresponding order) produce the same shape, so a solution
+    computed for one can be relabelled for the other. This is not a full
+    isomorphism test: see canonicalize_schedule_problem.
+    """
+    frequencies: Tuple[int, ...]
+    separations: Tuple[Tuple[int, int, int], ...]  # (i, j, required_gap_hours), i < j
+
+
+def _encode(
+    order: Sequence[str],
+    frequencies: Mapping[str, int],
+    gaps: Mapping[str, Mapping[str, int]],
+) -> ScheduleShape:
+    position = {name: index for index, name in enumerate(order)}
+    separations = sorted(
+        (position[a], position[b], gap)
+        for a in order
+        for b, gap in gaps[a].items()
+        if position[a] < position[b]
+    )
+    return ScheduleShape(
+        frequencies=tuple(frequencies[name] for name in order),
+        separations=tuple(separations),
+    )
+
+
+def canonicalize_schedule_problem(
+    dosages: Sequence[Any],
+    constraint_map: Mapping[str, Mapping[str, int]],
+) -> Tuple[ScheduleShape, List[str]]:
+    """
+    Reduces a regimen to its canonical shape.
+
+    Drugs are grouped by colour refinement over (frequency, separation
+    neighbourhood) and ordered by class, with ties inside a class broken by
+    input order. Only separations between prescribed drugs with a positive
+    gap take part, since nothing else affects slot placement.
+
+    Ties are not searched for the smallest encoding: that is factorial in
+    the class size and costs more than solving the problem. Isomorphic
+    regimens listed in a different order may therefore get different keys.
+
+    Returns:
+        The shape and the drug names in canonical order (the relabelling table).
+    """
+    frequencies: Dict[str, int] = {}
+    for dosage in dosages:
+        name = dosage.drug_name.upper()
+        frequencies[name] = frequencies.get(name, 0) + dosage.frequency
+    # Dicts keep first-appearance order, which serves as the tiebreak
+    names = [name for name, frequency in frequencies.items() if frequency > 0]
+    input_index = {name: index for index, name in enumerate(names)}
+    frequencies = {name: frequencies[name] for name in names}
+
+    gaps: Dict[str, Dict[str, int]] = {
+        name: {
+            other: gap
+            for other, gap in constraint_map.get(name, {}).items()
+            if other in frequencies and other != name and gap > 0
+        }
+        for name in names
+    }
+
+    if not any(gaps.values()):
+        # Without separations the frequency alone is the class; sorted() is
+        # stable, so ties keep input order as in the refined case below
+        order = sorted(names, key=frequencies.__getitem__)
+        return _encode(order, frequencies, gaps), order
+
+    # Colour refinement until the partition stops splitting
+    colours = {name: (frequencies[name],) for name in names}
+    while True:
+        signatures = {
+            name: (colours[name], tuple(sorted((gap, colours[other]) for other, gap in gaps[name].items())))
+            for name in names
+        }
+        ranking = {signature: rank for rank, signature in enumerate(sorted(set(signatures.values())))}
+        refined = {name: (ranking[signatures[name]],) for name in names}
+        if len(set(refined.values())) == len(set(colours.values())):
+            colours = refined
+            break
+        colours = refined
+
+    order = sorted(names, key=lambda name: (colours[name], input_index[name]))
+    return _encode(order, frequencies, gaps), order
+
+
+class ScheduleSolutionCache:
+    """
+    Bounded in-process LRU of solved schedule shapes.
+
+    Solutions are stored by canonical position, never by drug name. There
+    is deliberately no shared (Redis) layer: a round trip costs more than
+    solving a shape.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = capacity
+        self._solutions: "OrderedDict[ScheduleShape, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, shape: ScheduleShape) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            solution = self._solutions.get(shape)
+            if solution is not None:
+                self._solutions.move_to_end(shape)
+            return solution
+
+    def set(self, shape: ScheduleShape, solution: Dict[str, Any]) -> None:
+        with self._lock:
+            self._solutions[shape] = solution
+            self._solutions.move_to_end(shape)
+            while len(self._solutions) > self._capacity:
+                self._solutions.popitem(last=False)
+
+
+_solution_cache_singleton: ScheduleSolutionCache | None = None
+
+
+def get_schedule_solution_cache() -> ScheduleSolutionCache:
+    global _solution_cache_singleton
+    if _solution_cache_singleton is None:
+        _solution_cache_singleton = ScheduleSolutionCache()
+    return _solution_cache_singleton
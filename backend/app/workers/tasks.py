@@ -1,15 +1,36 @@
 from __future__ import annotations
 
-import base64
 from typing import Any
 
+from app.infrastructure.cache.cache import get_cache_client
+from app.infrastructure.storage.blob_spool import get_blob_spool
 from app.services.interactions.interaction_engine import InteractionEngine
 from app.services.interactions.models import InteractionRecord
 from app.services.ocr.ocr_service import OCRService
 from app.services.scheduling.schedule_optimizer import MedicationDosage, ScheduleOptimizer
+from app.services.scheduling.solution_cache import get_schedule_solution_cache
 from app.workers.celery_app import celery_app
 
 
+def _extract_spooled_drug(blob_key: str, vocabulary: str) -> dict[str, Any]:
+    # The message carries references only; image and vocabulary come
+    # from the shared blob spool (BlobNotFoundError is not retried)
+    spool = get_blob_spool()
+    known_drugs = spool.load_vocabulary(vocabulary)
+    service = OCRService(cache=get_cache_client())
+    try:
+        with spool.open(blob_key) as image_bytes:
+            result = service.extract_drug(image_bytes, known_drugs)
+    except RuntimeError:
+        # Retried against the same blob; the TTL sweep removes it after the last attempt
+        raise
+    except Exception:
+        spool.delete(blob_key)
+        raise
+    spool.delete(blob_key)
+    return result
+
+
 if celery_app is None:
     # Keep import path stable even when celery is disabled/unavailable.
     def _task_stub(*_args: Any, **_kwargs: Any) -> Any:
@@ -28,10 +49,8 @@ else:
         retry_jitter=True,
         max_retries=3,
     )
-    def extract_drug_task(self, image_b64: str, known_drugs: list[str]) -> dict[str, Any]:
-        image_bytes = base64.b64decode(image_b64.encode("utf-8"))
-        service = OCRService()
-        return service._execute_sync_pipeline(image_bytes, known_drugs)
+    def extract_drug_task(self, blob_key: str, vocabulary: str) -> dict[str, Any]:
+        return _extract_spooled_drug(blob_key, vocabulary)
 
 
     @celery_app.task(
@@ -63,7 +82,7 @@ else:
         dosages: list[dict[str, Any]],
         db_records: list[dict[str, Any]],
     ) -> dict[str, Any]:
-        optimizer = ScheduleOptimizer()
+        optimizer = ScheduleOptimizer(solution_cache=get_schedule_solution_cache())
         parsed_dosages = [MedicationDosage(**row) for row in dosages]
         parsed_records = [InteractionRecord(**record) for record in db_records]
         return optimizer.generate_schedule(parsed_dosages, parsed_records)
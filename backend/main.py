@@ -1,5 +1,7 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
 from dotenv import load_dotenv
 from typing import Any
@@ -29,9 +31,66 @@ def get_ocr_runtime_status_safe() -> dict[str, Any]:
             "message": f"OCR runtime unavailable: {exc}",
         }
 
+def check_database_health_safe() -> bool:
+    try:
+        from backend.app.infrastructure.db.database import check_database_health
+    except ModuleNotFoundError as exc:
+        if exc.name == "backend" or (exc.name and exc.name.startswith("backend.")):
+            from app.infrastructure.db.database import check_database_health
+        else:
+            raise
+    return check_database_health()
+
+
+def check_cache_health_safe() -> bool:
+    try:
+        from backend.app.infrastructure.cache.cache import get_cache_client
+    except ModuleNotFoundError as exc:
+        if exc.name == "backend" or (exc.name and exc.name.startswith("backend.")):
+            from app.infrastructure.cache.cache import get_cache_client
+        else:
+            raise
+    return get_cache_client().ping()
+
+
+def build_health_monitor():
+    try:
+        from backend.app.core.config import get_settings
+        from backend.app.core.health import HealthMonitor
+    except ModuleNotFoundError as exc:
+        if exc.name == "backend" or (exc.name and exc.name.startswith("backend.")):
+            from app.core.config import get_settings
+            from app.core.health import HealthMonitor
+        else:
+            raise
+    settings = get_settings()
+    return HealthMonitor(
+        probes={
+            "ocr": get_ocr_runtime_status_safe,
+            "database": check_database_health_safe,
+            "cache": check_cache_health_safe,
+        },
+        interval_seconds=settings.health_refresh_interval_seconds,
+        timeout_seconds=settings.health_probe_timeout_seconds,
+        optional=() if settings.ocr_required_for_readiness else ("ocr",),
+    )
+
 load_dotenv()
 
-app = FastAPI(title="MedGraph.AI API", version="1.0.0")
+# Probes run in the background; health endpoints only read the latest snapshot
+health_monitor = build_health_monitor()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    health_monitor.start()
+    try:
+        yield
+    finally:
+        health_monitor.stop()
+
+
+app = FastAPI(title="MedGraph.AI API", version="1.0.0", lifespan=lifespan)
 
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
 
@@ -58,14 +117,40 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    ocr_status = get_ocr_runtime_status_safe()
+    snapshot = health_monitor.snapshot()
+    ocr_status = snapshot["ocr"]
     return {
         "status": "healthy",
         "ocr_ready": ocr_status["ready"],
-        "ocr_message": ocr_status["message"],
+        "ocr_message": ocr_status.get("message", ""),
+        "dependencies": {name: status["ready"] for name, status in snapshot.items()},
     }
 
 
 @app.get("/health/ocr")
 def ocr_health_check():
-    return get_ocr_runtime_status_safe()
+    return health_monitor.snapshot()["ocr"]
+
+
+@app.get("/health/ready")
+def readiness_check():
+    snapshot = health_monitor.snapshot()
+    ready = health_monitor.ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "dependencies": snapshot},
+    )
+
+
+@app.get("/metrics")
+def metrics_snapshot():
+    # Services record into app.core.metrics; read that registry whenever the
+    # app root is importable, or a backend.app copy would always be empty
+    try:
+        from app.core.metrics import get_metrics_registry
+    except ModuleNotFoundError as exc:
+        if exc.name == "app" or (exc.name and exc.name.startswith("app.")):
+            from backend.app.core.metrics import get_metrics_registry
+        else:
+            raise
+    return get_metrics_registry().snapshot()
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.ocr.barcode import BarcodeScanner, ProductIndex, normalize_gtin, parse_gs1
+from app.services.ocr.ocr_service import OCRService
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "METFORMIN"]
+
+_EAN_L = ["0001101", "0011001", "0010011", "0111101", "0100011", "0110001", "0101111", "0111011", "0110111", "0001011"]
+_EAN_G = ["0100111", "0110011", "0011011", "0100001", "0011101", "0111001", "0000101", "0010001", "0001001", "0010111"]
+_EAN_R = ["1110010", "1100110", "1101100", "1000010", "1011100", "1001110", "1010000", "1000100", "1001000", "1110100"]
+_EAN_PARITY = ["LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG", "LGGLLG", "LGGGLL", "LGLGLG", "LGLGGL", "LGGLGL"]
+
+
+def _ean13(code, module_px=3, height=120):
+    digits = [int(digit) for digit in code]
+    bits = "101"
+    for position, digit in enumerate(digits[1:7]):
+        bits += (_EAN_L if _EAN_PARITY[digits[0]][position] == "L" else _EAN_G)[digit]
+    bits += "01010" + "".join(_EAN_R[digit] for digit in digits[7:]) + "101"
+    row = np.array([0 if bit == "1" else 255 for bit in bits], dtype=np.uint8)
+    bars = np.repeat(row, module_px)[None, :].repeat(height, axis=0)
+    # White quiet zone, as printed on packs
+    return cv2.copyMakeBorder(bars, 30, 30, 40, 40, cv2.BORDER_CONSTANT, value=255)
+
+
+def _pack_photo(code_img=None):
+    canvas = np.full((600, 900), 235, dtype=np.uint8)
+    cv2.putText(canvas, "WARFARIN 5MG", (60, 150), cv2.FONT_HERSHEY_SIMPLEX, 2, 20, 4)
+    if code_img is not None:
+        h, w = code_img.shape
+        canvas[320:320 + h, 100:100 + w] = code_img
+    return cv2.imencode(".png", canvas)[1].tobytes()
+
+
+@pytest.fixture
+def service(tmp_path):
+    products = tmp_path / "products.csv"
+    products.write_text("gtin,drug_name\n5012345678900,warfarin\n09501101530003,Metformin\n12345,ASPIRIN\n")
+    service = OCRService()
+    service._packaging_index = None
+    service._product_index = ProductIndex.from_csv(str(products))
+    return service
+
+
+def test_gtins_are_check_digit_validated_and_padded():
+    assert normalize_gtin("5012345678900") == "05012345678900"
+    assert normalize_gtin("5012345678901") is None
+    assert normalize_gtin("12345") is None
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "]d2010950110153000317251231101234\x1d21SN9",
+        "(01)09501101530003(17)251231(10)1234",
+        "https://id.gs1.org/01/09501101530003/10/1234",
+    ],
+)
+def test_gs1_payload_forms_yield_the_gtin(payload):
+    fields = parse_gs1(payload)
+
+    assert fields["gtin"] == "09501101530003"
+    if "(17)" in payload or "\x1d" in payload:
+        assert fields["expiry"] == "251231" and fields["batch"] == "1234"
+
+
+def test_scanner_reads_ean13_and_gs1_qr_codes():
+    qr = cv2.QRCodeEncoder.create().encode("010950110153000317251231101234")
+    qr = cv2.resize(qr, None, fx=8, fy=8, interpolation=cv2.INTER_NEAREST)
+    canvas = np.full((700, 900), 235, dtype=np.uint8)
+    ean = _ean13("5012345678900")
+    canvas[20:20 + ean.shape[0], 100:100 + ean.shape[1]] = ean
+    canvas[300:300 + qr.shape[0], 100:100 + qr.shape[1]] = qr
+
+    readings = BarcodeScanner.scan(canvas)
+
+    assert [reading.gtin for reading in readings] == ["05012345678900", "09501101530003"]
+    assert readings[1].fields["expiry"] == "251231"
+
+
+def test_barcode_identifies_the_pack_without_text_ocr(service):
+    with patch.object(service._engine, "image_to_string") as mock_ocr:
+        result = service._execute_sync_pipeline(_pack_photo(_ean13("5012345678900")), KNOWN_DRUGS)
+
+    assert result["matched_drug"] == "WARFARIN"
+    assert result["recognition_source"] == "barcode"
+    assert result["barcode"]["gtin"] == "05012345678900"
+    mock_ocr.assert_not_called()
+
+
+def test_packs_without_a_known_code_fall_through_to_ocr(service):
+    with patch.object(service._engine, "image_to_string", return_value="WARFARIN 5MG") as mock_ocr:
+        result = service._execute_sync_pipeline(_pack_photo(_ean13("5901234123457")), KNOWN_DRUGS)
+
+    assert result["recognition_source"] == "ocr"
+    assert mock_ocr.call_count == 1
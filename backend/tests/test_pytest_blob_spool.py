@@ -0,0 +1,146 @@
+import hashlib
+import os
+import time
+import types
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import rate_limit_dependency
+from app.api.v1 import jobs
+from app.workers import tasks
+from app.infrastructure.storage.blob_spool import BlobNotFoundError, BlobSpool
+from app.services.ocr.drug_matcher import vocabulary_version
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "METFORMIN"]
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return BlobSpool(str(tmp_path), ttl_seconds=3600)
+
+
+def test_blobs_are_content_addressed_and_mapped_read_only(spool):
+    data = bytes(range(256)) * 100
+
+    key = spool.put(memoryview(data))
+
+    assert key == hashlib.sha256(data).hexdigest()
+    assert spool.put(data) == key
+    with spool.open(key) as view:
+        assert view.readonly
+        assert view == data
+        # Decoders read straight from the mapping
+        assert np.frombuffer(view, np.uint8)[1] == 1
+
+
+def test_unknown_and_malformed_keys_are_not_found(spool):
+    with pytest.raises(BlobNotFoundError, match="expired"):
+        with spool.open("0" * 64):
+            pass
+    with pytest.raises(BlobNotFoundError, match="Invalid"):
+        with spool.open("../../etc/passwd"):
+            pass
+
+
+def test_vocabularies_round_trip_by_version(spool, tmp_path):
+    version = spool.put_vocabulary(vocabulary_version(KNOWN_DRUGS), KNOWN_DRUGS)
+
+    assert BlobSpool(str(tmp_path), ttl_seconds=3600).load_vocabulary(version) == KNOWN_DRUGS
+    with pytest.raises(BlobNotFoundError):
+        spool.load_vocabulary(vocabulary_version(["IBUPROFEN"]))
+
+
+def test_prune_removes_only_expired_blobs(spool):
+    old_key = spool.put(b"old upload")
+    new_key = spool.put(b"new upload")
+    old_path = spool._blob_path(old_key)
+    os.utime(old_path, (time.time() - 7200, time.time() - 7200))
+
+    assert spool.prune(time.time() - 3600) == 1
+    assert not os.path.exists(old_path)
+    with spool.open(new_key) as view:
+        assert view == b"new upload"
+
+
+def test_resubmission_racing_a_prune_rewrites_the_blob(spool, monkeypatch):
+    key = spool.put(b"upload")
+    version = spool.put_vocabulary(vocabulary_version(KNOWN_DRUGS), KNOWN_DRUGS)
+    real_utime = os.utime
+
+    def pruned_first(path, *args, **kwargs):
+        # Another process's sweep deletes the file just before the touch
+        if os.path.exists(path):
+            os.unlink(path)
+        return real_utime(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "utime", pruned_first)
+    assert spool.put(b"upload") == key
+    assert spool.put_vocabulary(version, KNOWN_DRUGS) == version
+    monkeypatch.undo()
+
+    with spool.open(key) as view:
+        assert view == b"upload"
+    assert BlobSpool(spool._root, ttl_seconds=3600).load_vocabulary(version) == KNOWN_DRUGS
+
+
+class _StubOCRService:
+    error = None
+
+    def __init__(self, cache=None):
+        pass
+
+    def extract_drug(self, image_bytes, known_drugs):
+        if self.error is not None:
+            raise self.error
+        return {"matched_drug": known_drugs[0], "size": len(image_bytes)}
+
+
+@pytest.mark.parametrize(
+    "error, kept",
+    [(None, False), (ValueError("unreadable"), False), (RuntimeError("tesseract crashed"), True)],
+)
+def test_ocr_job_deletes_its_blob_unless_it_will_retry(spool, monkeypatch, error, kept):
+    key = spool.put(b"PNG-BYTES")
+    version = spool.put_vocabulary(vocabulary_version(KNOWN_DRUGS), KNOWN_DRUGS)
+    monkeypatch.setattr(tasks, "get_blob_spool", lambda: spool)
+    monkeypatch.setattr(tasks, "get_cache_client", lambda: None)
+    monkeypatch.setattr(tasks, "OCRService", type("Service", (_StubOCRService,), {"error": error}))
+
+    if error is None:
+        assert tasks._extract_spooled_drug(key, version) == {"matched_drug": "ASPIRIN", "size": 9}
+    else:
+        with pytest.raises(type(error)):
+            tasks._extract_spooled_drug(key, version)
+
+    assert os.path.exists(spool._blob_path(key)) is kept
+    # Deleting a blob twice is harmless
+    spool.delete(key)
+
+
+def test_ocr_job_message_carries_only_references(spool, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(jobs, "_ensure_job_backend_available", lambda: None)
+    monkeypatch.setattr(jobs, "get_blob_spool", lambda: spool)
+    monkeypatch.setattr(
+        jobs,
+        "extract_drug_task",
+        types.SimpleNamespace(delay=lambda *args: submitted.append(args) or types.SimpleNamespace(id="job-1")),
+    )
+    app = FastAPI()
+    app.include_router(jobs.router)
+    app.dependency_overrides[rate_limit_dependency] = lambda: None
+    app.dependency_overrides[jobs.get_medication_repository] = lambda: KNOWN_DRUGS
+
+    response = TestClient(app).post(
+        "/jobs/ocr/extract-drug", files={"image": ("pack.png", b"PNG-BYTES", "image/png")}
+    )
+
+    assert response.status_code == 202
+    [(blob_key, vocabulary)] = submitted
+    assert vocabulary == vocabulary_version(KNOWN_DRUGS)
+    with spool.open(blob_key) as view:
+        assert view == b"PNG-BYTES"
+    assert spool.load_vocabulary(vocabulary) == KNOWN_DRUGS
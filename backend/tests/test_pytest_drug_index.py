@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+from rapidfuzz import fuzz, process
+
+from app.services.ocr import drug_index, drug_matcher
+from app.services.ocr.drug_index import ConfusionKeyMap, DrugNameIndex, confusion_key, get_drug_name_index
+from app.services.ocr.drug_matcher import DrugMatcher, DrugVocabulary, vocabulary_version
+
+SYLLABLES = ["AM", "OX", "ICI", "LIN", "WAR", "FA", "RIN", "MET", "FOR", "MIN", "PRA", "ZOL", "CEF", "TAN", "SAR"]
+
+
+def _vocabulary(size, seed=3):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < size:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 5))))
+    return sorted(names)
+
+
+def test_index_agrees_with_a_linear_scan_on_misread_names():
+    names = _vocabulary(5000)
+    index = DrugNameIndex(names)
+    rng = random.Random(11)
+
+    for name in rng.sample(names, 50):
+        misread = name.replace("O", "0", 1).replace("I", "1", 1) + " 500 MG"
+        match = index.match(misread, DrugMatcher.MIN_CONFIDENCE_THRESHOLD)
+        _, linear_score, _ = process.extractOne(misread, names, scorer=fuzz.partial_ratio)
+        assert match is not None
+        assert match[1] == linear_score / 100.0
+
+
+def test_match_drug_routes_large_vocabularies_through_the_index(monkeypatch):
+    names = _vocabulary(DrugMatcher.INDEX_MIN_VOCABULARY) + ["CLOPIDOGREL"]
+    built = []
+    monkeypatch.setattr(drug_index, "_index_cache", drug_index.OrderedDict())
+    monkeypatch.setattr(drug_index, "DrugNameIndex", lambda drugs: built.append(1) or DrugNameIndex(drugs))
+
+    # Not confusion-equal to any name, so both go through the fuzzy index
+    assert DrugMatcher.match_drug("CLOPIDOGRAL 75MG", names)[0] == "CLOPIDOGREL"
+    assert DrugMatcher.match_drug("KLOPIDOGREL", names)[0] == "CLOPIDOGREL"
+    # Built once per vocabulary version
+    assert len(built) == 1
+    assert get_drug_name_index(list(names)) is get_drug_name_index(names)
+
+
+def test_match_many_matches_single_queries_and_chunks(monkeypatch):
+    names = _vocabulary(300)
+    queries = [name.replace("A", "4", 1) + " 20MG" for name in names[:40]] + ["ZZZZZZ"]
+    # Force several chunks
+    monkeypatch.setattr(DrugMatcher, "MAX_MATRIX_CELLS", len(names) * 7)
+
+    batched = DrugMatcher.match_many(queries, names)
+    for query, result in zip(queries, batched):
+        single = DrugMatcher.match_drug(query, names)
+        if single is None:
+            assert result == []
+        else:
+            # float32 score matrix
+            assert result[0][0] == single[0]
+            assert result[0][1] == pytest.approx(single[1], abs=1e-6)
+
+    top3 = DrugMatcher.match_many(queries[:5], names, top_k=3)
+    for query, result in zip(queries[:5], top3):
+        assert len(result) == 3
+        assert [score for _, score in result] == sorted((score for _, score in result), reverse=True)
+        assert result[0][0] == DrugMatcher.match_drug(query, names)[0]
+
+
+def test_confusion_normalised_tokens_resolve_without_fuzzy_scoring(monkeypatch):
+    names = ["ASPIRIN", "METFORMIN", "INSULIN GLARGINE", "WARFARIN"]
+    monkeypatch.setattr(
+        "app.services.ocr.drug_matcher.process.extractOne",
+        lambda *args, **kwargs: pytest.fail("fuzzy matching should not run"),
+    )
+
+    assert DrugMatcher.match_drug("ASP1R1N 75 MG", names) == ("ASPIRIN", 1.0)
+    assert DrugMatcher.match_drug("METFORRNIN 500", names) == ("METFORMIN", 1.0)
+    assert DrugMatcher.match_drug("lNSU1IN GLARG1NE 100 UNITS", names) == ("INSULIN GLARGINE", 1.0)
+    # Several drugs named: vocabulary order wins, as with equal fuzzy scores
+    assert DrugMatcher.match_drug("WARFAR1N ASPIRIN", names) == ("ASPIRIN", 1.0)
+
+
+def test_drugs_sharing_a_confusion_key_are_never_exact_hits():
+    index = ConfusionKeyMap(["C0DEINE", "CODEINE", "SOTALOL"])
+
+    assert confusion_key("CODE1NE") == confusion_key("C0DEINE")
+    assert index.lookup("CODE1NE 30MG") is None
+    assert index.lookup("5OTA1OL") == "SOTALOL"
+
+
+def test_loaded_vocabulary_is_hashed_once(monkeypatch):
+    names = _vocabulary(2000)
+    vocabulary = DrugVocabulary(names)
+    assert vocabulary == names
+    assert vocabulary.version == vocabulary_version(names)
+
+    def no_hashing(*args):
+        raise AssertionError("vocabulary hashed per query")
+
+    monkeypatch.setattr(drug_matcher.hashlib, "sha256", no_hashing)
+    misread = names[7].replace("O", "0", 1) + " 500 MG"
+    assert DrugMatcher.match_drug(misread, vocabulary)[0] == names[7]
+    assert get_drug_name_index(vocabulary) is get_drug_name_index(vocabulary)
+
+
+def test_candidates_are_ranked_by_trigram_coverage():
+    index = DrugNameIndex(["AMOXICILLIN", "AMOX", "WARFARIN", "METFORMIN"])
+
+    assert index.candidates("AMOXICILLIN 500MG", limit=2) == [0, 1]
+    assert index.candidates("WARFARIN", limit=1) == [2]
+    assert index.candidates("ZZZZ") == []
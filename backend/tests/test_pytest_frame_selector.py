@@ -0,0 +1,121 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_ocr_service, rate_limit_dependency
+from app.api.v1.ocr import router
+from app.services.ocr.frame_selector import FrameSelector
+from app.services.ocr.ocr_service import OCRService
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "METFORMIN"]
+
+
+def _frame(blur=0.0, background=235, ink=20):
+    img = np.full((300, 900), background, dtype=np.uint8)
+    cv2.putText(img, "WARFARIN 5MG", (30, 180), cv2.FONT_HERSHEY_SIMPLEX, 2, ink, 4)
+    if blur:
+        img = cv2.GaussianBlur(img, (0, 0), blur)
+    return img
+
+
+def _png(img):
+    return cv2.imencode(".png", img)[1].tobytes()
+
+
+def _clip(frames):
+    handle, path = tempfile.mkstemp(suffix=".avi")
+    os.close(handle)
+    try:
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (900, 300))
+        for frame in frames:
+            writer.write(cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
+        writer.release()
+        with open(path, "rb") as clip_file:
+            return clip_file.read()
+    finally:
+        os.unlink(path)
+
+
+@pytest.fixture
+def service():
+    service = OCRService()
+    service._packaging_index = None
+    service._quality_gate = None
+    return service
+
+
+def test_sharp_well_exposed_frames_rank_first():
+    frames = [_png(_frame(blur=3.0)), _png(_frame(background=150, ink=110)), _png(_frame()), b"BROKEN"]
+
+    selected = FrameSelector.select(frames, top=4)
+
+    assert selected[0].index == 2
+    assert selected[-1].index == 3
+    assert selected[0].score > 2 * max(frame.score for frame in selected[1:])
+    assert [frame.index for frame in FrameSelector.select(frames, top=1)] == [2]
+
+
+def test_clip_frames_are_sampled_ranked_and_reencoded():
+    frames = [_frame(blur=4.0)] * 5 + [_frame()] + [_frame(blur=4.0)] * 5
+
+    selected = FrameSelector.select_from_clip(_clip(frames), top=1)
+
+    assert selected[0].index == 5
+    decoded = cv2.imdecode(np.frombuffer(selected[0].image_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+    assert decoded.shape == (300, 900)
+
+
+@pytest.mark.parametrize("total", [23, 35])
+def test_clip_sampling_covers_the_whole_clip(total):
+    # Each frame's brightness encodes its position in the clip
+    frames = [np.full((300, 900), 5 * position, dtype=np.uint8) for position in range(total)]
+
+    sampled = FrameSelector._clip_frames(_clip(frames), max_frames=12)
+
+    positions = [round(float(frame.mean()) / 5) for frame in sampled]
+    assert len(positions) == 12
+    assert positions[0] == 0 and positions[-1] == total - 1
+    assert max(np.diff(positions)) <= -(-(total - 1) // 11)
+
+
+@pytest.mark.asyncio
+async def test_only_the_best_frame_is_ocrd_when_it_matches(service):
+    frames = [_png(_frame(blur=3.0)), _png(_frame()), _png(_frame(blur=5.0))]
+
+    with patch.object(service._engine, "image_to_string", return_value="WARFARIN 5MG") as mock_ocr:
+        result = await service.extract_drug_from_burst(frames, KNOWN_DRUGS)
+
+    assert result["matched_drug"] == "WARFARIN"
+    assert result["frame_index"] == 1
+    assert mock_ocr.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_runner_up_frame_is_tried_when_the_best_fails(service):
+    frames = [_png(_frame(blur=3.0)), _png(_frame())]
+
+    # Best frame: both cascade tiers read nothing; runner-up: a match
+    with patch.object(service._engine, "image_to_string", side_effect=["", "", "WARFARIN 5MG"]):
+        result = await service.extract_drug_from_burst(frames, KNOWN_DRUGS)
+
+    assert result["frame_index"] == 0
+
+
+def test_burst_endpoint_rejects_mixed_clip_and_oversized_bursts():
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_ocr_service] = lambda: OCRService()
+    app.dependency_overrides[rate_limit_dependency] = lambda: None
+    client = TestClient(app)
+
+    too_many = [("frames", (f"{i}.png", b"x", "image/png")) for i in range(13)]
+    assert client.post("/ocr/extract-drug/burst", files=too_many).status_code == 400
+
+    clip_and_still = [("frames", ("a.mp4", b"x", "video/mp4")), ("frames", ("b.png", b"x", "image/png"))]
+    assert client.post("/ocr/extract-drug/burst", files=clip_and_still).status_code == 415
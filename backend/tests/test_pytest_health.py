@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+from app.core.health import HealthMonitor
+
+
+@pytest.fixture
+def monitors():
+    created = []
+    yield created
+    for monitor in created:
+        monitor.stop()
+
+
+def _monitor(monitors, probes, timeout=1.0, **kwargs):
+    monitor = HealthMonitor(probes, interval_seconds=60, timeout_seconds=timeout, **kwargs)
+    monitors.append(monitor)
+    return monitor
+
+
+def test_probes_run_concurrently_and_snapshots_are_cached(monitors):
+    calls = []
+    barrier = threading.Barrier(3, timeout=1)
+
+    def probe(result):
+        def run():
+            # Times out unless all three probes run at once
+            barrier.wait()
+            calls.append(result)
+            return result
+        return run
+
+    monitor = _monitor(monitors, {
+        "ocr": probe({"ready": True, "message": "OCR runtime is ready."}),
+        "database": probe(True),
+        "cache": probe(False),
+    })
+
+    snapshot = monitor.refresh()
+
+    assert snapshot["ocr"]["message"] == "OCR runtime is ready."
+    assert snapshot["database"]["ready"] is True
+    assert snapshot["cache"]["ready"] is False
+    assert all(status["checked_at"] for status in snapshot.values())
+    # Reads never run a probe
+    for _ in range(100):
+        assert monitor.snapshot() is snapshot
+    assert len(calls) == 3
+
+
+def test_hung_probes_time_out_and_are_not_restarted(monitors):
+    release = threading.Event()
+    started = []
+
+    def hung():
+        started.append(1)
+        release.wait(5)
+        return True
+
+    monitor = _monitor(monitors, {"database": hung, "cache": lambda: True}, timeout=0.1)
+
+    first = time.monotonic()
+    snapshot = monitor.refresh()
+    assert time.monotonic() - first < 0.5
+    assert snapshot["database"]["ready"] is False
+    assert "timed out" in snapshot["database"]["message"]
+    assert snapshot["cache"]["ready"] is True
+
+    monitor.refresh()
+    assert len(started) == 1
+
+    release.set()
+    time.sleep(0.05)
+    assert monitor.refresh()["database"]["ready"] is True
+
+
+def test_failing_probes_and_optional_dependencies(monitors):
+    def broken():
+        raise RuntimeError("connection refused")
+
+    monitor = _monitor(monitors, {"ocr": broken, "database": lambda: True}, optional=("ocr",))
+
+    assert not monitor.ready()  # nothing checked yet
+    snapshot = monitor.refresh()
+
+    assert snapshot["ocr"] == {
+        "ready": False,
+        "message": "Health probe failed: connection refused",
+        "checked_at": snapshot["ocr"]["checked_at"],
+    }
+    assert monitor.ready()
+
+
+def test_background_refresh_starts_immediately(monitors):
+    refreshed = threading.Event()
+
+    def probe():
+        refreshed.set()
+        return True
+
+    monitor = _monitor(monitors, {"cache": probe})
+    monitor.start()
+
+    assert refreshed.wait(1)
+    deadline = time.monotonic() + 1
+    while not monitor.ready() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert monitor.ready()
+
+
+def test_monitor_restarts_after_stop(monitors):
+    monitor = _monitor(monitors, {"cache": lambda: True})
+    first = monitor.refresh()["cache"]["checked_at"]
+
+    # A second app lifespan reuses the same monitor
+    monitor.stop()
+    time.sleep(0.01)
+    monitor.start()
+
+    deadline = time.monotonic() + 1
+    while monitor.snapshot()["cache"]["checked_at"] == first and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert monitor.snapshot()["cache"]["checked_at"] > first
+    assert monitor.ready()
+
+
+def test_stale_snapshots_are_not_ready(monitors):
+    monitor = HealthMonitor({"cache": lambda: True}, interval_seconds=0.01, timeout_seconds=0.01)
+    monitors.append(monitor)
+    monitor.refresh()
+    assert monitor.ready()
+
+    # No refresh for well over STALE_AFTER_INTERVALS intervals
+    time.sleep(0.1)
+
+    assert not monitor.ready()
+    status = monitor.snapshot()["cache"]
+    assert status["ready"] is False
+    assert "stale" in status["message"]
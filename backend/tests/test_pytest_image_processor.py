@@ -0,0 +1,60 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.services.ocr.image_processor import ImageProcessor
+
+
+def _encode_text_image(width, height, font_scale, thickness, ext=".jpg"):
+    img = np.full((height, width, 3), 230, dtype=np.uint8)
+    cv2.putText(img, "WARFARIN 5MG", (width // 10, height // 2), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (20, 20, 20), thickness)
+    return cv2.imencode(ext, img)[1].tobytes()
+
+
+def test_large_photo_is_downscaled_toward_target_text_height():
+    image_bytes = _encode_text_image(4000, 3000, 6, 12)
+
+    gray = ImageProcessor.load_grayscale_for_ocr(image_bytes)
+
+    assert gray.ndim == 2
+    assert gray.shape[1] < 4000
+    text_height = ImageProcessor.estimate_text_height(gray)
+    assert abs(text_height - ImageProcessor.TARGET_TEXT_HEIGHT_PX) <= 4
+
+
+def test_small_crop_is_upscaled_but_capped():
+    image_bytes = _encode_text_image(200, 60, 0.5, 1, ext=".png")
+
+    gray = ImageProcessor.load_grayscale_for_ocr(image_bytes)
+
+    assert gray.shape[1] > 200
+    assert gray.shape[1] <= 200 * ImageProcessor.MAX_UPSCALE
+
+
+def test_preprocess_returns_binary_single_channel():
+    processed = ImageProcessor.preprocess_for_ocr(_encode_text_image(800, 600, 1, 2))
+
+    assert processed.ndim == 2
+    assert set(np.unique(processed)).issubset({0, 255})
+
+
+def test_invalid_bytes_raise_value_error():
+    with pytest.raises(ValueError, match="Invalid image"):
+        ImageProcessor.preprocess_for_ocr(b"NOT_AN_IMAGE")
+
+
+def test_roi_mode_crops_and_deskews_text_block():
+    img = np.full((3000, 4000, 3), 230, dtype=np.uint8)
+    cv2.rectangle(img, (100, 100), (3900, 2900), (40, 40, 40), 15)
+    cv2.putText(img, "WARFARIN 5MG", (1200, 1500), cv2.FONT_HERSHEY_SIMPLEX, 4, (20, 20, 20), 8)
+    rotation = cv2.getRotationMatrix2D((2000, 1500), -8, 1.0)
+    img = cv2.warpAffine(img, rotation, (4000, 3000), borderValue=(230, 230, 230))
+    image_bytes = cv2.imencode(".jpg", img)[1].tobytes()
+
+    full = ImageProcessor.preprocess_for_ocr(image_bytes, mode=ImageProcessor.MODE_FULL)
+    roi = ImageProcessor.preprocess_for_ocr(image_bytes, mode=ImageProcessor.MODE_ROI)
+
+    assert roi.size < full.size * 0.2
+    # Deskewed: the text block's long side is level again
+    ink = cv2.findNonZero(cv2.bitwise_not(roi))
+    assert abs(ImageProcessor._skew_angle(cv2.minAreaRect(ink))) < 2.0
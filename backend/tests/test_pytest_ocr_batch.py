@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_ocr_service, rate_limit_dependency
+from app.api.v1.ocr import router
+from app.core.exceptions import ServiceOverloadedException
+
+
+class BatchOCRService:
+    async def extract_drug_from_image(self, image_bytes, known_drugs):
+        if image_bytes == b"SLOW-ASPIRIN":
+            await asyncio.sleep(0.1)
+            return {"matched_drug": "ASPIRIN", "confidence_score": 1.0}
+        if image_bytes == b"WARFARIN":
+            return {"matched_drug": "WARFARIN", "confidence_score": 1.0}
+        if image_bytes == b"BUSY":
+            raise ServiceOverloadedException("OCR service is at capacity.", retry_after=3)
+        raise ValueError("No recognizable text found in the image.")
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_ocr_service] = BatchOCRService
+    app.dependency_overrides[rate_limit_dependency] = lambda: None
+    return TestClient(app)
+
+
+def test_batch_streams_results_as_they_finish_then_checks_interactions():
+    files = [
+        ("images", ("a.png", b"SLOW-ASPIRIN", "image/png")),
+        ("images", ("b.png", b"WARFARIN", "image/png")),
+        ("images", ("c.png", b"BLURRY", "image/png")),
+        ("images", ("d.gif", b"GIF", "image/gif")),
+        ("images", ("e.png", b"BUSY", "image/png")),
+    ]
+
+    response = _client().post("/ocr/extract-drug/batch", files=files)
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results, summary = lines[:-1], lines[-1]
+
+    assert sorted(line["index"] for line in results) == [0, 1, 2, 3, 4]
+    # The slow image is streamed last even though it was uploaded first
+    assert results[-1]["index"] == 0
+    by_index = {line["index"]: line for line in results}
+    assert by_index[2]["error"] == "No recognizable text found in the image."
+    assert "Unsupported file type" in by_index[3]["error"]
+    assert by_index[4]["retry_after"] == 3
+
+    assert summary["type"] == "summary"
+    assert summary["data"]["matched_drugs"] == ["ASPIRIN", "WARFARIN"]
+    assert summary["data"]["interaction_report"]["interactions"][0]["severity"] == "severe"
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.ocr.image_processor import ImageProcessor
+from app.services.ocr.ocr_service import OCRService
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "METFORMIN"]
+
+
+def _clean_label():
+    img = np.full((200, 700), 235, dtype=np.uint8)
+    cv2.putText(img, "WARFARIN 5MG", (20, 120), cv2.FONT_HERSHEY_SIMPLEX, 2, 20, 4)
+    return cv2.imencode(".png", img)[1].tobytes()
+
+
+@pytest.fixture
+def service():
+    service = OCRService()
+    service._packaging_index = None
+    return service
+
+
+def test_minimal_tier_is_black_text_on_white_at_native_scale():
+    processed = ImageProcessor.preprocess_minimal(_clean_label())
+
+    assert processed.shape == (200, 700)
+    assert set(np.unique(processed)) <= {0, 255}
+    # Background stays white, text is the dark minority
+    assert processed[5, 5] == 255
+    assert cv2.countNonZero(processed) > processed.size // 2
+
+
+@patch("app.services.ocr.ocr_service.ImageProcessor.preprocess_for_ocr")
+def test_clean_image_is_matched_by_the_minimal_tier(mock_full, service):
+    with patch.object(service._engine, "image_to_string", return_value="WARFARIN 5MG") as mock_ocr:
+        result = service._execute_sync_pipeline(_clean_label(), KNOWN_DRUGS)
+
+    assert result["matched_drug"] == "WARFARIN"
+    assert result["preprocessing_tier"] == "minimal"
+    assert mock_ocr.call_count == 1
+    mock_full.assert_not_called()
+
+
+@patch("app.services.ocr.ocr_service.ImageProcessor.preprocess_for_ocr")
+def test_unmatched_minimal_tier_escalates_to_full_preprocessing(mock_full, service):
+    mock_full.return_value = np.full((50, 200), 255, dtype=np.uint8)
+
+    with patch.object(service._engine, "image_to_string", side_effect=["~~ }{ ::", "WARFARIN 5MG"]):
+        result = service._execute_sync_pipeline(_clean_label(), KNOWN_DRUGS)
+
+    assert result["preprocessing_tier"] == "full"
+    mock_full.assert_called_once()
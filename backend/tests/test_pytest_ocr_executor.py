@@ -0,0 +1,106 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.core.exceptions import ServiceOverloadedException
+from app.services.ocr.executor import OCRExecutor
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after():
+    release = threading.Event()
+    executor = OCRExecutor(max_workers=1, max_queue=1, max_wait_seconds=30)
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ServiceOverloadedException) as rejected:
+            await executor.run(lambda: "rejected")
+        assert rejected.value.status_code == 503
+        assert rejected.value.retry_after >= 1
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+        assert executor.stats()["queued"] == 0
+        assert executor.stats()["running"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_job_past_its_wait_deadline_is_dropped_unexecuted():
+    release = threading.Event()
+    executed = []
+    executor = OCRExecutor(max_workers=1, max_queue=4, max_wait_seconds=0.05)
+    try:
+        blocker = asyncio.ensure_future(executor.run(release.wait))
+        stale = asyncio.ensure_future(executor.run(lambda: executed.append("stale")))
+        await asyncio.sleep(0.15)
+        release.set()
+
+        await blocker
+        with pytest.raises(ServiceOverloadedException):
+            await stale
+        assert executed == []
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_shared_exceptions_and_metrics_with_both_import_roots():
+    # Deployments may have both the repo root and backend/ on the path; the
+    # services must raise the classes the routers catch and count into the
+    # registry /metrics serves
+    backend_dir = Path(__file__).resolve().parents[1]
+    script = (
+        "import backend.app.services.ocr.executor as executor\n"
+        "import backend.app.services.ocr.ocr_service as ocr_service\n"
+        "import backend.app.services.ocr.quality_gate as quality_gate\n"
+        "import backend.app.core.health as health\n"
+        "from app.api.v1 import ocr\n"
+        "from app.core import metrics\n"
+        "assert executor.ServiceOverloadedException is ocr.ServiceOverloadedException\n"
+        "assert ocr_service.ServiceOverloadedException is ocr.ServiceOverloadedException\n"
+        "assert quality_gate.ImageQualityException is ocr.ImageQualityException\n"
+        "for module in (executor, ocr_service, quality_gate, health):\n"
+        "    assert module.get_metrics_registry() is metrics.get_metrics_registry()\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(backend_dir.parent), str(backend_dir)])}
+
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=backend_dir, env=env, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_services_import_with_only_the_repo_root_on_the_path(tmp_path):
+    # `uvicorn backend.main:app` from the repo root: no app package at all
+    backend_dir = Path(__file__).resolve().parents[1]
+    script = (
+        "import sys\n"
+        "import backend.app.services.ocr.executor as executor\n"
+        "import backend.app.services.ocr.ocr_service as ocr_service\n"
+        "import backend.app.services.ocr.quality_gate as quality_gate\n"
+        "import backend.app.services.ocr.profiling as profiling\n"
+        "import backend.app.core.health as health\n"
+        "from backend.app.core import metrics\n"
+        "assert 'app' not in sys.modules\n"
+        "for module in (executor, ocr_service, quality_gate, profiling, health):\n"
+        "    assert module.get_metrics_registry() is metrics.get_metrics_registry()\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(backend_dir.parent)}
+
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,112 @@
+import os
+import signal
+from concurrent.futures import Future
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from app.services.ocr import process_pool
+from app.services.ocr.process_pool import ProcessPipelineRunner
+
+
+class RecordingService:
+    def __init__(self):
+        self.calls = []
+
+    def _pipeline(self, pipeline):
+        assert pipeline == "single"
+        return self._execute_sync_pipeline
+
+    def _execute_sync_pipeline(self, image_bytes, known_drugs):
+        self.calls.append((bytes(image_bytes), list(known_drugs)))
+        return {"matched_drug": known_drugs[0]}
+
+
+def _shared(payload):
+    block = SharedMemory(create=True, size=len(payload))
+    block.buf[:len(payload)] = payload
+    return block
+
+
+def test_worker_reads_upload_and_vocabulary_from_shared_memory(monkeypatch):
+    service = RecordingService()
+    monkeypatch.setattr(process_pool, "_worker_service", service)
+    monkeypatch.setattr(process_pool, "_worker_vocabularies", process_pool.OrderedDict())
+
+    image = _shared(b"PNG-BYTES")
+    vocabulary = _shared(b"ASPIRIN\nWARFARIN")
+    try:
+        result = process_pool._run_pipeline_in_worker(
+            (image.name, 9), "v1", (vocabulary.name, vocabulary.size), "single"
+        )
+        # The vocabulary is cached per version; its block is not read again
+        vocabulary.close()
+        vocabulary.unlink()
+        process_pool._run_pipeline_in_worker((image.name, 9), "v1", ("gone", 0), "single")
+    finally:
+        image.close()
+        image.unlink()
+
+    assert result == {"matched_drug": "ASPIRIN"}
+    assert service.calls == [(b"PNG-BYTES", ["ASPIRIN", "WARFARIN"])] * 2
+
+
+def test_process_runner_propagates_worker_errors():
+    runner = ProcessPipelineRunner(max_workers=1)
+    try:
+        runner.warm()
+        with pytest.raises(ValueError, match="Invalid image"):
+            runner.run(b"definitely not an image", ["ASPIRIN"])
+    finally:
+        runner.shutdown()
+
+
+class EvictingPool:
+    """Publishes newer vocabularies while a job is queued, then runs it."""
+
+    def __init__(self, runner):
+        self.runner = runner
+        self.vocabulary_name = None
+
+    def submit(self, fn, image_ref, version, vocabulary_ref, pipeline):
+        self.vocabulary_name = vocabulary_ref[0]
+        for index in range(ProcessPipelineRunner.PUBLISHED_VOCABULARY_VERSIONS + 1):
+            self.runner._release_vocabulary(self.runner._acquire_vocabulary([f"DRUG{index}"], f"v{index}"))
+        # Raises FileNotFoundError if the block was unlinked under the job
+        block = SharedMemory(name=vocabulary_ref[0])
+        future = Future()
+        future.set_result(bytes(block.buf[:vocabulary_ref[1]]))
+        block.close()
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+def test_vocabulary_block_outlives_eviction_while_a_job_uses_it():
+    runner = ProcessPipelineRunner(max_workers=1)
+    runner._pool.shutdown()
+    runner._pool = pool = EvictingPool(runner)
+    try:
+        assert runner.run(b"PNG-BYTES", ["ASPIRIN", "WARFARIN"]) == b"ASPIRIN\nWARFARIN"
+        assert len(runner._vocabularies) == ProcessPipelineRunner.PUBLISHED_VOCABULARY_VERSIONS
+        # Evicted while in use, then unlinked once the job released it
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=pool.vocabulary_name)
+    finally:
+        runner.shutdown()
+
+
+def test_process_runner_recovers_from_a_killed_worker():
+    runner = ProcessPipelineRunner(max_workers=1)
+    try:
+        runner.warm()
+        worker_pid = runner._pool.submit(process_pool._worker_ping).result()
+        os.kill(worker_pid, signal.SIGKILL)
+
+        # The job after the crash runs on a fresh pool
+        with pytest.raises(ValueError, match="Invalid image"):
+            runner.run(b"definitely not an image", ["ASPIRIN"])
+        assert runner._pool.submit(process_pool._worker_ping).result() != worker_pid
+    finally:
+        runner.shutdown()
@@ -0,0 +1,96 @@
+import io
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from app.core.metrics import get_metrics_registry
+from app.services.ocr import profile_cli
+from app.services.ocr.image_processor import ImageProcessor
+from app.services.ocr.ocr_service import OCRService
+from app.services.ocr.profiling import StageTimer
+from app.services.ocr.tesseract_engine import get_tesseract_engine
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "METFORMIN"]
+
+
+def _label(text="WARFARIN 5MG"):
+    img = np.full((200, 700), 235, dtype=np.uint8)
+    cv2.putText(img, text, (20, 120), cv2.FONT_HERSHEY_SIMPLEX, 2, 20, 4)
+    return cv2.imencode(".png", img)[1].tobytes()
+
+
+@pytest.fixture
+def service():
+    service = OCRService()
+    service._packaging_index = None
+    return service
+
+
+def test_preprocessing_stages_record_time_pixels_and_arrays():
+    timer = StageTimer()
+    with timer.activate():
+        ImageProcessor.preprocess_for_ocr(_label())
+
+    stages = [record.stage for record in timer.records]
+    assert stages == ["preprocess.decode", "preprocess.binarize", "preprocess.rotate", "preprocess.crop"]
+    decode, binarize = timer.records[:2]
+    assert decode.input_pixels > 0
+    assert binarize.input_pixels == decode.input_pixels
+    assert binarize.array_bytes >= 2 * binarize.input_pixels
+    assert all(record.wall_seconds >= 0 and record.cpu_seconds >= 0 for record in timer.records)
+
+
+def test_stages_are_not_recorded_without_an_active_timer():
+    timer = StageTimer()
+    ImageProcessor.preprocess_minimal(_label())
+    assert timer.records == []
+
+
+def test_profile_is_exposed_in_debug_mode_and_feeds_metrics(service):
+    service._profiling = "debug"
+    with patch.object(service._engine, "image_to_string", return_value="WARFARIN 5MG"):
+        result = service._compute_and_store("profile-key", _label(), KNOWN_DRUGS)
+
+    stages = [record["stage"] for record in result["profile"]]
+    assert stages == ["minimal.preprocess.decode", "minimal.preprocess.otsu", "minimal.ocr", "minimal.clean", "minimal.match"]
+    histogram = get_metrics_registry().histogram("ocr_stage_minimal_ocr_seconds", "")
+    assert histogram.count >= 1
+
+
+def test_profile_is_never_cached(service):
+    service._profiling = "debug"
+    with patch.object(service._engine, "image_to_string", return_value="WARFARIN 5MG"), \
+            patch.object(service, "_store_result") as store_result:
+        result = service._compute_and_store("profile-key", _label(), KNOWN_DRUGS)
+
+    cached = store_result.call_args.args[1]
+    assert "profile" in result
+    assert "profile" not in cached
+    assert cached == {name: value for name, value in result.items() if name != "profile"}
+
+
+def test_profile_is_stripped_outside_debug_mode(service):
+    service._profiling = "metrics"
+    with patch.object(service._engine, "image_to_string", return_value="WARFARIN 5MG"):
+        result = service._compute_and_store("profile-key", _label(), KNOWN_DRUGS)
+
+    assert result["matched_drug"] == "WARFARIN"
+    assert "profile" not in result
+
+
+def test_cli_replays_a_directory_with_a_per_stage_breakdown(tmp_path):
+    (tmp_path / "warfarin.png").write_bytes(_label())
+    (tmp_path / "blank.png").write_bytes(_label(""))
+
+    out = io.StringIO()
+    with patch.object(get_tesseract_engine(), "image_to_string", return_value="WARFARIN"):
+        records = profile_cli.replay(sorted(tmp_path.glob("*.png")), KNOWN_DRUGS, out=out)
+    rows = profile_cli.summarize(records)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("blank.png") and lines[1].startswith("warfarin.png")
+    decode = next(row for row in rows if row["stage"] == "minimal.preprocess.decode")
+    assert decode["runs"] == 2
+    assert decode["megapixels"] == pytest.approx(0.14)
@@ -0,0 +1,109 @@
+import threading
+from unittest.mock import AsyncMock, patch
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_ocr_service, rate_limit_dependency
+from app.api.v1.ocr import router
+from app.core.exceptions import ImageQualityException
+from app.core.metrics import get_metrics_registry
+from app.services.ocr.ocr_service import OCRService
+from app.services.ocr.quality_gate import ImageQualityGate
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "METFORMIN"]
+
+
+def _photo(background=235, ink=20, blur=0.0, font_scale=2.0, size=(400, 1400)):
+    img = np.full(size, background, dtype=np.uint8)
+    origin = (size[1] // 30, size[0] * 3 // 5)
+    cv2.putText(img, "WARFARIN 5MG", origin, cv2.FONT_HERSHEY_SIMPLEX, font_scale, ink, max(1, int(font_scale * 2)))
+    if blur:
+        img = cv2.GaussianBlur(img, (0, 0), blur)
+    return cv2.imencode(".png", img)[1].tobytes()
+
+
+def _gate():
+    return ImageQualityGate(min_sharpness=15.0, min_text_height=8.0, dark_level=60, bright_level=200, min_contrast=32)
+
+
+def test_readable_photo_passes_with_measurements():
+    report = _gate().check(_photo())
+
+    assert (report.width, report.height) == (1400, 400)
+    assert report.dark_level < 60 and report.bright_level >= 235
+    assert report.text_height == pytest.approx(42, abs=8)
+
+
+@pytest.mark.parametrize(
+    "image, reason",
+    [
+        (_photo(blur=8.0), "blurry"),
+        (_photo(background=30, ink=5), "too_dark"),
+        (_photo(background=250, ink=230), "overexposed"),
+        (_photo(background=140, ink=120), "low_contrast"),
+        (_photo(font_scale=0.3, size=(120, 300)), "text_too_small"),
+        (_photo(size=(20, 300)), "too_small"),
+    ],
+    ids=lambda value: value if isinstance(value, str) else "",
+)
+def test_unreadable_photos_are_rejected_and_counted(image, reason):
+    counter = get_metrics_registry().counter(f"ocr_quality_rejected_{reason}_total", "")
+    before = counter.value
+
+    with pytest.raises(ImageQualityException) as rejected:
+        _gate().check(image)
+
+    assert rejected.value.reason == reason
+    assert counter.value == before + 1
+
+
+def test_undecodable_bytes_are_left_to_the_pipeline():
+    assert _gate().check(b"NOT AN IMAGE") is None
+
+
+@pytest.mark.asyncio
+async def test_rejected_upload_never_reaches_the_ocr_executor():
+    service = OCRService()
+    with patch.object(service._executor, "run", new=AsyncMock()) as executor_run:
+        with pytest.raises(ImageQualityException):
+            await service.extract_drug_from_image(_photo(blur=8.0), KNOWN_DRUGS)
+
+    executor_run.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_quality_check_runs_off_the_event_loop():
+    service = OCRService()
+    loop_thread = threading.get_ident()
+    check_threads = []
+    original_check = service._quality_gate.check
+
+    def check(image_bytes):
+        check_threads.append(threading.get_ident())
+        return original_check(image_bytes)
+
+    with patch.object(service._quality_gate, "check", side_effect=check), \
+            patch.object(service._executor, "run", new=AsyncMock()) as executor_run:
+        with pytest.raises(ImageQualityException):
+            await service.extract_drug_from_image(_photo(blur=8.0), KNOWN_DRUGS)
+
+    assert check_threads and check_threads[0] != loop_thread
+    executor_run.assert_not_called()
+
+
+def test_endpoint_answers_422_with_the_reason():
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_ocr_service] = lambda: OCRService()
+    app.dependency_overrides[rate_limit_dependency] = lambda: None
+
+    response = TestClient(app).post(
+        "/ocr/extract-drug", files={"image": ("label.png", _photo(background=30, ink=5), "image/png")}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["reason"] == "too_dark"
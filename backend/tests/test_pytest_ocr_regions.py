@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from app.core.exceptions import ServiceOverloadedException
+from app.services.ocr.executor import OCRExecutor
+from app.services.ocr.image_processor import ImageProcessor
+from app.services.ocr.ocr_service import TIER_FULL, OCRService
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "METFORMIN"]
+
+
+def _label_photo():
+    canvas = np.full((700, 1000), 235, dtype=np.uint8)
+    cv2.putText(canvas, "ACME PHARMA", (60, 120), cv2.FONT_HERSHEY_SIMPLEX, 2, 20, 4)
+    cv2.putText(canvas, "WARFARIN", (60, 360), cv2.FONT_HERSHEY_SIMPLEX, 3, 20, 6)
+    cv2.putText(canvas, "28 TABLETS", (560, 600), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 20, 3)
+    return cv2.imencode(".png", canvas)[1].tobytes()
+
+
+@pytest.fixture
+def service():
+    service = OCRService(executor=OCRExecutor(max_workers=4, max_queue=4, max_wait_seconds=5))
+    service._pipeline_mode = ImageProcessor.MODE_REGIONS
+    service._max_text_regions = 3
+    service._packaging_index = None
+    yield service
+    service._executor.shutdown()
+
+
+def test_top_regions_are_cropped_in_reading_order():
+    page, regions = ImageProcessor.preprocess_regions(_label_photo(), limit=3)
+
+    assert len(regions) == 3
+    # Black text on white, like the single-crop pipeline
+    assert all(np.median(region) == 255 for region in regions)
+    # Brand, then the (largest) drug name, then the pack size
+    heights = [region.shape[0] for region in regions]
+    assert heights[1] == max(heights)
+    assert page.shape[0] > regions[1].shape[0]
+
+
+def test_region_limit_keeps_the_largest_blocks():
+    _, regions = ImageProcessor.preprocess_regions(_label_photo(), limit=1)
+
+    assert len(regions) == 1
+    assert regions[0].shape[0] == max(
+        region.shape[0] for region in ImageProcessor.preprocess_regions(_label_photo(), limit=3)[1]
+    )
+
+
+def test_thin_strips_use_single_line_psm():
+    assert ImageProcessor.region_psm(np.zeros((40, 400), dtype=np.uint8)) == 7
+    assert ImageProcessor.region_psm(np.zeros((120, 400), dtype=np.uint8)) == 6
+
+
+def test_map_inline_runs_items_concurrently_in_order():
+    executor = OCRExecutor(max_workers=3, max_queue=0, max_wait_seconds=5)
+    barrier = threading.Barrier(3, timeout=2)
+
+    def work(item):
+        # Deadlocks (and times out) unless all three run at once
+        barrier.wait()
+        return item * 10
+
+    try:
+        assert executor.map_inline(work, [1, 2, 3]) == [10, 20, 30]
+    finally:
+        executor.shutdown()
+
+
+def test_map_inline_from_a_saturated_pool_runs_items_itself():
+    executor = OCRExecutor(max_workers=1, max_queue=0, max_wait_seconds=5)
+    try:
+        # The only worker fans out: queued items fall back to the caller
+        future = executor._pool.submit(executor.map_inline, lambda item: item + 1, [1, 2, 3])
+        assert future.result(timeout=2) == [2, 3, 4]
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_fan_out_counts_toward_admission():
+    executor = OCRExecutor(max_workers=3, max_queue=0, max_wait_seconds=5)
+    started = []
+    release = threading.Event()
+
+    def work(item):
+        started.append(item)
+        release.wait(2)
+        return item
+
+    try:
+        parent = asyncio.ensure_future(executor.run(executor.map_inline, work, [1, 2, 3]))
+        deadline = time.monotonic() + 2
+        while len(started) < 3 and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        # One admitted job holds all three workers through its sub-tasks
+        assert executor.stats()["running"] == 3
+        with pytest.raises(ServiceOverloadedException):
+            await executor.run(lambda: "rejected")
+
+        release.set()
+        assert await parent == [1, 2, 3]
+        assert executor.stats()["running"] == 0
+        assert executor.stats()["queued"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_region_texts_are_merged_before_matching(service):
+    def slow_ocr(region, psm, hints=None):
+        time.sleep(0.2)
+        return "WARFARIN" if region.shape[0] > 50 else "NOISE"
+
+    with patch.object(service._engine, "image_to_string", side_effect=slow_ocr) as mock_ocr:
+        started = time.monotonic()
+        result = service._run_tier(TIER_FULL, _label_photo(), KNOWN_DRUGS, "vocab")
+        elapsed = time.monotonic() - started
+
+    assert result["matched_drug"] == "WARFARIN"
+    assert result["extracted_text"].split() == ["NOISE", "WARFARIN", "NOISE"]
+    assert mock_ocr.call_count == 3
+    # Close to one region's OCR time, not the sum of three
+    assert elapsed < 0.5
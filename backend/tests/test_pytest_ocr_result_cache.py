@@ -0,0 +1,87 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.infrastructure.cache.single_flight import SingleFlight
+from app.services.ocr.ocr_service import OCRService
+
+
+class DictCache:
+    def __init__(self):
+        self.store = {}
+
+    def get_json(self, key):
+        return self.store.get(key)
+
+    def set_json(self, key, value, ttl):
+        self.store[key] = value
+
+
+@pytest.fixture
+def known_drugs():
+    return ["ASPIRIN", "WARFARIN", "METFORMIN"]
+
+
+@patch("app.services.ocr.ocr_service.ImageProcessor.preprocess_for_ocr")
+@patch("app.services.ocr.ocr_service.pytesseract.image_to_string")
+def test_reupload_is_served_from_cache(mock_image_to_string, mock_preprocess, known_drugs):
+    mock_preprocess.return_value = b"PROCESSED"
+    mock_image_to_string.return_value = "ASP1R1N 75MG"
+    service = OCRService(cache=DictCache())
+
+    first = service.extract_drug(b"SAME_IMAGE", known_drugs)
+    second = service.extract_drug(b"SAME_IMAGE", known_drugs)
+
+    assert first == second
+    assert mock_preprocess.call_count == 1
+
+    # A different vocabulary version must not reuse the cached match
+    service.extract_drug(b"SAME_IMAGE", known_drugs + ["OMEPRAZOLE"])
+    assert mock_preprocess.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("app.services.ocr.ocr_service.ImageProcessor.preprocess_for_ocr")
+@patch("app.services.ocr.ocr_service.pytesseract.image_to_string")
+async def test_concurrent_identical_uploads_join_one_computation(mock_image_to_string, mock_preprocess, known_drugs):
+    def slow_preprocess(*_args, **_kwargs):
+        time.sleep(0.1)
+        return b"PROCESSED"
+
+    mock_preprocess.side_effect = slow_preprocess
+    mock_image_to_string.return_value = "WARFARIN 5MG"
+    service = OCRService(cache=DictCache())
+
+    results = await asyncio.gather(*(service.extract_drug_from_image(b"BURST", known_drugs) for _ in range(4)))
+
+    assert mock_preprocess.call_count == 1
+    assert all(result["matched_drug"] == "WARFARIN" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_fail_followers():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await release.wait()
+        return {"matched_drug": "WARFARIN"}
+
+    leader = asyncio.ensure_future(flight.run_async("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.run_async("key", work))
+    await asyncio.sleep(0)
+
+    # e.g. the batch endpoint cancels its tasks when the client disconnects
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == {"matched_drug": "WARFARIN"}
+    assert leader.cancelled()
+    assert calls == [1]
+    assert flight.in_flight() == 0
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+from app.services.ocr.ocr_service import OCRService
+from app.services.ocr.packaging_index import (
+    BKTree,
+    PackagingMatch,
+    PackagingRecognitionIndex,
+    hamming_distance,
+    perceptual_hash,
+)
+
+
+def _text_crop(text, noise=0, seed=0):
+    img = np.full((120, 600), 255, dtype=np.uint8)
+    cv2.putText(img, text, (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 4)
+    if noise:
+        img = cv2.subtract(img, np.random.default_rng(seed).integers(0, noise, img.shape, dtype=np.uint8))
+    return img
+
+
+def test_bk_tree_range_search_matches_brute_force():
+    rng = np.random.default_rng(7)
+    keys = [int(k) for k in rng.integers(0, 2**62, 300)]
+    tree = BKTree()
+    for key in keys:
+        tree.add(key, PackagingMatch("X", 1.0, "X"))
+
+    query = keys[0] ^ 0b1011
+    expected = sorted(hamming_distance(query, key) for key in keys if hamming_distance(query, key) <= 20)
+    assert [distance for distance, _ in tree.search(query, 20)] == expected
+
+
+def test_near_duplicate_is_found_and_other_text_is_not():
+    index = PackagingRecognitionIndex(capacity=100)
+    index.add("v1", perceptual_hash(_text_crop("WARFARIN")), PackagingMatch("WARFARIN", 0.95, "WARFARIN"))
+
+    noisy_copy = perceptual_hash(_text_crop("WARFARIN", noise=60, seed=3))
+    assert index.lookup("v1", noisy_copy, 48).drug_name == "WARFARIN"
+    assert index.lookup("v1", perceptual_hash(_text_crop("METFORMIN")), 48) is None
+    # Entries never leak across vocabulary versions
+    assert index.lookup("v2", noisy_copy, 48) is None
+
+
+@patch("app.services.ocr.ocr_service.ImageProcessor.preprocess_for_ocr")
+@patch("app.services.ocr.ocr_service.pytesseract.image_to_string")
+def test_known_packaging_skips_tesseract(mock_image_to_string, mock_preprocess):
+    mock_image_to_string.return_value = "ASPIRIN 75MG"
+    service = OCRService()
+    service._packaging_index = PackagingRecognitionIndex(capacity=100)
+    known_drugs = ["ASPIRIN", "WARFARIN"]
+
+    mock_preprocess.return_value = _text_crop("ASPIRIN 75")
+    first = service._execute_sync_pipeline(b"FIRST_UPLOAD", known_drugs)
+    mock_preprocess.return_value = _text_crop("ASPIRIN 75", noise=60, seed=1)
+    second = service._execute_sync_pipeline(b"SECOND_UPLOAD", known_drugs)
+
+    assert first["recognition_source"] == "ocr"
+    assert second["recognition_source"] == "packaging_index"
+    assert second["matched_drug"] == "ASPIRIN"
+    assert mock_image_to_string.call_count == 1
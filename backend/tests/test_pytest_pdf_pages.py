@@ -0,0 +1,174 @@
+import asyncio
+import json
+import types
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_ocr_service, rate_limit_dependency
+from app.api.v1.ocr import router
+from app.services.ocr import pdf_pages
+from app.services.ocr.executor import OCRExecutor
+from app.services.ocr.ocr_service import OCRService
+from app.services.ocr.pdf_pages import PdfPages, open_pdf
+
+
+class FakePage:
+    def __init__(self, document, index):
+        self.document = document
+        self.index = index
+
+    def get_size(self):
+        # US Letter, in points
+        return 612.0, 792.0
+
+    def render(self, scale, grayscale):
+        self.document.rendered.append((self.index, scale))
+        height, width = round(792 * scale), round(612 * scale)
+        return types.SimpleNamespace(
+            to_numpy=lambda: np.full((height, width, 1), self.index, dtype=np.uint8), close=lambda: None
+        )
+
+    def close(self):
+        pass
+
+
+class FakePdfDocument:
+    def __init__(self, data):
+        if not data.startswith(b"%PDF-"):
+            raise RuntimeError("Failed to load document")
+        self.page_count = int(data[5:])
+        self.rendered = []
+        self.closed = False
+
+    def __len__(self):
+        return self.page_count
+
+    def __getitem__(self, index):
+        return FakePage(self, index)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_pdfium(monkeypatch):
+    monkeypatch.setattr(pdf_pages, "pdfium", types.SimpleNamespace(PdfDocument=FakePdfDocument))
+
+
+def test_pages_render_on_demand_at_the_requested_dpi(fake_pdfium):
+    pages = open_pdf(b"%PDF-3", dpi=150)
+
+    assert len(pages) == 3
+    assert pages._document.rendered == []
+    gray = pages.render_gray(2)
+    assert gray.shape == (1650, 1275)
+    assert gray[0, 0] == 2
+    assert pages._document.rendered == [(2, 150 / 72)]
+
+    pages.close()
+    with pytest.raises(ValueError, match="closed"):
+        pages.render(0)
+
+
+def test_oversized_pages_are_capped(fake_pdfium):
+    pages = open_pdf(b"%PDF-1", dpi=1200)
+
+    assert max(pages.render_gray(0).shape) == PdfPages.MAX_LONG_SIDE
+
+
+def test_unreadable_empty_and_long_pdfs_are_rejected(fake_pdfium, monkeypatch):
+    with pytest.raises(ValueError, match="Invalid PDF"):
+        open_pdf(b"not a pdf", dpi=300)
+    with pytest.raises(ValueError, match="no pages"):
+        open_pdf(b"%PDF-0", dpi=300)
+    with pytest.raises(ValueError, match="at most 5 pages"):
+        open_pdf(b"%PDF-6", dpi=300, max_pages=5)
+
+    monkeypatch.setattr(pdf_pages, "pdfium", None)
+    with pytest.raises(ValueError, match="pypdfium2"):
+        open_pdf(b"%PDF-1", dpi=300)
+
+
+@pytest.mark.asyncio
+async def test_pages_stream_in_order_with_bounded_concurrency(fake_pdfium):
+    service = OCRService(executor=OCRExecutor(max_workers=4, max_queue=8, max_wait_seconds=5))
+    service._pdf_dpi = 10
+    service._pdf_page_concurrency = 2
+    pages = await service.open_pdf(b"%PDF-5")
+    in_flight = set()
+    peak = 0
+
+    async def extract(page_bytes, known_drugs, pipeline):
+        nonlocal peak
+        index = int(cv2.imdecode(np.frombuffer(page_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)[0, 0])
+        in_flight.add(index)
+        peak = max(peak, len(in_flight))
+        # Even pages finish after the odd page queued behind them
+        await asyncio.sleep(0.05 if index % 2 == 0 else 0.01)
+        in_flight.discard(index)
+        if index == 3:
+            raise ValueError("No recognizable text found in the image.")
+        return {"drugs": [{"drug_name": "WARFARIN"}], "index": index}
+
+    service._extract_async = extract
+    outcomes = [outcome async for outcome in service.extract_drugs_from_pdf(pages, ["WARFARIN"])]
+
+    assert [page_number for page_number, _ in outcomes] == [1, 2, 3, 4, 5]
+    assert isinstance(outcomes[3][1], ValueError)
+    assert [outcome["index"] for _, outcome in outcomes if isinstance(outcome, dict)] == [0, 1, 2, 4]
+    assert peak == 2
+    pages.close()
+    service._executor.shutdown()
+
+
+class PdfOCRService:
+    def __init__(self):
+        self.pages = None
+
+    async def open_pdf(self, pdf_bytes):
+        self.pages = open_pdf(pdf_bytes, dpi=10)
+        return self.pages
+
+    async def extract_drugs_from_pdf(self, pages, known_drugs):
+        yield 1, {"drugs": [{"drug_name": "ASPIRIN"}]}
+        yield 2, ValueError("No recognizable text found in the image.")
+        yield 3, {"drugs": [{"drug_name": "WARFARIN"}, {"drug_name": "ASPIRIN"}]}
+
+
+def _client(service):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_ocr_service] = lambda: service
+    app.dependency_overrides[rate_limit_dependency] = lambda: None
+    return TestClient(app)
+
+
+def test_pdf_endpoint_streams_pages_then_checks_interactions(fake_pdfium):
+    service = PdfOCRService()
+    files = {"document": ("discharge.pdf", b"%PDF-3", "application/pdf")}
+
+    response = _client(service).post("/ocr/scan-and-check/pdf", files=files)
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line.get("page") for line in lines] == [1, 2, 3, None]
+    assert lines[1]["success"] is False
+    assert lines[-1]["data"]["matched_drugs"] == ["ASPIRIN", "WARFARIN"]
+    assert service.pages._document.closed
+
+
+def test_pdf_endpoint_rejects_bad_documents(fake_pdfium, monkeypatch):
+    client = _client(PdfOCRService())
+
+    broken = client.post("/ocr/scan-and-check/pdf", files={"document": ("a.pdf", b"junk", "application/pdf")})
+    assert broken.status_code == 400
+    image = client.post("/ocr/scan-and-check/pdf", files={"document": ("a.png", b"x", "image/png")})
+    assert image.status_code == 415
+
+    monkeypatch.setattr(pdf_pages, "pdfium", None)
+    missing = client.post("/ocr/scan-and-check/pdf", files={"document": ("a.pdf", b"%PDF-1", "application/pdf")})
+    assert missing.status_code == 415
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.services.ocr.ocr_service import OCRService
+from app.services.ocr.drug_matcher import DrugMatcher
+from app.services.ocr.prescription_parser import PrescriptionParser
+from app.services.ocr.tesseract_engine import OCRWord
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "METFORMIN", "AMOXICILLIN", "INSULIN GLARGINE", "OMEPRAZOLE"]
+
+
+def _line(number, *texts, top=None):
+    top = number * 40 if top is None else top
+    return [
+        OCRWord(text=text, left=index * 120, top=top, width=100, height=30, confidence=90.0, line=(1, 1, number))
+        for index, text in enumerate(texts)
+    ]
+
+
+def test_every_drug_on_the_page_is_found_with_boxes():
+    words = (
+        _line(1, "Rx:", "Dr.", "Smith")
+        + _line(2, "1.", "AMOXICILIN", "500", "mg", "TID")
+        + _line(3, "2.", "Warfarin", "5mg", "daily")
+        + _line(4, "3.", "lnsulin", "G1argine", "10", "units")
+        + _line(5, "Take", "warfarin", "after", "food")
+    )
+
+    drugs = PrescriptionParser.extract_drugs(words, KNOWN_DRUGS)
+
+    assert [drug["drug_name"] for drug in drugs] == ["AMOXICILLIN", "WARFARIN", "INSULIN GLARGINE"]
+    amoxicillin, warfarin, insulin = drugs
+    assert 0.8 <= amoxicillin["confidence"] < 1.0
+    assert warfarin["confidence"] == 1.0
+    # Reported once, at its first (equally confident) occurrence
+    assert warfarin["bounding_box"] == {"left": 120, "top": 120, "width": 100, "height": 30}
+    assert insulin["bounding_box"] == {"left": 120, "top": 160, "width": 220, "height": 30}
+
+
+def test_fuzzy_stage_only_scores_trigram_candidates():
+    vocabulary = [f"QZX{number:04d}VK" for number in range(2000)] + KNOWN_DRUGS
+
+    with patch.object(DrugMatcher, "match_many", wraps=DrugMatcher.match_many) as spy:
+        drugs = PrescriptionParser.extract_drugs(_line(1, "WARFARN", "5mg"), vocabulary)
+
+    assert [drug["drug_name"] for drug in drugs] == ["WARFARIN"]
+    scored_names = spy.call_args.args[1]
+    assert "WARFARIN" in scored_names
+    assert len(scored_names) < len(KNOWN_DRUGS)
+
+
+def test_exact_hits_skip_fuzzy_scoring():
+    with patch.object(DrugMatcher, "match_many") as spy:
+        drugs = PrescriptionParser.extract_drugs(_line(1, "0meprazo1e", "20", "daily"), KNOWN_DRUGS)
+
+    assert [(drug["drug_name"], drug["confidence"]) for drug in drugs] == [("OMEPRAZOLE", 1.0)]
+    spy.assert_not_called()
+
+
+@patch("app.services.ocr.ocr_service.ImageProcessor.preprocess_for_ocr")
+def test_multi_drug_pipeline_uses_document_mode(mock_preprocess):
+    mock_preprocess.return_value = np.full((300, 600), 255, dtype=np.uint8)
+    service = OCRService()
+    words = _line(1, "ASPIRIN", "75mg") + _line(2, "Omeprazole", "20mg")
+
+    with patch.object(service._engine, "image_to_data", return_value=words) as mock_data:
+        result = service.extract_drugs(b"PRESCRIPTION", KNOWN_DRUGS)
+
+    assert mock_preprocess.call_args.kwargs["mode"] == "document"
+    assert mock_data.call_args.kwargs["psm"] == 4
+    assert [drug["drug_name"] for drug in result["drugs"]] == ["ASPIRIN", "OMEPRAZOLE"]
+    assert result["page_size"] == {"width": 600, "height": 300}
+    assert result["coordinate_space"] == "preprocessed"
+
+
+@patch("app.services.ocr.ocr_service.ImageProcessor.preprocess_for_ocr")
+def test_page_without_known_drugs_is_rejected(mock_preprocess):
+    mock_preprocess.return_value = np.full((100, 100), 255, dtype=np.uint8)
+    service = OCRService()
+
+    with patch.object(service._engine, "image_to_data", return_value=_line(1, "Dr.", "Smith", "clinic")):
+        with pytest.raises(ValueError, match="did not confidently match"):
+            service.extract_drugs(b"NOTE", KNOWN_DRUGS)
@@ -0,0 +1,75 @@
+from datetime import date
+from itertools import islice
+
+import pytest
+from pydantic import ValidationError
+
+from app.services.scheduling.regimens import PeriodicRegimen, iter_dose_events
+from app.services.interactions.interaction_engine import InteractionRecord, SeverityLevel
+
+
+def test_alternate_day_and_weekly_patterns():
+    regimens = [
+        PeriodicRegimen(drug_name="WARFARIN", daily_pattern=[1, 0], start_date=date(2026, 1, 1)),
+        PeriodicRegimen(drug_name="METHOTREXATE", daily_pattern=[1, 0, 0, 0, 0, 0, 0], start_date=date(2026, 1, 1)),
+    ]
+    events = list(iter_dose_events(regimens, [], date(2026, 1, 1), date(2026, 1, 14)))
+
+    warfarin_days = [e.scheduled_at.day for e in events if e.drug_name == "WARFARIN"]
+    methotrexate_days = [e.scheduled_at.day for e in events if e.drug_name == "METHOTREXATE"]
+    assert warfarin_days == [1, 3, 5, 7, 9, 11, 13]
+    assert methotrexate_days == [1, 8]
+
+
+def test_tapering_regimen_stops_after_one_period():
+    taper = PeriodicRegimen(
+        drug_name="PREDNISONE", daily_pattern=[3, 2, 1], start_date=date(2026, 3, 1), repeat=False
+    )
+    events = list(iter_dose_events([taper], [], date(2026, 3, 1), date(2026, 3, 10)))
+
+    per_day = {}
+    for event in events:
+        per_day[event.scheduled_at.day] = per_day.get(event.scheduled_at.day, 0) + 1
+    assert per_day == {1: 3, 2: 2, 3: 1}
+
+
+def test_events_are_timezone_aware_lazy_and_respect_separation():
+    regimens = [
+        PeriodicRegimen(drug_name="ASPIRIN", daily_pattern=[1], start_date=date(2026, 1, 1)),
+        PeriodicRegimen(drug_name="WARFARIN", daily_pattern=[1], start_date=date(2026, 1, 1)),
+    ]
+    interactions = [
+        InteractionRecord(drug_a="ASPIRIN", drug_b="WARFARIN", severity=SeverityLevel.SEVERE, explanation="x")
+    ]
+    # A ten-year window is fine: only the consumed events are materialised
+    stream = iter_dose_events(regimens, interactions, date(2026, 1, 1), date(2035, 12, 31), tz="Asia/Kolkata")
+    first_day = list(islice(stream, 2))
+
+    assert all(e.scheduled_at.tzinfo is not None for e in first_day)
+    assert first_day[0].scheduled_at.utcoffset().total_seconds() == 5.5 * 3600
+    gap = abs(first_day[1].scheduled_at - first_day[0].scheduled_at).total_seconds() / 3600
+    assert gap >= 4
+
+
+def test_patterns_beyond_the_daily_slots_are_rejected():
+    with pytest.raises(ValidationError, match="cannot exceed 4 doses"):
+        PeriodicRegimen(drug_name="IBUPROFEN", daily_pattern=[6], start_date=date(2026, 1, 1))
+
+
+def test_unplaceable_doses_are_reported_not_dropped():
+    regimens = [
+        PeriodicRegimen(drug_name="ASPIRIN", daily_pattern=[1], start_date=date(2026, 1, 1)),
+        PeriodicRegimen(drug_name="WARFARIN", daily_pattern=[1], start_date=date(2026, 1, 1)),
+    ]
+    interactions = [
+        InteractionRecord(drug_a="ASPIRIN", drug_b="WARFARIN", severity=SeverityLevel.CONTRAINDICATED, explanation="x")
+    ]
+
+    events = list(iter_dose_events(regimens, interactions, date(2026, 1, 1), date(2026, 1, 2)))
+
+    assert len(events) == 4
+    unplaced = [event for event in events if not event.placed]
+    assert [event.scheduled_at.day for event in unplaced] == [1, 2]
+    assert all(event.scheduled_at.hour == 0 and "No safe time slot" in event.warning for event in unplaced)
+    assert len({event.drug_name for event in unplaced}) == 1
+    assert [event.scheduled_at for event in events] == sorted(event.scheduled_at for event in events)
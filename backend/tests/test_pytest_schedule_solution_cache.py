@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+import pytest
+from app.services.scheduling.schedule_optimizer import ScheduleOptimizer, MedicationDosage
+from app.services.scheduling.solution_cache import ScheduleSolutionCache, canonicalize_schedule_problem
+from app.services.interactions.interaction_engine import InteractionRecord, SeverityLevel
+
+
+class CountingOptimizer(ScheduleOptimizer):
+    def __init__(self, solution_cache=None):
+        super().__init__(solution_cache=solution_cache)
+        self.solve_calls = 0
+
+    def solve_shape(self, shape):
+        self.solve_calls += 1
+        return super().solve_shape(shape)
+
+
+@pytest.fixture
+def solution_cache():
+    return ScheduleSolutionCache()
+
+
+def _slot_hours(result, drug):
+    return [int(s["time"][:2]) for s in result["schedule"] if drug in s["medications"]]
+
+
+def test_renamed_regimens_share_canonical_shape():
+    optimizer = ScheduleOptimizer()
+    first = [
+        MedicationDosage(drug_name="ASPIRIN", frequency=2),
+        MedicationDosage(drug_name="WARFARIN", frequency=2),
+        MedicationDosage(drug_name="METFORMIN", frequency=1),
+    ]
+    second = [
+        MedicationDosage(drug_name="OMEPRAZOLE", frequency=1),
+        MedicationDosage(drug_name="IBUPROFEN", frequency=2),
+        MedicationDosage(drug_name="LISINOPRIL", frequency=2),
+    ]
+    first_graph = optimizer._build_constraint_graph([
+        InteractionRecord(drug_a="ASPIRIN", drug_b="WARFARIN", severity=SeverityLevel.SEVERE, explanation="x"),
+    ])
+    second_graph = optimizer._build_constraint_graph([
+        InteractionRecord(drug_a="LISINOPRIL", drug_b="IBUPROFEN", severity=SeverityLevel.SEVERE, explanation="x"),
+    ])
+
+    first_shape, first_labels = canonicalize_schedule_problem(first, first_graph)
+    second_shape, second_labels = canonicalize_schedule_problem(second, second_graph)
+
+    assert first_shape == second_shape
+    assert first_labels[0] == "METFORMIN"
+    assert second_labels[0] == "OMEPRAZOLE"
+
+
+def test_cached_solution_is_relabelled_per_request(solution_cache):
+    optimizer = CountingOptimizer(solution_cache=solution_cache)
+
+    first = optimizer.generate_schedule(
+        [MedicationDosage(drug_name="ASPIRIN", frequency=1), MedicationDosage(drug_name="WARFARIN", frequency=1)],
+        [InteractionRecord(drug_a="ASPIRIN", drug_b="WARFARIN", severity=SeverityLevel.SEVERE, explanation="x")],
+    )
+    second = optimizer.generate_schedule(
+        [MedicationDosage(drug_name="IBUPROFEN", frequency=1), MedicationDosage(drug_name="LISINOPRIL", frequency=1)],
+        [InteractionRecord(drug_a="IBUPROFEN", drug_b="LISINOPRIL", severity=SeverityLevel.SEVERE, explanation="y")],
+    )
+
+    assert optimizer.solve_calls == 1
+    assert abs(_slot_hours(first, "ASPIRIN")[0] - _slot_hours(first, "WARFARIN")[0]) >= 4
+    assert abs(_slot_hours(second, "IBUPROFEN")[0] - _slot_hours(second, "LISINOPRIL")[0]) >= 4
+    assert "Separated IBUPROFEN and LISINOPRIL" in second["notes"]
+
+
+def test_unplaced_warning_names_request_drug(solution_cache):
+    optimizer = CountingOptimizer(solution_cache=solution_cache)
+    optimizer.generate_schedule([MedicationDosage(drug_name="IBUPROFEN", frequency=5)], [])
+    result = optimizer.generate_schedule([MedicationDosage(drug_name="PARACETAMOL", frequency=5)], [])
+
+    assert optimizer.solve_calls == 1
+    assert "WARNING: Insufficient safe time slots to schedule 'PARACETAMOL'" in result["notes"]
+
+
+def test_tied_drugs_keep_input_order():
+    dosages = [MedicationDosage(drug_name=name, frequency=1) for name in ["WARFARIN", "ASPIRIN", "METFORMIN"]]
+
+    shape, labels = canonicalize_schedule_problem(dosages, {})
+
+    assert shape.frequencies == (1, 1, 1)
+    assert labels == ["WARFARIN", "ASPIRIN", "METFORMIN"]
+
+
+def test_dense_regimens_with_ties_are_solved_once(solution_cache):
+    # Ten TID drugs, all tied on frequency, with a dense interaction graph
+    optimizer = ScheduleOptimizer(solution_cache=solution_cache)
+
+    def regimen(prefix):
+        dosages = [MedicationDosage(drug_name=f"{prefix}{index}", frequency=3) for index in range(10)]
+        interactions = [
+            InteractionRecord(drug_a=f"{prefix}{a}", drug_b=f"{prefix}{b}", severity=SeverityLevel.MODERATE, explanation="x")
+            for a in range(10) for b in range(a + 1, 10) if (a + b) % 3 == 0
+        ]
+        return dosages, interactions
+
+    with patch.object(optimizer, "solve_shape", wraps=optimizer.solve_shape) as solve_shape:
+        first = optimizer.generate_schedule(*regimen("DRUG"))
+        second = optimizer.generate_schedule(*regimen("MED"))
+
+    solve_shape.assert_called_once()
+    assert [slot["time"] for slot in first["schedule"]] == [slot["time"] for slot in second["schedule"]]
+    assert first["schedule"][0]["medications"][0].replace("DRUG", "MED") == second["schedule"][0]["medications"][0]
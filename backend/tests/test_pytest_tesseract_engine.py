@@ -0,0 +1,91 @@
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from app.services.ocr import tesseract_engine
+from app.services.ocr.tesseract_engine import (
+    PytesseractEngine,
+    TesserocrPoolEngine,
+    build_tesseract_engine,
+)
+from app.services.ocr.vocabulary_hints import VocabularyHints
+
+
+class FakeTessBaseAPI:
+    instances = 0
+
+    def __init__(self, lang="eng", path=None, variables=None):
+        FakeTessBaseAPI.instances += 1
+        self.psm = None
+        self.variables = variables
+        self.ended = False
+
+    def SetPageSegMode(self, psm):
+        self.psm = psm
+
+    def SetImageBytes(self, data, width, height, bpp, bpl):
+        self.size = (width, height)
+
+    def GetUTF8Text(self):
+        return f"ASPIRIN {self.size[0]}x{self.size[1]} psm{self.psm}"
+
+    def Clear(self):
+        pass
+
+    def End(self):
+        self.ended = True
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    FakeTessBaseAPI.instances = 0
+    monkeypatch.setattr(tesseract_engine, "tesserocr", types.SimpleNamespace(PyTessBaseAPI=FakeTessBaseAPI))
+
+
+def test_auto_falls_back_to_pytesseract_without_tesserocr(monkeypatch):
+    monkeypatch.setattr(tesseract_engine, "tesserocr", None)
+
+    assert isinstance(build_tesseract_engine("auto", "eng"), PytesseractEngine)
+    with pytest.raises(RuntimeError, match="tesserocr is not installed"):
+        build_tesseract_engine("tesserocr", "eng")
+
+
+def test_pool_reuses_one_handle_per_thread(fake_tesserocr):
+    engine = build_tesseract_engine("auto", "eng")
+    assert isinstance(engine, TesserocrPoolEngine)
+
+    image = np.zeros((20, 40), dtype=np.uint8)
+    for _ in range(5):
+        assert engine.image_to_string(image, psm=7) == "ASPIRIN 40x20 psm7"
+    assert FakeTessBaseAPI.instances == 1
+
+    workers = [threading.Thread(target=engine.image_to_string, args=(image,)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert engine.pool_size == 4
+    engine.close()
+    assert engine.pool_size == 0
+
+
+def test_hinted_handles_are_rebuilt_per_vocabulary_version(fake_tesserocr):
+    engine = build_tesseract_engine("auto", "eng")
+    image = np.zeros((20, 40), dtype=np.uint8)
+    v1 = VocabularyHints("v1", "/hints/v1/user-words", "/hints/v1/user-patterns", "ABC")
+    v2 = VocabularyHints("v2", "/hints/v2/user-words", "/hints/v2/user-patterns", "ABD")
+
+    engine.image_to_string(image, hints=v1)
+    engine.image_to_string(image, hints=v1)
+    hinted = engine._thread_api(v1)
+    assert hinted.variables["user_words_file"] == "/hints/v1/user-words"
+    assert engine._thread_api() is not hinted
+    assert engine.pool_size == 2
+
+    engine.image_to_string(image, hints=v2)
+    assert hinted.ended
+    assert engine._thread_api(v2).variables["tessedit_char_whitelist"] == "ABD"
+    assert engine.pool_size == 2
@@ -0,0 +1,83 @@
+import io
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.api.uploads import read_upload_capped
+from app.services.ocr.image_processor import ImageProcessor
+
+PNG = ["image/png"]
+
+
+class CountingFile(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _upload(data, size=None, content_type="image/png"):
+    return UploadFile(file=CountingFile(data), size=size, headers=Headers({"content-type": content_type}))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("declared", [None, 3000, 10])
+async def test_upload_is_read_into_a_read_only_view(declared):
+    data = bytes(range(256)) * 12
+
+    view = await read_upload_capped(_upload(data, size=declared), PNG, max_size_bytes=len(data))
+
+    assert isinstance(view, memoryview) and view.readonly
+    assert view == data
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_stops_at_the_cap():
+    upload = _upload(b"x" * 5_000_000)
+
+    with pytest.raises(HTTPException) as rejected:
+        await read_upload_capped(upload, PNG, max_size_bytes=1024 * 1024)
+
+    assert rejected.value.status_code == 413
+    assert upload.file.bytes_read == 1024 * 1024 + 1
+
+
+@pytest.mark.asyncio
+async def test_declared_oversize_is_rejected_before_reading():
+    upload = _upload(b"x" * 100, size=5_000_000)
+
+    with pytest.raises(HTTPException) as rejected:
+        await read_upload_capped(upload, PNG, max_size_bytes=1024)
+
+    assert rejected.value.status_code == 413
+    assert upload.file.bytes_read == 0
+
+
+@pytest.mark.asyncio
+async def test_empty_and_disallowed_uploads_are_rejected():
+    with pytest.raises(HTTPException) as empty:
+        await read_upload_capped(_upload(b""), PNG, max_size_bytes=1024)
+    with pytest.raises(HTTPException) as gif:
+        await read_upload_capped(_upload(b"GIF89a", content_type="image/gif"), PNG, max_size_bytes=1024)
+
+    assert empty.value.status_code == 400
+    assert gif.value.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_views_decode_without_copying_to_bytes():
+    image = np.full((120, 400), 235, dtype=np.uint8)
+    cv2.putText(image, "ASPIRIN", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, 20, 4)
+    png = cv2.imencode(".png", image)[1].tobytes()
+
+    view = await read_upload_capped(_upload(png), PNG, max_size_bytes=len(png))
+
+    assert ImageProcessor._probe_dimensions(view) == (400, 120)
+    assert ImageProcessor._decode_grayscale(view).shape == (120, 400)
@@ -0,0 +1,74 @@
+import os
+import shlex
+from unittest.mock import patch
+
+import numpy as np
+
+from app.services.ocr import vocabulary_hints
+from app.services.ocr.drug_matcher import vocabulary_version
+from app.services.ocr.ocr_service import OCRService
+from app.services.ocr.tesseract_engine import PytesseractEngine
+from app.services.ocr.vocabulary_hints import compile_vocabulary_hints, get_vocabulary_hints
+
+KNOWN_DRUGS = ["ASPIRIN", "WARFARIN", "Insulin Glargine"]
+
+
+def test_hints_are_compiled_from_the_vocabulary(tmp_path):
+    hints = compile_vocabulary_hints(KNOWN_DRUGS, "v1", str(tmp_path))
+
+    with open(hints.words_path) as words_file:
+        words = words_file.read().split()
+    assert {"ASPIRIN", "Aspirin", "GLARGINE", "Glargine"} <= set(words)
+    with open(hints.patterns_path) as patterns_file:
+        assert r"\d\d\*MG" in patterns_file.read().split()
+    assert set("ASPIRNWFGLgar0123456789.%") <= set(hints.whitelist)
+    assert not set("~{}:") & set(hints.whitelist)
+
+
+def test_compiled_hints_are_reused_from_disk(tmp_path):
+    compile_vocabulary_hints(KNOWN_DRUGS, "v1", str(tmp_path))
+
+    # Another worker with the same version never touches the vocabulary
+    with patch.object(vocabulary_hints, "_name_tokens") as mock_tokens:
+        hints = compile_vocabulary_hints(KNOWN_DRUGS, "v1", str(tmp_path))
+    mock_tokens.assert_not_called()
+    assert "W" in hints.whitelist
+
+
+def test_a_new_vocabulary_version_gets_new_files(tmp_path):
+    first = get_vocabulary_hints(KNOWN_DRUGS, cache_dir=str(tmp_path))
+    second = get_vocabulary_hints(KNOWN_DRUGS + ["METFORMIN"], cache_dir=str(tmp_path))
+
+    assert first.version == vocabulary_version(KNOWN_DRUGS)
+    assert first.words_path != second.words_path
+    assert get_vocabulary_hints(KNOWN_DRUGS, cache_dir=str(tmp_path)) is first
+    assert sorted(os.listdir(tmp_path)) == sorted([first.version, second.version])
+
+
+def test_pytesseract_receives_the_hint_files(tmp_path):
+    hints = compile_vocabulary_hints(KNOWN_DRUGS, "v1", str(tmp_path))
+    image = np.zeros((20, 40), dtype=np.uint8)
+
+    with patch("app.services.ocr.tesseract_engine.pytesseract.image_to_string", return_value="") as mock_ocr:
+        PytesseractEngine("eng").image_to_string(image, psm=7, hints=hints)
+
+    options = shlex.split(mock_ocr.call_args.kwargs["config"])
+    assert options[:2] == ["--psm", "7"]
+    assert options[options.index("--user-words") + 1] == hints.words_path
+    assert options[options.index("--user-patterns") + 1] == hints.patterns_path
+    assert f"tessedit_char_whitelist={hints.whitelist}" in options
+
+
+def test_service_passes_hints_to_the_engine(tmp_path):
+    service = OCRService()
+    service._packaging_index = None
+    service._vocabulary_cache_dir = str(tmp_path)
+    service._vocabulary_hints = True
+
+    blank = np.full((20, 40), 255, dtype=np.uint8)
+    with patch("app.services.ocr.ocr_service.ImageProcessor.preprocess_minimal", return_value=blank), \
+            patch.object(service._engine, "image_to_string", return_value="WARFARIN 5MG") as mock_ocr:
+        result = service._execute_sync_pipeline(b"image", KNOWN_DRUGS)
+
+    assert result["matched_drug"] == "WARFARIN"
+    assert mock_ocr.call_args.kwargs["hints"].version == vocabulary_version(KNOWN_DRUGS)